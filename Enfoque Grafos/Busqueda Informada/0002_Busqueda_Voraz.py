@@ -4,24 +4,45 @@ Búsqueda Voraz (Primero el Mejor)
 """
 
 import heapq
+import os
+import sys
+from itertools import count
 
-def busqueda_voraz(grafo, heuristicas, inicio, objetivo):
-    # Cola de prioridad (heurística primero)
-    cola = [(heuristicas[inicio], inicio, [inicio])]
-    visitados = set()
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ not in sys.path:
+    sys.path.insert(0, RAIZ)
+from comunes import reconstruir_camino
+
+
+def busqueda_voraz(grafo, heuristicas, inicio, objetivo, observador=None):
+    # Cola de prioridad (heurística primero); cada entrada guarda sólo el padre
+    orden = count()
+    cola = [(heuristicas[inicio], inicio, next(orden), None)]
+    padres = {}  # Nodo visitado -> nodo desde el que se visitó
+    if observador is not None:
+        observador.al_insertar(inicio)
 
     while cola:
-        heur_actual, nodo_actual, camino = heapq.heappop(cola)
+        heur_actual, nodo_actual, _, padre = heapq.heappop(cola)
+        if observador is not None:
+            observador.al_extraer(nodo_actual)
+
+        if nodo_actual not in padres:
+            padres[nodo_actual] = padre
 
-        if nodo_actual == objetivo:
-            return camino
-        
-        if nodo_actual not in visitados:
-            visitados.add(nodo_actual)
+            if nodo_actual == objetivo:
+                camino = reconstruir_camino(padres, nodo_actual)
+                if observador is not None:
+                    observador.al_objetivo(nodo_actual, camino)
+                return camino
 
+            if observador is not None:
+                observador.al_expandir(nodo_actual)
             for vecino in grafo.get(nodo_actual, []):
-                if vecino not in visitados:
-                    heapq.heappush(cola, (heuristicas[vecino], vecino, camino + [vecino]))
+                if vecino not in padres:
+                    heapq.heappush(cola, (heuristicas[vecino], vecino, next(orden), nodo_actual))
+                    if observador is not None:
+                        observador.al_insertar(vecino)
     
     return None
 
@@ -3,89 +3,346 @@ Prácticas de Inteligencia Artificial
 Búsquedas Informadas: A* y AO*
 """
 
-import heapq  # Módulo para manejar colas de prioridad (usado en A*)
+import os
+import sys
+from collections import deque  # Cola para expandir por anchura en AO*
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ not in sys.path:
+    sys.path.insert(0, RAIZ)
+from comunes import ColaPrioridadIndexada, reconstruir_camino
+
 
 # =================== Búsqueda A* ===================
-def busqueda_a_estrella(grafo, heuristicas, inicio, objetivo):
+def busqueda_a_estrella(grafo, heuristicas, inicio, objetivo, cola=None, observador=None):
     """
     Algoritmo de búsqueda A*
     Usa una cola de prioridad para expandir los nodos con menor costo + heurística
+    El observador (opcional) recibe los eventos de la búsqueda (ver 0011)
     """
 
-    # Cola de prioridad: cada elemento es una tupla (f, g, nodo_actual, camino)
+    # Cola de prioridad indexada: la prioridad de cada nodo es (f, g)
     # f = g + h, g = costo acumulado real, h = heurística estimada
-    cola = [(heuristicas[inicio], 0, inicio, [inicio])]
-    visitados = set()
+    # Se puede pasar una cola propia para consultar después sus estadísticas
+    if cola is None:
+        cola = ColaPrioridadIndexada()
+    mejor_costo = {inicio: 0}   # Mejor g conocido para cada nodo
+    padres = {inicio: None}     # Padre con el que se obtuvo ese mejor g
+    cerrados = set()
+    cola.insertar_o_reducir(inicio, (heuristicas[inicio], 0))
+    if observador is not None:
+        observador.al_insertar(inicio)
 
     while cola:
         # Sacamos el nodo con menor f (prioridad)
-        prioridad, costo_actual, nodo_actual, camino = heapq.heappop(cola)
+        (prioridad, costo_actual), nodo_actual = cola.extraer()
+        if observador is not None:
+            observador.al_extraer(nodo_actual)
 
         # Si llegamos al objetivo, devolvemos el camino y costo total
         if nodo_actual == objetivo:
+            camino = reconstruir_camino(padres, nodo_actual)
+            if observador is not None:
+                observador.al_objetivo(nodo_actual, camino)
             return camino, costo_actual
-        
-        # Si aún no fue visitado, lo procesamos
-        if nodo_actual not in visitados:
-            visitados.add(nodo_actual)
-
-            # Expandimos los vecinos
-            for vecino, costo in grafo.get(nodo_actual, []):
-                if vecino not in visitados:
-                    nuevo_costo = costo_actual + costo
-                    prioridad = nuevo_costo + heuristicas[vecino]  # f(n) = g(n) + h(n)
-                    heapq.heappush(cola, (prioridad, nuevo_costo, vecino, camino + [vecino]))
+
+        cerrados.add(nodo_actual)
+        if observador is not None:
+            observador.al_expandir(nodo_actual)
+
+        # Expandimos los vecinos
+        for vecino, costo in grafo.get(nodo_actual, []):
+            nuevo_costo = costo_actual + costo
+            if vecino in cerrados:
+                if nuevo_costo >= mejor_costo[vecino]:
+                    continue
+                # Sólo pasa si la heurística es inconsistente: se cerró el nodo con
+                # un g que no era el mínimo, así que se reabre para propagar el nuevo
+                cerrados.discard(vecino)
+            # Un camino que no mejora el mejor g conocido no entra en la cola
+            elif nuevo_costo >= mejor_costo.get(vecino, float('inf')):
+                cola.estadisticas['dominadas'] += 1
+                continue
+            mejor_costo[vecino] = nuevo_costo
+            padres[vecino] = nodo_actual
+            prioridad = nuevo_costo + heuristicas[vecino]  # f(n) = g(n) + h(n)
+            if observador is not None and vecino not in cola:
+                observador.al_insertar(vecino)  # Una reducción no agranda la frontera
+            cola.insertar_o_reducir(vecino, (prioridad, nuevo_costo))
     
     # Si no hay camino posible
     return None, float('inf')
 
 # =================== Búsqueda AO* ===================
-def ao_star(grafo, heuristicas, nodo_actual, solucion, visitados):
+class MotorAOEstrella:
     """
-    Algoritmo AO* (AND-OR): Encuentra la estrategia óptima para resolver el problema
+    Algoritmo AO* (AND-OR) iterativo: Encuentra la estrategia óptima para resolver el problema
+    Costo de un nodo: f(n) = h(n) + mínimo, entre sus opciones, de la suma de f de los hijos
+    (un nodo terminal cuesta sólo su heurística). Mientras un nodo no se expande, f(n) = h(n).
+
+    Se mantiene el grafo solución parcial (la opción marcada de cada nodo) y en cada
+    ronda se expanden sus hojas; después los costos se revisan hacia arriba sólo por
+    los padres que tienen marcada una opción con el nodo que cambió.
+    Las tablas se conservan entre llamadas: lo ya resuelto no se vuelve a calcular.
+
+    En un grafo con ciclos puede ocurrir que todas las opciones de un nodo cierren
+    un ciclo con las marcas de ese momento; el nodo queda con f = inf, pero sólo
+    provisionalmente. Antes de dar por buena una respuesta se hace entonces una
+    revisión completa del grafo explícito (_revision_completa), y sólo si tras ella
+    la raíz sigue en inf es que no tiene solución.
     """
 
-    # Si ya lo resolvimos antes, regresamos el resultado
-    if nodo_actual in visitados:
-        return solucion.get(nodo_actual, None)
+    def __init__(self, grafo, heuristicas):
+        self.grafo = grafo
+        self.heuristicas = heuristicas
+        self.f = {}             # Costo estimado (o exacto si está resuelto) de cada nodo
+        self.marcada = {}       # Nodo expandido -> índice de la opción elegida
+        self.resueltos = set()
+        self.padres = {}        # Hijo -> nodos que lo tienen en alguna opción
+        self.expandidos = 0
+        self.descartes_por_ciclo = False  # Algún nodo quedó en inf sólo por ciclos
 
-    visitados.add(nodo_actual)
+    def _generar(self, nodo):
+        if nodo not in self.f:
+            self.f[nodo] = self.heuristicas[nodo]
+            if not self.grafo.get(nodo):
+                self.resueltos.add(nodo)   # Terminal: su costo es solo su heurística
 
-    # Si no tiene hijos, es nodo terminal: su costo es solo su heurística
-    if not grafo.get(nodo_actual):
-        solucion[nodo_actual] = ([], heuristicas[nodo_actual])
-        return solucion[nodo_actual]
-    
-    mejor_costo = float('inf')   # Inicializamos con costo infinito
-    mejor_camino = []            # Para guardar mejor grupo de hijos
+    def _hijos_marcados(self, nodo):
+        marcada = self.marcada.get(nodo)
+        return () if marcada is None else self.grafo[nodo][marcada]
+
+    def _cierra_ciclo(self, nodo, opcion):
+        # ¿Algún hijo de la opción llega otra vez al nodo siguiendo opciones marcadas?
+        # Los resueltos no pueden: todo lo que cuelga de ellos ya está resuelto.
+        pila = [hijo for hijo in opcion if hijo not in self.resueltos]
+        vistos = set(pila)
+        while pila:
+            actual = pila.pop()
+            if actual == nodo:
+                return True
+            for hijo in self._hijos_marcados(actual):
+                if hijo not in vistos and hijo not in self.resueltos:
+                    vistos.add(hijo)
+                    pila.append(hijo)
+        return False
+
+    def _revisar_nodo(self, nodo):
+        """
+        Recalcula f(n), la opción marcada y si está resuelto. Una opción que
+        formaría un ciclo con el grafo solución no se elige (no es una solución).
+        Devuelve True si algo cambió. Un nodo resuelto ya tiene su costo definitivo.
+        """
+        if nodo in self.resueltos:
+            return False
+        candidatas = sorted((sum(self.f[hijo] for hijo in opcion), indice)
+                            for indice, opcion in enumerate(self.grafo[nodo]))
+        anterior = (self.f[nodo], self.marcada.get(nodo), nodo in self.resueltos)
+        mejor_costo, mejor_indice = float('inf'), None
+        for costo, indice in candidatas:
+            if costo == float('inf'):
+                break
+            if indice == anterior[1] or not self._cierra_ciclo(nodo, self.grafo[nodo][indice]):
+                mejor_costo, mejor_indice = costo, indice
+                break
+            self.descartes_por_ciclo = True
+
+        self.f[nodo] = self.heuristicas[nodo] + mejor_costo
+        self.marcada[nodo] = mejor_indice
+        if mejor_indice is not None and all(hijo in self.resueltos
+                                            for hijo in self.grafo[nodo][mejor_indice]):
+            self.resueltos.add(nodo)
+        return anterior != (self.f[nodo], mejor_indice, nodo in self.resueltos)
+
+    def _hojas(self, raiz):
+        # Nodos sin expandir del grafo solución parcial que cuelga de la raíz
+        hojas, pila, vistos = [], [raiz], {raiz}
+        while pila:
+            nodo = pila.pop()
+            if nodo in self.resueltos:
+                continue
+            if nodo not in self.marcada:
+                hojas.append(nodo)
+                continue
+            for hijo in self._hijos_marcados(nodo):
+                if hijo not in vistos:
+                    vistos.add(hijo)
+                    pila.append(hijo)
+        return hojas
+
+    def _expandir(self, nodo):
+        self.expandidos += 1
+        for opcion in self.grafo[nodo]:
+            for hijo in opcion:
+                self._generar(hijo)
+                self.padres.setdefault(hijo, set()).add(nodo)
+        self._revisar_nodo(nodo)
+
+    def _propagar(self, cambiados):
+        """
+        Revisa los costos hacia arriba sólo por los ancestros con opción marcada.
+        Cada ancestro se revisa una vez, después de todos sus hijos marcados
+        afectados (orden topológico del grafo solución, que nunca tiene ciclos).
+        """
+        afectados = set(cambiados)
+        pila = list(cambiados)
+        while pila:
+            nodo = pila.pop()
+            for padre in self.padres.get(nodo, ()):
+                if (padre not in afectados and padre not in self.resueltos
+                        and nodo in self._hijos_marcados(padre)):
+                    afectados.add(padre)
+                    pila.append(padre)
+
+        faltan = {nodo: sum(1 for hijo in set(self._hijos_marcados(nodo)) if hijo in afectados)
+                  for nodo in afectados}
+        padres_marcados = {nodo: [padre for padre in self.padres.get(nodo, ()) if padre in afectados
+                                  and nodo in self._hijos_marcados(padre)]
+                           for nodo in afectados}
+        listos = [nodo for nodo, cuantos in faltan.items() if cuantos == 0]
+        remarcados = []
+        while listos:
+            nodo = listos.pop()
+            marcada = self.marcada.get(nodo)
+            self._revisar_nodo(nodo)
+            if self.marcada.get(nodo) != marcada:
+                remarcados.append(nodo)
+            for padre in padres_marcados[nodo]:
+                faltan[padre] -= 1
+                if faltan[padre] == 0:
+                    listos.append(padre)
 
-    # Evaluamos cada conjunto de hijos (pueden ser múltiples en AO*)
-    for opciones in grafo[nodo_actual]:
-        costo_total = 0
-        camino_actual = []
+        # Si un nodo cambió de opción, sus nuevos hijos pudieron revisarse después que él:
+        # se termina con una propagación simple desde esos nodos (pasa pocas veces)
+        pendientes, en_pendientes = remarcados, set(remarcados)
+        while pendientes:
+            nodo = pendientes.pop()
+            en_pendientes.discard(nodo)
+            self._revisar_nodo(nodo)
+            for padre in self.padres.get(nodo, ()):
+                if padre in self.resueltos or nodo not in self._hijos_marcados(padre):
+                    continue
+                if self._revisar_nodo(padre) and padre not in en_pendientes:
+                    pendientes.append(padre)
+                    en_pendientes.add(padre)
 
-        for hijo in opciones:
-            subcamino, subcosto = ao_star(grafo, heuristicas, hijo, solucion, visitados)
-            camino_actual.append(hijo)
-            costo_total += subcosto  # Sumamos el costo de todos los hijos requeridos
+    def _revision_completa(self):
+        """
+        Recalcula f, las marcas y los resueltos de todos los nodos expandidos a
+        la vez, con la generalización de Dijkstra de Knuth: los nodos sin
+        expandir valen su f actual, y un nodo expandido se fija cuando la mejor
+        de sus opciones con todos los hijos ya fijados es la menor de la cola.
+        Como f(n) nunca es menor que la de sus hijos (heurísticas no negativas),
+        el nodo que sale de la cola tiene su costo definitivo, y las marcas
+        resultantes no forman ciclos. Los que no se llegan a fijar no tienen
+        solución ni aunque todas las hojas la tuvieran.
+        """
+        expandidos = set(self.marcada)
+        usos = {}                 # Hijo -> (nodo, opción) por cada aparición
+        faltan, sumas = {}, {}
+        cola = ColaPrioridadIndexada()
+        mejor, elegida = {}, {}   # Mejor costo con opción completa y su índice
+        for nodo in self.f:
+            if nodo not in expandidos:
+                cola.insertar_o_reducir(nodo, self.f[nodo])
+        for nodo in expandidos:
+            for indice, opcion in enumerate(self.grafo[nodo]):
+                faltan[nodo, indice], sumas[nodo, indice] = len(opcion), 0
+                for hijo in opcion:
+                    usos.setdefault(hijo, []).append((nodo, indice))
+                if not opcion:
+                    self._candidata(cola, mejor, elegida, nodo, indice, 0)
 
-        # Si encontramos una mejor opción, la actualizamos
-        if costo_total < mejor_costo:
-            mejor_costo = costo_total
-            mejor_camino = camino_actual
+        fijados = set()
+        self.resueltos = {nodo for nodo in self.resueltos if nodo not in expandidos}
+        while cola:
+            costo, nodo = cola.extraer()
+            fijados.add(nodo)
+            self.f[nodo] = costo
+            if nodo in expandidos:
+                self.marcada[nodo] = elegida[nodo]
+                if all(hijo in self.resueltos for hijo in self.grafo[nodo][elegida[nodo]]):
+                    self.resueltos.add(nodo)
+            for padre, indice in usos.get(nodo, ()):
+                if padre in fijados:
+                    continue
+                faltan[padre, indice] -= 1
+                sumas[padre, indice] += costo
+                if faltan[padre, indice] == 0:
+                    self._candidata(cola, mejor, elegida, padre, indice, sumas[padre, indice])
+        for nodo in expandidos - fijados:
+            self.f[nodo], self.marcada[nodo] = float('inf'), None
+        self.descartes_por_ciclo = False
 
-    # Guardamos la mejor decisión para este nodo
-    solucion[nodo_actual] = (mejor_camino, heuristicas[nodo_actual] + mejor_costo)
-    return solucion[nodo_actual]
+    def _candidata(self, cola, mejor, elegida, nodo, indice, suma):
+        costo = self.heuristicas[nodo] + suma
+        if costo < mejor.get(nodo, float('inf')):
+            mejor[nodo], elegida[nodo] = costo, indice
+            cola.insertar_o_reducir(nodo, costo)
 
-def encontrar_solucion_ao_star(grafo, heuristicas, inicio):
+    def resolver(self, raiz):
+        # Devuelve el costo de la raíz (inf si no tiene solución)
+        self._generar(raiz)
+        while True:
+            self._buscar(raiz)
+            if not self.descartes_por_ciclo:
+                return self.f[raiz]
+            self._revision_completa()
+            if raiz in self.resueltos or self.f[raiz] == float('inf'):
+                return self.f[raiz]
+
+    def _buscar(self, raiz):
+        # Rondas de AO*: expandir las hojas del grafo solución parcial y revisar hacia arriba
+        while raiz not in self.resueltos and self.f[raiz] < float('inf'):
+            hojas = self._hojas(raiz)
+            if not hojas:
+                break
+            # Se expanden las hojas y, por anchura, lo que queda debajo de su opción
+            # elegida hasta un presupuesto que crece con el grafo: así cada revisión
+            # hacia arriba se reparte entre muchas expansiones (un grafo tipo cadena
+            # no cuesta una revisión completa por nodo)
+            presupuesto = max(len(hojas), self.expandidos)
+            expandidos = []
+            cola = deque(hojas)
+            while cola and len(expandidos) < presupuesto:
+                hoja = cola.popleft()
+                if hoja in self.marcada or hoja in self.resueltos:
+                    continue
+                self._expandir(hoja)
+                expandidos.append(hoja)
+                cola.extend(self._hijos_marcados(hoja))
+            self._propagar(expandidos)
+
+    def solucion(self, raiz):
+        """
+        Grafo solución desde la raíz en postorden: {nodo: (hijos elegidos, costo total)}.
+        Un subobjetivo compartido aparece una sola vez.
+        """
+        solucion = {}
+        pila = [(raiz, False)]
+        while pila:
+            nodo, listo = pila.pop()
+            if nodo in solucion:
+                continue
+            hijos = list(self._hijos_marcados(nodo))
+            if listo:
+                solucion[nodo] = (hijos, self.f[nodo])
+                continue
+            pila.append((nodo, True))
+            for hijo in reversed(hijos):
+                if hijo not in solucion:
+                    pila.append((hijo, False))
+        return solucion
+
+def encontrar_solucion_ao_star(grafo, heuristicas, inicio, motor=None):
     """
     Controlador para iniciar la búsqueda AO*
+    Se puede pasar un motor ya usado para aprovechar lo que resolvió antes
     """
-    solucion = {}      # Diccionario donde guardamos la mejor solución de cada nodo
-    visitados = set()  # Para evitar ciclos o repetir nodos
-    ao_star(grafo, heuristicas, inicio, solucion, visitados)
-    return solucion
+    if motor is None:
+        motor = MotorAOEstrella(grafo, heuristicas)
+    motor.resolver(inicio)
+    return motor.solucion(inicio)
 
 # =================== Definición del Grafo ===================
 # Grafo con costos para A*
@@ -131,16 +388,64 @@ print("\n===== Búsqueda A* =====")
 print(f"Camino encontrado A*: {camino_aestrella}")
 print(f"Costo total A*: {costo_total}")
 
+# ----- Estadísticas de la cola de prioridad -----
+cola_aestrella = ColaPrioridadIndexada()
+busqueda_a_estrella(grafo_con_costos, heuristicas, inicio, objetivo, cola_aestrella)
+print(f"Estadísticas de la cola A*: {cola_aestrella.estadisticas}")
+
 # ----- Ejecutamos búsqueda AO* -----
 solucion_ao = encontrar_solucion_ao_star(grafo_ao, heuristicas, inicio)
 print("\n===== Búsqueda AO* =====")
 for nodo, (hijos, costo) in solucion_ao.items():
     print(f"Nodo {nodo}: sigue a {hijos} con costo total {costo}")
 
+# ----- AO* con subobjetivo compartido y un ciclo -----
+# G lo necesitan B y C; la opción ['A'] de C volvería a A y no puede formar parte de la solución
+grafo_ciclo = {
+    'A': [['B', 'C'], ['H']],
+    'B': [['G']],
+    'C': [['A'], ['G', 'D']],
+    'D': [],
+    'G': [['E'], ['F']],
+    'E': [],
+    'F': [],
+    'H': [['H']]            # Sólo se resuelve a sí mismo: no tiene solución
+}
+heuristicas_ciclo = {'A': 1, 'B': 1, 'C': 1, 'D': 2, 'G': 1, 'E': 3, 'F': 2, 'H': 0}
+motor = MotorAOEstrella(grafo_ciclo, heuristicas_ciclo)
+print("\n===== AO* con subobjetivo compartido y ciclo =====")
+for nodo, (hijos, costo) in encontrar_solucion_ao_star(grafo_ciclo, heuristicas_ciclo, 'A', motor).items():
+    print(f"Nodo {nodo}: sigue a {hijos} con costo total {costo}")
+expandidos = motor.expandidos
+encontrar_solucion_ao_star(grafo_ciclo, heuristicas_ciclo, 'C', motor)
+print(f"Resolver C después reutiliza lo ya resuelto: {motor.expandidos - expandidos} expansiones nuevas")
+
+# Los ejemplos grandes y la comprobación sólo al ejecutar este archivo: otras prácticas
+# lo cargan para usar busqueda_a_estrella
+if __name__ == "__main__":
+    # ----- AO* cuando todas las opciones de un nodo cierran un ciclo sólo de momento -----
+    # Con las marcas iniciales 1 y 2 vuelven a 0; no es un fallo definitivo: la
+    # solución óptima es 0 -> [1, 3, 4], 1 -> [4], 4 -> [3] con costo 11
+    grafo_ciclos = {0: [[2], [0, 3], [1, 3, 4]], 1: [[2, 3], [4]], 2: [[0], [0]], 3: [], 4: [[3], [3], [1]]}
+    heuristicas_ciclos = {0: 0, 1: 0, 2: 1, 3: 3, 4: 1}
+    motor = MotorAOEstrella(grafo_ciclos, heuristicas_ciclos)
+    costo_ciclos = motor.resolver(0)
+    assert costo_ciclos == 11, costo_ciclos
+    print("\n===== AO* con ciclos provisionales =====")
+    for nodo, (hijos, costo) in motor.solucion(0).items():
+        print(f"Nodo {nodo}: sigue a {hijos} con costo total {costo}")
+
+    # ----- AO* sobre un grafo profundo (la versión recursiva desbordaba la pila) -----
+    n = 50000
+    grafo_profundo = {i: [[i + 1], [i + 1, i + 2]] if i < n - 2 else [] for i in range(n)}
+    motor = MotorAOEstrella(grafo_profundo, dict.fromkeys(grafo_profundo, 1))
+    print(f"Grafo AND-OR de {n} nodos: costo {motor.resolver(0)}, {motor.expandidos} expansiones")
+
 #Salidas
 #===== Búsqueda A* =====
 #Camino encontrado A*: ['A', 'B', 'E', 'F']
 #Costo total A*: 7
+#Estadísticas de la cola A*: {'inserciones': 6, 'reducciones': 0, 'extracciones': 5, 'obsoletas': 0, 'dominadas': 0}
 
 #===== Búsqueda AO* =====
 #Nodo D: sigue a [] con costo total 2
@@ -150,4 +455,19 @@ for nodo, (hijos, costo) in solucion_ao.items():
 #Nodo C: sigue a ['E', 'F'] con costo total 5
 #Nodo A: sigue a ['B', 'C'] con costo total 17
 #Cuando tienen [] significa que ese nodo es un nodo terminal, es decir, no tiene más hijos que resolver
-#El costo total es simplemente su heurística, ya que no hay más pasos que dar.
\ No newline at end of file
+#El costo total es simplemente su heurística, ya que no hay más pasos que dar.
+
+#===== AO* con subobjetivo compartido y ciclo =====
+#Nodo F: sigue a [] con costo total 2
+#Nodo G: sigue a ['F'] con costo total 3
+#Nodo B: sigue a ['G'] con costo total 4
+#Nodo D: sigue a [] con costo total 2
+#Nodo C: sigue a ['G', 'D'] con costo total 6
+#Nodo A: sigue a ['B', 'C'] con costo total 11
+#G aparece una sola vez aunque lo necesitan B y C, y la opción ['H'] nunca se elige.
+
+#===== AO* con ciclos provisionales =====
+#Nodo 3: sigue a [] con costo total 3
+#Nodo 4: sigue a [3] con costo total 4
+#Nodo 1: sigue a [4] con costo total 4
+#Nodo 0: sigue a [1, 3, 4] con costo total 11
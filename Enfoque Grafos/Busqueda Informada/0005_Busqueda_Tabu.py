@@ -4,8 +4,36 @@ Búsqueda Informada: Búsqueda Tabú (Tabu Search)
 """
 
 import random
+import time
 
-def busqueda_tabu(grafo, heuristicas, inicio, objetivo, tamano_tabu=3, max_iteraciones=20):
+class MemoriaTabu:
+    """
+    Memoria tabú con marcas de iteración: en lugar de una lista se guarda, para
+    cada nodo, la última iteración en la que sigue prohibido. Consultar y agregar
+    son O(1) sin importar la tenencia (número de iteraciones que dura la prohibición).
+    También lleva la memoria a largo plazo: cuántas veces se visitó cada nodo.
+    """
+
+    def __init__(self, tenencia):
+        self.tenencia = tenencia
+        self.iteracion = 0
+        self.vence = {}        # Nodo -> última iteración en la que es tabú
+        self.frecuencia = {}   # Nodo -> número de visitas
+
+    def __contains__(self, nodo):
+        return self.vence.get(nodo, -1) >= self.iteracion
+
+    def agregar(self, nodo):
+        # Equivale a meterlo al final de una lista de 'tenencia' elementos
+        self.vence[nodo] = self.iteracion + self.tenencia
+        self.frecuencia[nodo] = self.frecuencia.get(nodo, 0) + 1
+
+    def avanzar(self):
+        self.iteracion += 1
+
+
+def busqueda_tabu(grafo, heuristicas, inicio, objetivo, tamano_tabu=3, max_iteraciones=20,
+                  aspiracion=True, peso_frecuencia=0):
     """
     Realiza una búsqueda tabú para encontrar el camino hacia el objetivo.
     - grafo: diccionario con nodos y sus vecinos
@@ -14,13 +42,20 @@ def busqueda_tabu(grafo, heuristicas, inicio, objetivo, tamano_tabu=3, max_itera
     - objetivo: nodo a alcanzar
     - tamano_tabu: número de pasos que un nodo permanece en la lista tabú
     - max_iteraciones: número máximo de iteraciones a realizar
+    - aspiracion: si todos los vecinos son tabú, en lugar de detenerse se permite el
+      que antes deja de serlo (aspiración por defecto). Un nodo tabú ya se visitó, así
+      que nunca puede mejorar la mejor heurística encontrada: ése no sirve de criterio.
+      Ojo: antes la búsqueda siempre se detenía en ese caso; ahora por defecto sigue
+      hasta max_iteraciones, y con aspiracion=False se recupera el comportamiento anterior
+    - peso_frecuencia: penalización por cada visita previa a un nodo (diversificación);
+      con 0 sólo cuenta la heurística
     """
 
     actual = inicio
     mejor = actual
     mejor_heuristica = heuristicas[actual]
     camino = [actual]
-    lista_tabu = []
+    memoria = MemoriaTabu(tamano_tabu)
 
     for _ in range(max_iteraciones):
         vecinos = grafo.get(actual, [])
@@ -28,13 +63,20 @@ def busqueda_tabu(grafo, heuristicas, inicio, objetivo, tamano_tabu=3, max_itera
             break  # No hay más vecinos que explorar
 
         # Filtrar vecinos que no están en la lista tabú
-        candidatos = [n for n in vecinos if n not in lista_tabu]
+        candidatos = [n for n in vecinos if n not in memoria]
 
         if not candidatos:
-            break  # Todos los vecinos están en la lista tabú
-
-        # Elegir el mejor vecino disponible (menor heurística)
-        siguiente = min(candidatos, key=lambda n: heuristicas[n])
+            if not aspiracion:
+                break  # Todos los vecinos están en la lista tabú
+            candidatos = [min(vecinos, key=memoria.vence.__getitem__)]
+
+        # Elegir el mejor vecino disponible (menor heurística, penalizada por frecuencia)
+        if peso_frecuencia:
+            frecuencia = memoria.frecuencia
+            siguiente = min(candidatos,
+                            key=lambda n: heuristicas[n] + peso_frecuencia * frecuencia.get(n, 0))
+        else:
+            siguiente = min(candidatos, key=lambda n: heuristicas[n])
         camino.append(siguiente)
 
         # Actualizar la mejor solución si encontramos una mejor
@@ -42,10 +84,9 @@ def busqueda_tabu(grafo, heuristicas, inicio, objetivo, tamano_tabu=3, max_itera
             mejor = siguiente
             mejor_heuristica = heuristicas[siguiente]
 
-        # Añadir el nodo actual a la lista tabú
-        lista_tabu.append(actual)
-        if len(lista_tabu) > tamano_tabu:
-            lista_tabu.pop(0)  # Eliminar el nodo más antiguo
+        # Añadir el nodo actual a la lista tabú (el más antiguo caduca solo)
+        memoria.agregar(actual)
+        memoria.avanzar()
 
         actual = siguiente
 
@@ -87,3 +128,50 @@ print("\n===== Búsqueda Tabú =====")
 print(f"Camino seguido: {camino}")
 print(f"¿Se llegó al objetivo?: {'Sí' if exito else 'No'}")
 print(f"Mejor nodo encontrado: {mejor_encontrado} (h={heuristicas[mejor_encontrado]})")
+
+# ============ Aspiración por defecto ============
+# B es un callejón sin salida: al llegar, su único vecino (A) es tabú
+callejon = {'A': ['B', 'C'], 'B': ['A'], 'C': ['A', 'F'], 'F': []}
+h_callejon = {'A': 5, 'B': 1, 'C': 3, 'F': 0}
+for aspiracion in (False, True):
+    camino, exito, _ = busqueda_tabu(callejon, h_callejon, 'A', 'F', aspiracion=aspiracion)
+    print(f"aspiracion={aspiracion}: {camino}, ¿objetivo?: {'Sí' if exito else 'No'}")
+
+# ============ Tenencia, frecuencia y aspiración en un grafo grande ============
+# Sólo al ejecutar este archivo: otras prácticas lo cargan para usar busqueda_tabu
+if __name__ == "__main__":
+    # Rejilla de 100 x 100 con relieve aleatorio: con una lista, cada consulta y cada
+    # pop(0) costaban O(tenencia); con la memoria por marcas el costo no depende de ella
+    generador = random.Random(0)
+    lado = 100
+    rejilla = {(f, c): [(f + df, c + dc) for df, dc in ((1, 0), (0, 1), (-1, 0), (0, -1))
+                        if 0 <= f + df < lado and 0 <= c + dc < lado]
+               for f in range(lado) for c in range(lado)}
+    relieve = {n: abs(lado - 1 - n[0]) + abs(lado - 1 - n[1]) + generador.randint(0, 10)
+               for n in rejilla}
+    relieve[(lado - 1, lado - 1)] = 0
+    for tenencia, peso, aspiracion in ((10, 0, False), (10, 0, True), (5000, 0, True), (10, 1, True)):
+        t = time.perf_counter()
+        camino, exito, mejor_encontrado = busqueda_tabu(rejilla, relieve, (0, 0), (lado - 1, lado - 1),
+                                                        tamano_tabu=tenencia, max_iteraciones=20000,
+                                                        aspiracion=aspiracion, peso_frecuencia=peso)
+        print(f"Tenencia {tenencia}, peso_frecuencia={peso}, aspiracion={aspiracion}: "
+              f"{len(camino) - 1} pasos, ¿objetivo?: {'Sí' if exito else 'No'}, "
+              f"mejor h={relieve[mejor_encontrado]}, {time.perf_counter() - t:.3f} s")
+
+#===== Búsqueda Tabú =====
+#Camino seguido: ['A', 'B', 'E', 'F']
+#¿Se llegó al objetivo?: Sí
+#Mejor nodo encontrado: F (h=1)
+#aspiracion=False: ['A', 'B'], ¿objetivo?: No
+#aspiracion=True: ['A', 'B', 'A', 'C', 'F'], ¿objetivo?: Sí
+#Tenencia 10, peso_frecuencia=0, aspiracion=False: 23 pasos, ¿objetivo?: No, mejor h=184, 0.000 s
+#Tenencia 10, peso_frecuencia=0, aspiracion=True: 20000 pasos, ¿objetivo?: No, mejor h=109, 0.038 s
+#Tenencia 5000, peso_frecuencia=0, aspiracion=True: 430 pasos, ¿objetivo?: Sí, mejor h=0, 0.001 s
+#Tenencia 10, peso_frecuencia=1, aspiracion=True: 392 pasos, ¿objetivo?: Sí, mejor h=0, 0.001 s
+#(los tiempos dependen de la máquina)
+#
+#Con tenencia 10 y sin aspiración la búsqueda se detiene en el primer hoyo del relieve,
+#con todos los vecinos tabú. Con aspiración sigue, pero da vueltas entre los mismos nodos
+#hasta agotar las iteraciones. Recordar 5000 nodos, o penalizar los ya visitados, la saca
+#del hoyo y llega al objetivo.
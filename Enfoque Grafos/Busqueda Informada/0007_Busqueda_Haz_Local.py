@@ -2,8 +2,83 @@
 Prácticas de Inteligencia Artificial
 Búsqueda Informada: Búsqueda de Haz Local (Local Beam Search)
 """
+import heapq
+import math
+import random
+import time
 
-def busqueda_haz_local(grafo, heuristicas, inicio, objetivo, k=2, max_iteraciones=10):
+
+def _candidatos(grafo, haz, conjuntos, visitados):
+    """
+    Sucesores de todo el haz como pares (índice del camino, vecino), sin copiar
+    caminos: sólo se construyen los que se eligen.
+    - Con visitados (detección de repetidos) se descarta todo vecino que ya
+      estuvo en el haz y, de varios caminos que llegan al mismo nodo, se queda
+      el primero. Un camino no puede tener ciclos porque sus nodos ya están en
+      visitados.
+    - Sin visitados cada camino evita sus propios ciclos consultando su conjunto.
+    """
+    candidatos = []
+    if visitados is not None:
+        vistos = set()
+        for indice, (nodo_actual, _) in enumerate(haz):
+            for vecino in grafo.get(nodo_actual, []):
+                if vecino in visitados or vecino in vistos:
+                    continue
+                vistos.add(vecino)
+                candidatos.append((indice, vecino))
+    else:
+        for indice, (nodo_actual, _) in enumerate(haz):
+            en_camino = conjuntos[indice]
+            for vecino in grafo.get(nodo_actual, []):
+                if vecino not in en_camino:  # evitar ciclos
+                    candidatos.append((indice, vecino))
+    return candidatos
+
+
+def _avanzar(haz, conjuntos, elegidos, visitados):
+    """
+    Extiende los caminos elegidos. Cada camino es una cadena (nodo, anterior),
+    así que extenderlo no copia nada. Sin visitados, el conjunto del camino
+    padre se lo queda su primer hijo elegido; sólo los demás hijos lo copian.
+    """
+    nuevo_haz = [(vecino, haz[indice]) for indice, vecino in elegidos]
+    if visitados is not None:
+        visitados.update(vecino for _, vecino in elegidos)
+        return nuevo_haz, None
+    nuevos_conjuntos = [None] * len(elegidos)
+    primero = {}
+    for posicion, (indice, vecino) in enumerate(elegidos):
+        if indice in primero:
+            nuevos_conjuntos[posicion] = conjuntos[indice] | {vecino}  # antes de modificarlo
+        else:
+            primero[indice] = posicion
+    for indice, posicion in primero.items():
+        conjunto = conjuntos[indice]
+        conjunto.add(elegidos[posicion][1])
+        nuevos_conjuntos[posicion] = conjunto
+    return nuevo_haz, nuevos_conjuntos
+
+
+def _haz_inicial(inicio, k, descartar_repetidos):
+    # Con detección de repetidos las k copias del nodo inicial serían una sola
+    if descartar_repetidos:
+        return [(inicio, None)], None, {inicio}
+    return [(inicio, None) for _ in range(k)], [{inicio} for _ in range(k)], None
+
+
+def _a_lista(cadena):
+    # Convierte la cadena (nodo, anterior) en la lista de nodos desde el inicio
+    camino = []
+    while cadena is not None:
+        nodo, cadena = cadena
+        camino.append(nodo)
+    camino.reverse()
+    return camino
+
+
+def busqueda_haz_local(grafo, heuristicas, inicio, objetivo, k=2, max_iteraciones=10,
+                       descartar_repetidos=True):
     """
     Algoritmo de Búsqueda de Haz Local.
     - grafo: estructura de conexiones del grafo.
@@ -12,36 +87,61 @@ def busqueda_haz_local(grafo, heuristicas, inicio, objetivo, k=2, max_iteracione
     - objetivo: nodo destino.
     - k: número de trayectorias que se mantienen en cada iteración (tamaño del haz).
     - max_iteraciones: número máximo de ciclos.
+    - descartar_repetidos: no volver a meter en el haz un nodo que ya estuvo en él
+      (con False se comporta como el haz original: cada camino sólo evita sus ciclos).
     """
-    # Inicializar el haz con k copias del nodo inicial
-    haz = [[inicio] for _ in range(k)]
+    haz, conjuntos, visitados = _haz_inicial(inicio, k, descartar_repetidos)
 
     for iteracion in range(max_iteraciones):
         # Generar todos los vecinos posibles a partir del haz actual
-        candidatos = []
-
-        for camino in haz:
-            nodo_actual = camino[-1]
-            vecinos = grafo.get(nodo_actual, [])
-            for vecino in vecinos:
-                if vecino not in camino:  # evitar ciclos
-                    nuevo_camino = camino + [vecino]
-                    candidatos.append(nuevo_camino)
+        candidatos = _candidatos(grafo, haz, conjuntos, visitados)
 
         if not candidatos:
             break  # No hay más vecinos, termina la búsqueda
 
-        # Ordenar candidatos por heurística del último nodo
-        candidatos.sort(key=lambda c: heuristicas[c[-1]])
+        # Los k mejores por heurística del último nodo, sin ordenar todos los candidatos
+        # (nsmallest es estable: en empates gana el que se generó primero)
+        elegidos = heapq.nsmallest(k, candidatos, key=lambda c: heuristicas[c[1]])
+        haz, conjuntos = _avanzar(haz, conjuntos, elegidos, visitados)
 
         # Verificar si el mejor candidato llega al objetivo
-        if candidatos[0][-1] == objetivo:
-            return candidatos[0], True
+        if haz[0][0] == objetivo:
+            return _a_lista(haz[0]), True
+
+    return _a_lista(haz[0]), haz[0][0] == objetivo  # devolver el mejor intento
 
-        # Mantener los k mejores caminos
-        haz = candidatos[:k]
 
-    return haz[0], haz[0][-1] == objetivo  # devolver el mejor intento
+def busqueda_haz_estocastica(grafo, heuristicas, inicio, objetivo, k=2, max_iteraciones=10,
+                             temperatura=1.0, descartar_repetidos=True, rng=random):
+    """
+    Haz local estocástico: en lugar de los k mejores se sortean k candidatos
+    sin reemplazo, con probabilidad proporcional a exp(-h / temperatura).
+    Evita que todo el haz se concentre en la misma región.
+    El sorteo usa claves exponenciales (Efraimidis-Spirakis): cada candidato
+    recibe E / peso con E ~ Exp(1) y se eligen las k claves menores; se trabaja
+    con logaritmos para que pesos muy pequeños no se vuelvan cero.
+    """
+    haz, conjuntos, visitados = _haz_inicial(inicio, k, descartar_repetidos)
+
+    for iteracion in range(max_iteraciones):
+        candidatos = _candidatos(grafo, haz, conjuntos, visitados)
+        if not candidatos:
+            break
+
+        # Si el objetivo está entre los candidatos no se deja al azar
+        for indice, vecino in candidatos:
+            if vecino == objetivo:
+                return _a_lista((vecino, haz[indice])), True
+
+        claves = [math.log(rng.expovariate(1.0)) + heuristicas[vecino] / temperatura
+                  for _, vecino in candidatos]
+        mejores = heapq.nsmallest(k, range(len(candidatos)), key=claves.__getitem__)
+        # El mejor del sorteo primero, para devolverlo si se acaban las iteraciones
+        mejores.sort(key=lambda i: heuristicas[candidatos[i][1]])
+        haz, conjuntos = _avanzar(haz, conjuntos, [candidatos[i] for i in mejores],
+                                  visitados)
+
+    return _a_lista(haz[0]), haz[0][0] == objetivo
 
 
 # ============ Definir grafo y heurísticas ============
@@ -73,3 +173,32 @@ camino, exito = busqueda_haz_local(grafo, heuristicas, inicio, objetivo, k=2)
 print("\n===== Búsqueda de Haz Local =====")
 print(f"Camino seguido: {camino}")
 print(f"¿Se llegó al objetivo?: {'Sí' if exito else 'No'}")
+
+
+# El ejemplo grande sólo al ejecutar este archivo (el benchmark 0010 lo carga)
+if __name__ == "__main__":
+    # ============ Haz ancho en un grafo grande ============
+    # Grafo aleatorio de 200 000 nodos con 6 sucesores cada uno: el haz de 10 000
+    # caminos se llena en cada iteración (60 000 candidatos)
+    generador = random.Random(0)
+    total_nodos = 200000
+    grafo_grande = {n: generador.sample(range(total_nodos), 6) for n in range(total_nodos)}
+    relieve = {n: generador.randint(1, 1000) for n in grafo_grande}
+    relieve[total_nodos - 1] = 0
+    print("\nHaz de 10 000 caminos en un grafo de 200 000 nodos")
+    for etiqueta, funcion, opciones in (
+            ("haz local", busqueda_haz_local, {}),
+            ("haz local sin detección de repetidos", busqueda_haz_local,
+             {'descartar_repetidos': False}),
+            ("haz estocástico", busqueda_haz_estocastica, {'temperatura': 50.0, 'rng': generador})):
+        t = time.perf_counter()
+        camino, exito = funcion(grafo_grande, relieve, 0, total_nodos - 1, k=10000,
+                                max_iteraciones=20, **opciones)
+        print(f"  {etiqueta}: {len(camino) - 1} pasos, ¿objetivo?: {'Sí' if exito else 'No'}, "
+              f"{time.perf_counter() - t:.3f} s")
+
+#===== Búsqueda de Haz Local =====
+#Camino seguido: ['A', 'C', 'F']
+#¿Se llegó al objetivo?: Sí
+#(Con descartar_repetidos=False, como el haz original, el haz empieza con k copias
+#de A y se llena con caminos repetidos: ['A', 'B', 'E', 'F'].)
@@ -0,0 +1,335 @@
+"""
+Prácticas de Inteligencia Artificial
+Banco de pruebas de las búsquedas sobre grafos sintéticos
+(rejillas, geométricos aleatorios, libres de escala y cadenas)
+"""
+import csv
+import inspect
+import math
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ not in sys.path:
+    sys.path.insert(0, RAIZ)
+from comunes import cargar_script
+
+# ============ Parámetros ============
+TAMANOS = {             # Número aproximado de nodos por familia de grafos
+    'rejilla': [400, 1600],
+    'geometrico': [300, 1200],
+    'libre_escala': [500, 2000],
+    'cadena': [200, 800],
+}
+# Búsquedas que sólo se corren hasta cierto número de nodos: IDA* con costos reales
+# sube el umbral en pasos muy pequeños y la profundidad iterativa es cuadrática en cadenas
+LIMITE_NODOS = {'profundidad_iterativa': 1000, 'ida_estrella': 400}
+SEMILLA = 0
+REPETICIONES = 3        # Se reporta el mejor tiempo de las repeticiones
+# Búsquedas locales: pueden terminar sin llegar al objetivo. Si falla cualquier otra
+# es un error de la práctica y se avisa al final
+BUSQUEDAS_LOCALES = {'ascension_colinas', 'tabu', 'temple_simulado', 'haz_local'}
+COLUMNAS = ['busqueda', 'familia', 'nodos', 'aristas', 'semilla', 'segundos', 'expandidos',
+            'frontera_max', 'memoria_pico_kib', 'exito', 'longitud', 'costo']
+
+
+# ============ Generadores de grafos ============
+# Todos devuelven (grafo con costos, coordenadas de cada nodo o None, inicio, objetivo)
+
+def generar_rejilla(n, rng):
+    lado = max(2, int(math.sqrt(n)))
+    grafo = {}
+    for f in range(lado):
+        for c in range(lado):
+            grafo[(f, c)] = [((f + df, c + dc), rng.randint(1, 9))
+                             for df, dc in ((1, 0), (0, 1), (-1, 0), (0, -1))
+                             if 0 <= f + df < lado and 0 <= c + dc < lado]
+    coordenadas = {nodo: nodo for nodo in grafo}
+    return grafo, coordenadas, (0, 0), (lado - 1, lado - 1)
+
+
+def generar_geometrico(n, rng):
+    # Puntos al azar en el cuadrado unidad unidos si están a menos de 'radio'
+    radio = math.sqrt(2.5 * math.log(n) / (math.pi * n))
+    puntos = [(rng.random(), rng.random()) for _ in range(n)]
+    celdas = {}
+    for i, (x, y) in enumerate(puntos):
+        celdas.setdefault((int(x / radio), int(y / radio)), []).append(i)
+    grafo = {i: [] for i in range(n)}
+    for i, (x, y) in enumerate(puntos):
+        cx, cy = int(x / radio), int(y / radio)
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for j in celdas.get((cx + dx, cy + dy), []):
+                    distancia = math.dist(puntos[i], puntos[j])
+                    if j != i and distancia <= radio:
+                        grafo[i].append((j, distancia))
+    objetivo = max(range(n), key=lambda i: math.dist(puntos[0], puntos[i]))
+    return grafo, dict(enumerate(puntos)), 0, objetivo
+
+
+def generar_libre_escala(n, rng, m=2):
+    # Barabási-Albert: cada nodo nuevo se une a m nodos con probabilidad proporcional al grado
+    grafo = {i: [] for i in range(n)}
+    extremos = []  # Cada nodo aparece tantas veces como su grado
+    for i in range(m + 1):
+        for j in range(i):
+            grafo[i].append((j, 1))
+            grafo[j].append((i, 1))
+            extremos += [i, j]
+    for i in range(m + 1, n):
+        destinos = set()
+        while len(destinos) < m:
+            destinos.add(rng.choice(extremos))
+        for j in destinos:
+            costo = rng.randint(1, 9)
+            grafo[i].append((j, costo))
+            grafo[j].append((i, costo))
+            extremos += [i, j]
+    return grafo, None, 0, n - 1
+
+
+def generar_cadena(n, rng):
+    grafo = {i: [(i + 1, rng.randint(1, 9))] if i + 1 < n else [] for i in range(n)}
+    return grafo, None, 0, n - 1
+
+
+GENERADORES = {
+    'rejilla': generar_rejilla,
+    'geometrico': generar_geometrico,
+    'libre_escala': generar_libre_escala,
+    'cadena': generar_cadena,
+}
+
+
+def calcular_heuristicas(grafo, coordenadas, objetivo):
+    # Distancia al objetivo si hay coordenadas (admisible); si no, 0 para todos
+    if coordenadas is None:
+        return {nodo: 0 for nodo in grafo}
+    costo_minimo = min((c for vecinos in grafo.values() for _, c in vecinos), default=1)
+    destino = coordenadas[objetivo]
+    if isinstance(destino[0], int):  # Rejilla: distancia Manhattan
+        return {nodo: costo_minimo * (abs(x - destino[0]) + abs(y - destino[1]))
+                for nodo, (x, y) in coordenadas.items()}
+    return {nodo: math.dist(p, destino) for nodo, p in coordenadas.items()}
+
+
+# ============ Instrumentación ============
+class GrafoContador(dict):
+    """
+    Diccionario de adyacencia que cuenta las consultas de vecinos:
+    cada consulta corresponde a la expansión de un nodo.
+    """
+
+    def __init__(self, datos, contador):
+        super().__init__(datos)
+        self.contador = contador
+
+    def get(self, clave, defecto=None):
+        self.contador[0] += 1
+        return super().get(clave, defecto)
+
+    def __getitem__(self, clave):
+        self.contador[0] += 1
+        return super().__getitem__(clave)
+
+
+# ============ Catálogo de búsquedas ============
+def catalogo():
+    """
+    Cada entrada: (nombre, función, preparar), donde preparar(caso, contador)
+    devuelve los argumentos. Con contador=None no se instrumenta el grafo.
+    Devuelve también construir_indice_inverso y la práctica de instrumentación.
+    Quedan fuera AO* (grafos Y-O), los algoritmos genéticos y la búsqueda
+    online, que no reciben un grafo como argumento.
+    """
+    no_informada = "Busqueda No Informada/"
+    anchura = cargar_script(no_informada + "0002_Busqueda_Anchura.py")
+    costo_uniforme = cargar_script(no_informada + "0003_Busqueda_Anchura_Costo_Uniforme.py")
+    profundidad = cargar_script(no_informada + "0004_Busqueda_Profundidad.py")
+    limitada = cargar_script(no_informada + "0005_Busqueda_Profundidad_Limitada.py")
+    iterativa = cargar_script(no_informada + "0006_Busqueda_Profundidad_Iterativa.py")
+    bidireccional = cargar_script(no_informada + "0007_Busqueda_Bidireccional.py")
+    general = cargar_script(no_informada + "0008_Busqueda_Grafos_General.py")
+    voraz = cargar_script("Busqueda Informada/0002_Busqueda_Voraz.py")
+    a_y_ao = cargar_script("Busqueda Informada/0003_Busqueda_A y AO.py")
+    colinas = cargar_script("Busqueda Informada/0004_Busqueda_Ascensión_Colinas.py")
+    tabu = cargar_script("Busqueda Informada/0005_Busqueda_Tabu.py")
+    temple = cargar_script("Busqueda Informada/0006_Busqueda_Temple_Simulado.py")
+    haz = cargar_script("Busqueda Informada/0007_Busqueda_Haz_Local.py")
+    instrumentacion = cargar_script("Busqueda Informada/0011_Instrumentacion_Busquedas.py")
+
+    def g(caso, contador, con_costos=False):
+        grafo = caso['grafo'] if con_costos else caso['lista']
+        return grafo if contador is None else GrafoContador(grafo, contador)
+
+    def inverso(caso, contador, con_costos=False):
+        ind = caso['inverso' if con_costos else 'inverso_lista']
+        return ind if contador is None else GrafoContador(ind, contador)
+
+    return [
+        ('bfs', anchura.bfs, lambda c, k: (g(c, k), c['inicio'])),
+        ('costo_uniforme', costo_uniforme.busqueda_costo_uniforme,
+         lambda c, k: (g(c, k, True), c['inicio'], c['objetivo'])),
+        ('profundidad', profundidad.busqueda_en_profundidad,
+         lambda c, k: (g(c, k), c['inicio'], c['objetivo'])),
+        ('profundidad_limitada', limitada.busqueda_profundidad_limitada,
+         lambda c, k: (g(c, k), c['inicio'], c['objetivo'], len(c['grafo']))),
+        ('profundidad_iterativa', iterativa.busqueda_profundidad_iterativa,
+         lambda c, k: (g(c, k), c['inicio'], c['objetivo'])),
+        ('ida_estrella', iterativa.busqueda_ida_estrella,
+         lambda c, k: (g(c, k, True), c['h'], c['inicio'], c['objetivo'])),
+        ('bidireccional', bidireccional.busqueda_bidireccional,
+         lambda c, k: (g(c, k), c['inicio'], c['objetivo'], inverso(c, k))),
+        ('bidireccional_costos', bidireccional.busqueda_bidireccional_dijkstra,
+         lambda c, k: (g(c, k, True), c['inicio'], c['objetivo'], inverso(c, k, True))),
+        ('grafos_general', general.busqueda_en_grafos,
+         lambda c, k: (g(c, k), c['inicio'], c['objetivo'])),
+        ('voraz', voraz.busqueda_voraz,
+         lambda c, k: (g(c, k), c['h'], c['inicio'], c['objetivo'])),
+        ('a_estrella', a_y_ao.busqueda_a_estrella,
+         lambda c, k: (g(c, k, True), c['h'], c['inicio'], c['objetivo'])),
+        ('ascension_colinas', colinas.ascension_colinas,
+         lambda c, k: (g(c, k), c['h'], c['inicio'], c['objetivo'])),
+        ('tabu', tabu.busqueda_tabu,
+         lambda c, k: (g(c, k), c['h'], c['inicio'], c['objetivo'])),
+        ('temple_simulado', temple.temple_simulado,
+         lambda c, k: (g(c, k), c['h'], c['inicio'], c['objetivo'])),
+        ('haz_local', haz.busqueda_haz_local,
+         lambda c, k: (g(c, k), c['h'], c['inicio'], c['objetivo'])),
+    ], bidireccional.construir_indice_inverso, instrumentacion
+
+
+def resumir_resultado(resultado, caso):
+    # Normaliza las distintas formas de resultado a (éxito, longitud, costo)
+    if isinstance(resultado, tuple) and len(resultado) >= 2 and isinstance(resultado[0], list):
+        camino, extra = resultado[0], resultado[1]
+        exito = extra if isinstance(extra, bool) else camino is not None
+        costo = extra if not isinstance(extra, bool) else None
+    elif isinstance(resultado, tuple):
+        camino, costo = resultado[0], resultado[1] if len(resultado) > 1 else None
+        exito = camino is not None
+    else:
+        camino, costo = resultado, None
+        exito = camino is not None
+    if isinstance(camino, list) and camino and camino[-1] != caso['objetivo']:
+        exito = exito and caso['objetivo'] in camino
+    longitud = len(camino) if camino else 0
+    if isinstance(costo, float):
+        costo = round(costo, 3)
+    return exito, longitud, costo
+
+
+# ============ Ejecución ============
+def ejecutar_benchmark(tamanos=TAMANOS, semilla=SEMILLA, salida=None, medir_frontera=True):
+    """
+    Corre todas las búsquedas sobre todos los grafos y devuelve una lista de
+    filas (diccionarios con COLUMNAS). Si se da 'salida', también las escribe en CSV.
+    La frontera máxima sólo se mide en las búsquedas que aceptan observador
+    (las locales e IDA* no guardan frontera); en las demás queda en None.
+    """
+    busquedas, construir_inverso, instrumentacion = catalogo()
+    filas = []
+
+    for familia, lista_tamanos in tamanos.items():
+        for n in lista_tamanos:
+            rng = random.Random(semilla)
+            grafo, coordenadas, inicio, objetivo = GENERADORES[familia](n, rng)
+            lista = {nodo: [vecino for vecino, _ in vecinos] for nodo, vecinos in grafo.items()}
+            caso = {
+                'grafo': grafo, 'lista': lista, 'inicio': inicio, 'objetivo': objetivo,
+                'h': calcular_heuristicas(grafo, coordenadas, objetivo),
+                'inverso': construir_inverso(grafo), 'inverso_lista': construir_inverso(lista),
+            }
+            aristas = sum(len(vecinos) for vecinos in grafo.values())
+
+            for nombre, funcion, preparar in busquedas:
+                if len(grafo) > LIMITE_NODOS.get(nombre, float('inf')):
+                    continue
+
+                # 1) Tiempo, sin instrumentar
+                mejor_tiempo = float('inf')
+                for _ in range(REPETICIONES):
+                    random.seed(semilla)
+                    argumentos = preparar(caso, None)
+                    t = time.perf_counter()
+                    resultado = funcion(*argumentos)
+                    mejor_tiempo = min(mejor_tiempo, time.perf_counter() - t)
+
+                # 2) Nodos expandidos, pico de memoria y, si la búsqueda acepta
+                #    observador, tamaño máximo de la frontera
+                contador = [0]
+                opciones = {}
+                if medir_frontera and 'observador' in inspect.signature(funcion).parameters:
+                    opciones['observador'] = instrumentacion.FronteraMaxima()
+                random.seed(semilla)
+                argumentos = preparar(caso, contador)
+                tracemalloc.start()
+                funcion(*argumentos, **opciones)
+                pico = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                frontera = opciones['observador'].maximo if opciones else None
+
+                exito, longitud, costo = resumir_resultado(resultado, caso)
+                filas.append({
+                    'busqueda': nombre, 'familia': familia, 'nodos': len(grafo),
+                    'aristas': aristas, 'semilla': semilla, 'segundos': round(mejor_tiempo, 6),
+                    'expandidos': contador[0], 'frontera_max': frontera,
+                    'memoria_pico_kib': round(pico / 1024, 1), 'exito': exito,
+                    'longitud': longitud, 'costo': costo,
+                })
+
+    if salida is not None:
+        with open(salida, 'w', newline='', encoding='utf-8') as archivo:
+            escritor = csv.DictWriter(archivo, fieldnames=COLUMNAS)
+            escritor.writeheader()
+            escritor.writerows(filas)
+    return filas
+
+
+def fallos_inesperados(filas):
+    # Filas de búsquedas completas que no llegaron al objetivo
+    return [fila for fila in filas
+            if not fila['exito'] and fila['busqueda'] not in BUSQUEDAS_LOCALES]
+
+
+def imprimir_resumen_fallos(filas):
+    locales = [fila for fila in filas if fila['busqueda'] in BUSQUEDAS_LOCALES]
+    print(f"\nBúsquedas locales que no llegaron al objetivo (esperable): "
+          f"{sum(not fila['exito'] for fila in locales)} de {len(locales)}")
+    fallos = fallos_inesperados(filas)
+    if not fallos:
+        print("Todas las búsquedas completas llegaron al objetivo")
+    for fila in fallos:
+        print(f"FALLO: {fila['busqueda']} no llegó al objetivo en {fila['familia']} "
+              f"con {fila['nodos']} nodos")
+    return fallos
+
+
+def imprimir_tabla(filas):
+    print(f"{'búsqueda':<22}{'familia':<13}{'nodos':>6}{'segundos':>10}{'expand.':>9}"
+          f"{'frontera':>9}{'KiB':>9}{'éxito':>7}{'costo':>10}")
+    fallos = fallos_inesperados(filas)
+    for fila in filas:
+        frontera = '-' if fila['frontera_max'] is None else fila['frontera_max']
+        costo = '-' if fila['costo'] is None else fila['costo']
+        exito = 'FALLO' if fila in fallos else str(fila['exito'])
+        print(f"{fila['busqueda']:<22}{fila['familia']:<13}{fila['nodos']:>6}"
+              f"{fila['segundos']:>10.4f}{fila['expandidos']:>9}{frontera:>9}"
+              f"{fila['memoria_pico_kib']:>9}{exito:>7}{costo:>10}")
+
+
+# ============ Ejecutar ============
+if __name__ == "__main__":
+    # Uso: python "0010_Benchmark_Busquedas.py" [resultados.csv]
+    salida = sys.argv[1] if len(sys.argv) > 1 else None
+    filas = ejecutar_benchmark(salida=salida)
+    imprimir_tabla(filas)
+    fallos = imprimir_resumen_fallos(filas)
+    if salida:
+        print(f"\nResultados guardados en {salida}")
+    if fallos:
+        sys.exit(1)
@@ -0,0 +1,275 @@
+"""
+Prácticas de Inteligencia Artificial
+Instrumentación de las búsquedas: observadores de eventos
+(nodos expandidos, factor de ramificación efectivo, frontera máxima y tiempos por fase)
+"""
+import os
+import random
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ not in sys.path:
+    sys.path.insert(0, RAIZ)
+from comunes import cargar_script
+
+
+# =================== Interfaz del observador ===================
+class ObservadorBusqueda:
+    """
+    Las búsquedas que aceptan el parámetro observador llaman a estos métodos:
+      al_insertar(nodo)          un nodo entra en la frontera (cola, pila o capa)
+      al_extraer(nodo)           un nodo sale de la frontera
+      al_expandir(nodo)          se generan los sucesores del nodo
+      al_objetivo(nodo, camino)  se encontró el objetivo
+    Con observador=None las búsquedas sólo pagan una comparación por evento.
+    """
+
+    def al_insertar(self, nodo):
+        pass
+
+    def al_extraer(self, nodo):
+        pass
+
+    def al_expandir(self, nodo):
+        pass
+
+    def al_objetivo(self, nodo, camino):
+        pass
+
+
+class Observadores(ObservadorBusqueda):
+    # Reparte cada evento entre varios observadores
+    def __init__(self, *observadores):
+        self.observadores = observadores
+
+    def al_insertar(self, nodo):
+        for observador in self.observadores:
+            observador.al_insertar(nodo)
+
+    def al_extraer(self, nodo):
+        for observador in self.observadores:
+            observador.al_extraer(nodo)
+
+    def al_expandir(self, nodo):
+        for observador in self.observadores:
+            observador.al_expandir(nodo)
+
+    def al_objetivo(self, nodo, camino):
+        for observador in self.observadores:
+            observador.al_objetivo(nodo, camino)
+
+
+# =================== Recolectores ===================
+class ContadorNodos(ObservadorBusqueda):
+    # Cuenta generados (insertados), extraídos y expandidos
+    def __init__(self):
+        self.generados = 0
+        self.extraidos = 0
+        self.expandidos = 0
+
+    def al_insertar(self, nodo):
+        self.generados += 1
+
+    def al_extraer(self, nodo):
+        self.extraidos += 1
+
+    def al_expandir(self, nodo):
+        self.expandidos += 1
+
+
+class FactorRamificacion(ContadorNodos):
+    """
+    Factor de ramificación efectivo b*: si se generaron N nodos (sin contar el
+    inicial) y la solución está a profundidad d, b* cumple
+    N + 1 = 1 + b* + b*^2 + ... + b*^d. Cuanto más cerca de 1, mejor la heurística.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.profundidad = None
+
+    def al_objetivo(self, nodo, camino):
+        self.profundidad = len(camino) - 1
+
+    def valor(self, tolerancia=1e-6):
+        if self.profundidad is None or self.profundidad == 0:
+            return None
+        n, d = max(self.generados - 1, 1), self.profundidad
+
+        def total(b):
+            return d + 1 if b == 1 else (b ** (d + 1) - 1) / (b - 1)
+
+        # total(b) crece con b y b^d < total(b): se busca por bisección en [1, (n+1)^(1/d)]
+        bajo, alto = 1.0, max(1.0, (n + 1) ** (1 / d))
+        while alto - bajo > tolerancia:
+            medio = (bajo + alto) / 2
+            if total(medio) < n + 1:
+                bajo = medio
+            else:
+                alto = medio
+        return (bajo + alto) / 2
+
+
+class FronteraMaxima(ObservadorBusqueda):
+    # Tamaño máximo de la frontera: inserciones menos extracciones
+    def __init__(self):
+        self.tamano = 0
+        self.maximo = 0
+
+    def al_insertar(self, nodo):
+        self.tamano += 1
+        if self.tamano > self.maximo:
+            self.maximo = self.tamano
+
+    def al_extraer(self, nodo):
+        self.tamano -= 1
+
+
+class TiemposPorFase(ObservadorBusqueda):
+    """
+    Reparte el tiempo transcurrido entre eventos consecutivos según el evento
+    que cierra cada tramo:
+      'extraccion'   termina en al_extraer (sacar el mejor nodo de la frontera)
+      'prueba'       termina en al_expandir (prueba de objetivo, cerrados, ...)
+      'generacion'   termina en al_insertar (sucesores, costos y heurística)
+    """
+
+    def __init__(self, reloj=time.perf_counter):
+        self.reloj = reloj
+        self.segundos = {'extraccion': 0.0, 'prueba': 0.0, 'generacion': 0.0}
+        self.ultimo = None
+        self.total = 0.0
+
+    def _marcar(self, fase):
+        ahora = self.reloj()
+        if self.ultimo is not None:
+            self.segundos[fase] += ahora - self.ultimo
+        self.ultimo = ahora
+
+    def al_insertar(self, nodo):
+        self._marcar('generacion')
+
+    def al_extraer(self, nodo):
+        self._marcar('extraccion')
+
+    def al_expandir(self, nodo):
+        self._marcar('prueba')
+
+    def al_objetivo(self, nodo, camino):
+        self._marcar('prueba')
+        self.total = sum(self.segundos.values())
+
+
+class Trazador(ObservadorBusqueda):
+    # Guarda los primeros 'limite' eventos para depurar una búsqueda pequeña
+    def __init__(self, limite=1000):
+        self.limite = limite
+        self.eventos = []
+
+    def _anotar(self, *evento):
+        if len(self.eventos) < self.limite:
+            self.eventos.append(evento)
+
+    def al_insertar(self, nodo):
+        self._anotar('insertar', nodo)
+
+    def al_extraer(self, nodo):
+        self._anotar('extraer', nodo)
+
+    def al_expandir(self, nodo):
+        self._anotar('expandir', nodo)
+
+    def al_objetivo(self, nodo, camino):
+        self._anotar('objetivo', nodo, tuple(camino))
+
+
+def instrumentar(funcion, *argumentos, **opciones):
+    """
+    Ejecuta una búsqueda con los recolectores habituales y devuelve
+    (resultado, resumen) donde resumen es un diccionario listo para imprimir.
+    """
+    ramificacion, frontera, tiempos = FactorRamificacion(), FronteraMaxima(), TiemposPorFase()
+    inicio = time.perf_counter()
+    resultado = funcion(*argumentos, observador=Observadores(ramificacion, frontera, tiempos),
+                        **opciones)
+    segundos = time.perf_counter() - inicio
+    resumen = {
+        'expandidos': ramificacion.expandidos,
+        'generados': ramificacion.generados,
+        'profundidad': ramificacion.profundidad,
+        'b*': ramificacion.valor(),
+        'frontera_max': frontera.maximo,
+        'segundos': segundos,
+        'fases': dict(tiempos.segundos),
+    }
+    return resultado, resumen
+
+
+# =================== Ejemplo de uso ===================
+if __name__ == "__main__":
+    a_estrella = cargar_script("Busqueda Informada/0003_Busqueda_A y AO.py").busqueda_a_estrella
+    voraz = cargar_script("Busqueda Informada/0002_Busqueda_Voraz.py").busqueda_voraz
+    costo_uniforme = cargar_script("Busqueda No Informada/0003_Busqueda_Anchura_Costo_Uniforme.py"
+                                   ).busqueda_costo_uniforme
+
+    grafo = {
+        'A': [('B', 1), ('C', 4)],
+        'B': [('D', 2), ('E', 5)],
+        'C': [('F', 1)],
+        'D': [],
+        'E': [('F', 1)],
+        'F': []
+    }
+    heuristicas = {'A': 6, 'B': 4, 'C': 4, 'D': 2, 'E': 1, 'F': 0}
+
+    trazador = Trazador()
+    camino, costo = a_estrella(grafo, heuristicas, 'A', 'F', observador=trazador)
+    print(f"Camino encontrado: {camino} (costo {costo})")
+    for evento in trazador.eventos:
+        print(" ", *evento)
+
+    # Rejilla 120 x 120 con costos al azar: ¿la lentitud es de la heurística o del grafo?
+    random.seed(0)
+    lado = 120
+    rejilla = {}
+    for f in range(lado):
+        for c in range(lado):
+            rejilla[(f, c)] = [((f + df, c + dc), random.randint(5, 9))
+                               for df, dc in ((1, 0), (0, 1), (-1, 0), (0, -1))
+                               if 0 <= f + df < lado and 0 <= c + dc < lado]
+    inicio, objetivo = (lado // 2, 10), (lado // 2, lado - 10)
+    # Cada paso cuesta al menos 5: 5 * distancia manhattan es admisible
+    manhattan = {(f, c): 5 * (abs(objetivo[0] - f) + abs(objetivo[1] - c)) for f, c in rejilla}
+
+    casos = [
+        ("costo uniforme", costo_uniforme, (rejilla, inicio, objetivo)),
+        ("A* h = 0", a_estrella, (rejilla, dict.fromkeys(rejilla, 0), inicio, objetivo)),
+        ("A* h = manhattan/2", a_estrella, (rejilla, {n: h / 2 for n, h in manhattan.items()},
+                                             inicio, objetivo)),
+        ("A* h = manhattan", a_estrella, (rejilla, manhattan, inicio, objetivo)),
+        ("voraz h = manhattan", voraz, ({n: [v for v, _ in vs] for n, vs in rejilla.items()},
+                                        manhattan, inicio, objetivo)),
+    ]
+    print(f"\n{'búsqueda':<22}{'expandidos':>11}{'b*':>8}{'frontera':>10}{'segundos':>10}"
+          f"{'extraer':>9}{'probar':>8}{'generar':>9}")
+    for nombre, funcion, argumentos in casos:
+        _, resumen = instrumentar(funcion, *argumentos)
+        fases = resumen['fases']
+        total = sum(fases.values()) or 1
+        print(f"{nombre:<22}{resumen['expandidos']:>11}{resumen['b*']:>8.3f}"
+              f"{resumen['frontera_max']:>10}{resumen['segundos']:>10.3f}"
+              f"{fases['extraccion'] / total:>9.0%}{fases['prueba'] / total:>8.0%}"
+              f"{fases['generacion'] / total:>9.0%}")
+
+    # Costo de los ganchos cuando no hay observador
+    for etiqueta, observador in (("sin observador", None), ("con ContadorNodos", ContadorNodos())):
+        t = time.perf_counter()
+        for _ in range(3):
+            a_estrella(rejilla, manhattan, inicio, objetivo, observador=observador)
+        print(f"\nA* {etiqueta}: {(time.perf_counter() - t) / 3:.3f} s por búsqueda", end="")
+    print()
+
+#Camino encontrado: ['A', 'B', 'E', 'F'] (costo 7)
+#La heurística débil (h = 0 o manhattan/2) expande muchos más nodos con el mismo grafo,
+#y su b* se aleja de 1: el problema es la heurística, no el factor de ramificación.
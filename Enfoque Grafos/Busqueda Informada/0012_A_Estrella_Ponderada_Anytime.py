@@ -0,0 +1,290 @@
+"""
+Prácticas de Inteligencia Artificial
+A* ponderado, A* anytime con reparación (ARA*) y búsqueda focal acotada
+"""
+import heapq
+import os
+import random
+import sys
+import time
+from itertools import count
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ not in sys.path:
+    sys.path.insert(0, RAIZ)
+from comunes import cargar_script, reconstruir_camino
+
+
+# =================== A* ponderado ===================
+def a_estrella_ponderada(grafo, heuristicas, inicio, objetivo, peso=1.0, reabrir=True,
+                         estadisticas=None, observador=None):
+    """
+    A* con f = g + peso * h. Con h admisible el costo devuelto es como mucho
+    peso veces el óptimo; con peso = 1 es el A* de siempre.
+    Con reabrir=False los nodos cerrados no vuelven a la frontera: la cota se
+    mantiene si h es consistente y se ahorran reexpansiones.
+    Devuelve (camino, costo).
+    """
+    orden = count()
+    mejor_costo = {inicio: 0}
+    padres = {inicio: None}
+    cerrados = set()
+    cola = [(peso * heuristicas[inicio], 0, next(orden), inicio)]
+    expandidos = 0
+    if observador is not None:
+        observador.al_insertar(inicio)
+
+    while cola:
+        _, costo_actual, _, nodo_actual = heapq.heappop(cola)
+        if costo_actual > mejor_costo[nodo_actual] or nodo_actual in cerrados:
+            continue  # Entrada vieja: el nodo ya salió con un g mejor
+        if observador is not None:
+            observador.al_extraer(nodo_actual)
+
+        if nodo_actual == objetivo:
+            camino = reconstruir_camino(padres, nodo_actual)
+            if estadisticas is not None:
+                estadisticas['expandidos'] = expandidos
+            if observador is not None:
+                observador.al_objetivo(nodo_actual, camino)
+            return camino, costo_actual
+
+        cerrados.add(nodo_actual)
+        expandidos += 1
+        if observador is not None:
+            observador.al_expandir(nodo_actual)
+
+        for vecino, costo in grafo.get(nodo_actual, []):
+            nuevo_costo = costo_actual + costo
+            if nuevo_costo >= mejor_costo.get(vecino, float('inf')):
+                continue
+            if vecino in cerrados:
+                if not reabrir:
+                    continue
+                cerrados.discard(vecino)
+            mejor_costo[vecino] = nuevo_costo
+            padres[vecino] = nodo_actual
+            heapq.heappush(cola, (nuevo_costo + peso * heuristicas[vecino], nuevo_costo,
+                                  next(orden), vecino))
+            if observador is not None:
+                observador.al_insertar(vecino)
+
+    if estadisticas is not None:
+        estadisticas['expandidos'] = expandidos
+    return None, float('inf')
+
+
+# =================== ARA* (Anytime Repairing A*) ===================
+def ara_estrella(grafo, heuristicas, inicio, objetivo, peso_inicial=3.0, paso=0.5,
+                 presupuesto=None, reloj=time.perf_counter):
+    """
+    Generador anytime: empieza con A* ponderado (peso_inicial) y va bajando el
+    peso hasta 1, reutilizando g y los padres de la iteración anterior. Los
+    nodos que mejoran después de cerrarse se guardan como inconsistentes y sólo
+    se reabren en la siguiente iteración, así ninguna se expande dos veces.
+    Produce (camino, costo, cota) cada vez que termina una iteración; cota es
+    una garantía de suboptimalidad: costo <= cota * óptimo (con h admisible).
+    presupuesto: segundos disponibles; al agotarse se deja de producir.
+    """
+    limite = None if presupuesto is None else reloj() + presupuesto
+    infinito = float('inf')
+    g = {inicio: 0}
+    padres = {inicio: None}
+    abiertos = {inicio}
+    inconsistentes = set()
+    orden = count()
+    peso = peso_inicial
+
+    while True:
+        # La frontera se reconstruye con el peso de esta iteración
+        cola = [(g[n] + peso * heuristicas[n], g[n], next(orden), n) for n in abiertos]
+        heapq.heapify(cola)
+        cerrados = set()
+        agotado = False
+
+        while True:
+            # Se descartan entradas viejas antes de mirar el mínimo
+            while cola and (cola[0][3] not in abiertos or cola[0][1] != g[cola[0][3]]):
+                heapq.heappop(cola)
+            f_objetivo = g.get(objetivo, infinito) + peso * heuristicas[objetivo]
+            if not cola or f_objetivo <= cola[0][0]:
+                break
+            if limite is not None and reloj() > limite:
+                agotado = True
+                break
+
+            _, costo_actual, _, nodo_actual = heapq.heappop(cola)
+            abiertos.discard(nodo_actual)
+            cerrados.add(nodo_actual)
+            for vecino, costo in grafo.get(nodo_actual, []):
+                nuevo_costo = costo_actual + costo
+                if nuevo_costo < g.get(vecino, infinito):
+                    g[vecino] = nuevo_costo
+                    padres[vecino] = nodo_actual
+                    if vecino in cerrados:
+                        inconsistentes.add(vecino)
+                    else:
+                        abiertos.add(vecino)
+                        heapq.heappush(cola, (nuevo_costo + peso * heuristicas[vecino],
+                                              nuevo_costo, next(orden), vecino))
+
+        if agotado or objetivo not in g:
+            return
+
+        # Cota real: el óptimo no puede ser menor que el mínimo g + h pendiente
+        pendientes = [g[n] + heuristicas[n] for n in abiertos | inconsistentes]
+        cota = min(peso, g[objetivo] / min(pendientes)) if pendientes and min(pendientes) > 0 else 1.0
+        yield reconstruir_camino(padres, objetivo), g[objetivo], max(cota, 1.0)
+
+        if peso <= 1.0:
+            return
+        peso = max(1.0, peso - paso)
+        abiertos |= inconsistentes
+        inconsistentes = set()
+
+
+def ara_estrella_en_presupuesto(grafo, heuristicas, inicio, objetivo, segundos, **opciones):
+    # La mejor solución que ARA* alcanza a dar en el tiempo disponible
+    mejor = (None, float('inf'), float('inf'))
+    for solucion in ara_estrella(grafo, heuristicas, inicio, objetivo, presupuesto=segundos,
+                                 **opciones):
+        mejor = solucion
+    return mejor
+
+
+# =================== Búsqueda focal (A*ε) ===================
+def busqueda_focal(grafo, heuristicas, inicio, objetivo, peso=1.5, heuristica_focal=None,
+                   estadisticas=None):
+    """
+    Búsqueda acotada: la lista FOCAL tiene los nodos abiertos con
+    f <= peso * f_min y de ellos se expande el de menor heuristica_focal
+    (por defecto la propia h, es decir, el que parece más cercano al objetivo).
+    Con h admisible el costo devuelto es como mucho peso veces el óptimo.
+    Devuelve (camino, costo).
+    """
+    if heuristica_focal is None:
+        heuristica_focal = heuristicas
+    infinito = float('inf')
+    orden = count()
+    g = {inicio: 0}
+    padres = {inicio: None}
+    cerrados = set()
+    # abierta: todos los abiertos por f; pendientes: los que aún no entran en FOCAL
+    abierta = [(heuristicas[inicio], 0, next(orden), inicio)]
+    pendientes = list(abierta)
+    focal = []
+    expandidos = 0
+
+    def vigente(entrada):
+        return entrada[3] not in cerrados and entrada[1] == g[entrada[3]]
+
+    while True:
+        while abierta and not vigente(abierta[0]):
+            heapq.heappop(abierta)
+        if not abierta:
+            break
+        # f_min no baja con h consistente: basta con ir pasando pendientes a FOCAL
+        tope = peso * abierta[0][0]
+        while pendientes and pendientes[0][0] <= tope:
+            f, costo, marca, nodo = heapq.heappop(pendientes)
+            if vigente((f, costo, marca, nodo)):
+                heapq.heappush(focal, (heuristica_focal[nodo], f, costo, marca, nodo))
+        while focal and not vigente(focal[0][1:]):
+            heapq.heappop(focal)
+        if not focal:
+            continue  # Todo FOCAL estaba viejo: se recalcula con la nueva f_min
+
+        _, _, costo_actual, _, nodo_actual = heapq.heappop(focal)
+        if nodo_actual == objetivo:
+            if estadisticas is not None:
+                estadisticas['expandidos'] = expandidos
+            return reconstruir_camino(padres, nodo_actual), costo_actual
+
+        cerrados.add(nodo_actual)
+        expandidos += 1
+        for vecino, costo in grafo.get(nodo_actual, []):
+            nuevo_costo = costo_actual + costo
+            if nuevo_costo >= g.get(vecino, infinito):
+                continue
+            cerrados.discard(vecino)
+            g[vecino] = nuevo_costo
+            padres[vecino] = nodo_actual
+            entrada = (nuevo_costo + heuristicas[vecino], nuevo_costo, next(orden), vecino)
+            heapq.heappush(abierta, entrada)
+            if entrada[0] <= tope:
+                heapq.heappush(focal, (heuristica_focal[vecino],) + entrada)
+            else:
+                heapq.heappush(pendientes, entrada)
+
+    if estadisticas is not None:
+        estadisticas['expandidos'] = expandidos
+    return None, infinito
+
+
+# =================== Ejemplo de uso ===================
+if __name__ == "__main__":
+    a_estrella = cargar_script("Busqueda Informada/0003_Busqueda_A y AO.py").busqueda_a_estrella
+
+    # Heurística admisible pero inconsistente: C se cierra primero con g = 4
+    # (vía B) y luego aparece un camino mejor vía A; sin reabrir, A* daría costo 7
+    grafo = {
+        'S': [('A', 1), ('B', 1)],
+        'A': [('C', 1)],
+        'B': [('C', 3)],
+        'C': [('G', 3)],
+        'G': []
+    }
+    heuristicas = {'S': 0, 'A': 4, 'B': 0, 'C': 0, 'G': 0}
+    print("A* reabriendo:", a_estrella(grafo, heuristicas, 'S', 'G'))
+    print("A* ponderado sin reabrir:",
+          a_estrella_ponderada(grafo, heuristicas, 'S', 'G', reabrir=False))
+
+    # Rejilla 200 x 200 con obstáculos; cada paso cuesta entre 5 y 9
+    random.seed(1)
+    lado = 200
+    libres = {(f, c) for f in range(lado) for c in range(lado) if random.random() > 0.2}
+    inicio = (0, 0)
+    libres.add(inicio)
+    rejilla = {(f, c): [((f + df, c + dc), random.randint(5, 9))
+                        for df, dc in ((1, 0), (0, 1), (-1, 0), (0, -1))
+                        if (f + df, c + dc) in libres]
+               for f, c in libres}
+    # Objetivo: la celda alcanzable más cercana a la esquina opuesta
+    alcanzables, pila = {inicio}, [inicio]
+    while pila:
+        for vecino, _ in rejilla[pila.pop()]:
+            if vecino not in alcanzables:
+                alcanzables.add(vecino)
+                pila.append(vecino)
+    objetivo = max(alcanzables, key=lambda celda: (sum(celda), celda))
+    h = {(f, c): 5 * (abs(objetivo[0] - f) + abs(objetivo[1] - c)) for f, c in rejilla}
+
+    print(f"\n{'búsqueda':<22}{'costo':>7}{'expandidos':>12}{'ms':>9}")
+    optimo = None
+    for etiqueta, funcion, opciones in (
+            ("A* (peso 1)", a_estrella_ponderada, {'peso': 1.0}),
+            ("A* ponderado 1.5", a_estrella_ponderada, {'peso': 1.5, 'reabrir': False}),
+            ("A* ponderado 3", a_estrella_ponderada, {'peso': 3.0, 'reabrir': False}),
+            ("focal 1.5", busqueda_focal, {'peso': 1.5})):
+        estadisticas = {}
+        t = time.perf_counter()
+        _, costo = funcion(rejilla, h, inicio, objetivo, estadisticas=estadisticas, **opciones)
+        ms = (time.perf_counter() - t) * 1000
+        optimo = optimo or costo
+        print(f"{etiqueta:<22}{costo:>7}{estadisticas['expandidos']:>12}{ms:>9.1f}"
+              f"   ({costo / optimo:.3f} x óptimo)")
+
+    print("\nARA* sin límite de tiempo:")
+    t = time.perf_counter()
+    for camino, costo, cota in ara_estrella(rejilla, h, inicio, objetivo, peso_inicial=2.0, paso=0.1):
+        print(f"  {(time.perf_counter() - t) * 1000:7.1f} ms: costo {costo} (cota {cota:.3f})")
+
+    for presupuesto in (0.005, 0.05, 0.5):
+        _, costo, cota = ara_estrella_en_presupuesto(rejilla, h, inicio, objetivo, presupuesto,
+                                                     peso_inicial=2.0, paso=0.1)
+        print(f"ARA* con {presupuesto * 1000:.0f} ms: costo {costo} (cota {cota:.3f})")
+
+#A* reabriendo: (['S', 'A', 'C', 'G'], 5)
+#A* ponderado sin reabrir: (['S', 'B', 'C', 'G'], 7)
+#Los pesos grandes expanden muchos menos nodos a cambio de caminos algo más caros;
+#ARA* entrega primero esa solución rápida y la va mejorando si queda tiempo.
@@ -0,0 +1,276 @@
+"""
+Prácticas de Inteligencia Artificial
+Replanificación incremental con D* Lite (LPA* con agente en movimiento)
+"""
+import heapq
+import os
+import random
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ not in sys.path:
+    sys.path.insert(0, RAIZ)
+from comunes import cargar_script
+
+INFINITO = float('inf')
+
+
+# =================== D* Lite ===================
+class DEstrellaLite:
+    """
+    Planificador incremental. Busca hacia atrás desde el objetivo y guarda
+    entre replanificaciones dos valores por nodo:
+      g    costo hasta el objetivo según la última vez que se expandió
+      rhs  costo según los sucesores (mínimo de costo(u, s) + g(s))
+    Un nodo es inconsistente si g != rhs; sólo esos entran en la cola, así que
+    tras un cambio de costos se repara la zona afectada y no todo el grafo.
+    Si el agente nunca se mueve es exactamente LPA* sobre el grafo invertido.
+
+    grafo: {nodo: [(vecino, costo), ...]}; heuristica(a, b) debe ser admisible
+    y consistente (por defecto 0).
+    """
+
+    def __init__(self, grafo, inicio, objetivo, heuristica=None):
+        self.heuristica = heuristica or (lambda a, b: 0)
+        self.sucesores = {}
+        self.predecesores = {}
+        for nodo, vecinos in grafo.items():
+            self.sucesores.setdefault(nodo, {})
+            for vecino, costo in vecinos:
+                self.sucesores[nodo][vecino] = costo
+                self.predecesores.setdefault(vecino, {})[nodo] = costo
+        self.inicio = inicio
+        self.objetivo = objetivo
+        self.ultimo = inicio        # Donde estaba el agente la última vez que se replanificó
+        self.km = 0                 # Corrección de claves por los movimientos del agente
+        self.g = {}
+        self.rhs = {objetivo: 0}
+        self.claves = {}            # Nodos en la cola -> su clave vigente
+        self.cola = []
+        self.expansiones = 0
+        self._encolar(objetivo)
+
+    # ----- cola con borrado perezoso -----
+    def _clave(self, nodo):
+        m = min(self.g.get(nodo, INFINITO), self.rhs.get(nodo, INFINITO))
+        return (m + self.heuristica(self.inicio, nodo) + self.km, m)
+
+    def _encolar(self, nodo):
+        clave = self._clave(nodo)
+        self.claves[nodo] = clave
+        heapq.heappush(self.cola, (clave, nodo))
+
+    def _tope(self):
+        while self.cola and self.claves.get(self.cola[0][1]) != self.cola[0][0]:
+            heapq.heappop(self.cola)
+        return self.cola[0] if self.cola else ((INFINITO, INFINITO), None)
+
+    # ----- núcleo del algoritmo -----
+    def _actualizar_nodo(self, nodo):
+        if nodo != self.objetivo:
+            self.rhs[nodo] = min((costo + self.g.get(s, INFINITO)
+                                  for s, costo in self.sucesores.get(nodo, {}).items()),
+                                 default=INFINITO)
+        self.claves.pop(nodo, None)
+        if self.g.get(nodo, INFINITO) != self.rhs.get(nodo, INFINITO):
+            self._encolar(nodo)
+
+    def calcular_camino_mas_corto(self):
+        # Expande nodos inconsistentes hasta que el del agente es consistente
+        # y ninguno de la cola puede mejorarlo
+        while True:
+            clave_vieja, nodo = self._tope()
+            if nodo is None or (clave_vieja >= self._clave(self.inicio)
+                                and self.rhs.get(self.inicio, INFINITO) == self.g.get(self.inicio, INFINITO)):
+                return self.g.get(self.inicio, INFINITO)
+
+            clave_nueva = self._clave(nodo)
+            if clave_vieja < clave_nueva:
+                self._encolar(nodo)     # La clave quedó vieja por un movimiento del agente
+                continue
+            heapq.heappop(self.cola)
+            del self.claves[nodo]
+            self.expansiones += 1
+            if self.g.get(nodo, INFINITO) > self.rhs[nodo]:
+                self.g[nodo] = self.rhs[nodo]                   # Sobreconsistente: baja
+                for predecesor in self.predecesores.get(nodo, {}):
+                    self._actualizar_nodo(predecesor)
+            else:
+                self.g[nodo] = INFINITO                         # Subconsistente: se rehace
+                for predecesor in self.predecesores.get(nodo, {}):
+                    self._actualizar_nodo(predecesor)
+                self._actualizar_nodo(nodo)
+
+    def mover_a(self, nodo):
+        # El agente avanzó: las claves viejas se corrigen con km en lugar de rehacer la cola
+        self.km += self.heuristica(self.ultimo, nodo)
+        self.ultimo = nodo
+        self.inicio = nodo
+
+    def actualizar_aristas(self, cambios):
+        # cambios: [(u, v, nuevo_costo), ...]; INFINITO bloquea la arista
+        for u, v, costo in cambios:
+            self.sucesores.setdefault(u, {})[v] = costo
+            self.predecesores.setdefault(v, {})[u] = costo
+        for u in {u for u, _, _ in cambios}:
+            self._actualizar_nodo(u)
+
+    def siguiente_paso(self, nodo):
+        return min(self.sucesores.get(nodo, {}).items(),
+                   key=lambda par: par[1] + self.g.get(par[0], INFINITO))[0]
+
+    def camino(self):
+        # Camino actual del agente al objetivo siguiendo el menor costo + g
+        if self.g.get(self.inicio, INFINITO) == INFINITO:
+            return None
+        camino = [self.inicio]
+        while camino[-1] != self.objetivo:
+            camino.append(self.siguiente_paso(camino[-1]))
+        return camino
+
+
+# =================== Agente online ===================
+def navegar_con_replanificacion(planificador, percibir_cambios, max_pasos=100000):
+    """
+    Versión incremental de busqueda_online: el agente sigue el plan, en cada
+    posición consulta su entorno (percibir_cambios(nodo) devuelve las aristas
+    cuyo costo real difiere del supuesto) y sólo replanifica si hubo cambios.
+    Devuelve el recorrido del agente o None si el objetivo es inalcanzable.
+    """
+    recorrido = [planificador.inicio]
+    if planificador.calcular_camino_mas_corto() == INFINITO:
+        return None
+    while recorrido[-1] != planificador.objetivo and len(recorrido) <= max_pasos:
+        cambios = percibir_cambios(recorrido[-1])
+        if cambios:
+            planificador.actualizar_aristas(cambios)
+            if planificador.calcular_camino_mas_corto() == INFINITO:
+                return None
+        siguiente = planificador.siguiente_paso(recorrido[-1])
+        planificador.mover_a(siguiente)
+        recorrido.append(siguiente)
+    return recorrido
+
+
+# =================== Utilidades para el ejemplo ===================
+MOVIMIENTOS = ((1, 0), (0, 1), (-1, 0), (0, -1))
+
+
+def rejilla_con_costos(lado, rng):
+    return {(f, c): [((f + df, c + dc), rng.randint(1, 9)) for df, dc in MOVIMIENTOS
+                     if 0 <= f + df < lado and 0 <= c + dc < lado]
+            for f in range(lado) for c in range(lado)}
+
+
+def manhattan(a, b):
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+
+def grafo_actual(planificador):
+    # Lista de adyacencia con los costos que conoce el planificador (sin aristas bloqueadas)
+    return {u: [(v, c) for v, c in vecinos.items() if c < INFINITO]
+            for u, vecinos in planificador.sucesores.items()}
+
+
+# =================== Ejemplo de uso ===================
+if __name__ == "__main__":
+    a_estrella = cargar_script("Busqueda Informada/0003_Busqueda_A y AO.py").busqueda_a_estrella
+    ContadorNodos = cargar_script("Busqueda Informada/0011_Instrumentacion_Busquedas.py").ContadorNodos
+
+    # El mismo grafo de 0009, pero aquí la arista D -> F se corta a mitad del camino
+    grafo = {
+        'A': [('B', 1), ('C', 1)],
+        'B': [('D', 1)],
+        'C': [('E', 2)],
+        'D': [('F', 1)],
+        'E': [('F', 1)],
+        'F': []
+    }
+    plan = DEstrellaLite(grafo, 'A', 'F')
+    plan.calcular_camino_mas_corto()
+    print("Plan inicial:", plan.camino())
+    plan.actualizar_aristas([('D', 'F', INFINITO)])
+    plan.calcular_camino_mas_corto()
+    print("Con D -> F cortada:", plan.camino(), "costo", plan.g['A'])
+    plan.mover_a('C')
+    plan.actualizar_aristas([('C', 'E', 5)])
+    print("Desde C, con C -> E más cara:", plan.camino() if plan.calcular_camino_mas_corto() < INFINITO
+          else None, "costo", plan.g['C'])
+
+    # ----- Benchmark: cambios de costo sobre el plan frente a A* desde cero -----
+    rng = random.Random(0)
+    lado = 100
+    rejilla = rejilla_con_costos(lado, rng)
+    inicio, objetivo = (0, 0), (lado - 1, lado - 1)
+    h_objetivo = {nodo: manhattan(nodo, objetivo) for nodo in rejilla}
+    plan = DEstrellaLite(rejilla, inicio, objetivo, heuristica=manhattan)
+    t = time.perf_counter()
+    plan.calcular_camino_mas_corto()
+    print(f"\nPlan inicial en {lado}x{lado}: {plan.expansiones} expansiones, "
+          f"{(time.perf_counter() - t) * 1000:.1f} ms")
+
+    total_incremental = total_completa = 0
+    expansiones_incremental = expansiones_completa = 0
+    for _ in range(30):
+        # El agente avanza unos pasos y una arista de su plan se encarece (o se bloquea)
+        for _ in range(3):
+            if plan.inicio != objetivo:
+                plan.mover_a(plan.siguiente_paso(plan.inicio))
+        camino = plan.camino()
+        if len(camino) < 3:
+            break
+        posicion = rng.randrange(1, len(camino) - 1)
+        u, v = camino[posicion], camino[posicion + 1]
+        nuevo_costo = INFINITO if rng.random() < 0.3 else plan.sucesores[u][v] * 10
+        antes = plan.expansiones
+        t = time.perf_counter()
+        plan.actualizar_aristas([(u, v, nuevo_costo), (v, u, nuevo_costo)])
+        costo_incremental = plan.calcular_camino_mas_corto()
+        total_incremental += time.perf_counter() - t
+        expansiones_incremental += plan.expansiones - antes
+
+        contador = ContadorNodos()
+        t = time.perf_counter()
+        _, costo_completo = a_estrella(grafo_actual(plan), h_objetivo, plan.inicio, objetivo,
+                                       observador=contador)
+        total_completa += time.perf_counter() - t
+        expansiones_completa += contador.expandidos
+        assert costo_incremental == costo_completo
+
+    print(f"30 cambios, D* Lite: {expansiones_incremental} expansiones, {total_incremental:.3f} s")
+    print(f"30 cambios, A* desde cero: {expansiones_completa} expansiones, {total_completa:.3f} s")
+
+    # ----- Agente en una rejilla con obstáculos que sólo ve al llegar al lado -----
+    lado = 60
+    obstaculos = {(f, c) for f in range(lado) for c in range(lado) if rng.random() < 0.25}
+    inicio, objetivo = (0, 0), (lado - 1, lado - 1)
+    obstaculos -= {inicio, objetivo}
+    libre = {(f, c): [((f + df, c + dc), 1) for df, dc in MOVIMIENTOS
+                      if 0 <= f + df < lado and 0 <= c + dc < lado]
+             for f in range(lado) for c in range(lado)}   # Supone que todo está libre
+    vistos = set()
+
+    def percibir_cambios(nodo):
+        cambios = []
+        for vecino, _ in libre[nodo]:
+            if vecino in obstaculos and vecino not in vistos:
+                vistos.add(vecino)
+                for otro, _ in libre[vecino]:
+                    cambios += [(otro, vecino, INFINITO), (vecino, otro, INFINITO)]
+        return cambios
+
+    plan = DEstrellaLite(libre, inicio, objetivo, heuristica=manhattan)
+    recorrido = navegar_con_replanificacion(plan, percibir_cambios)
+    if recorrido is None:
+        print("\nAgente: el objetivo es inalcanzable")
+    else:
+        print(f"\nAgente: {len(recorrido) - 1} pasos, {len(vistos)} obstáculos descubiertos, "
+              f"{plan.expansiones} expansiones en total")
+
+
+#Plan inicial: ['A', 'B', 'D', 'F']
+#Con D -> F cortada: ['A', 'C', 'E', 'F'] costo 4
+#Desde C, con C -> E más cara: ['C', 'E', 'F'] costo 6
+#Tras cada cambio D* Lite sólo repara los nodos cuyo g dependía de la arista
+#modificada; A* desde cero vuelve a expandir toda la zona entre el agente y el objetivo.
@@ -0,0 +1,190 @@
+"""
+Prácticas de Inteligencia Artificial
+Reinicios aleatorios en paralelo para las búsquedas locales
+(ascensión de colinas, tabú, temple simulado y haz local)
+"""
+import contextlib
+import multiprocessing
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ not in sys.path:
+    sys.path.insert(0, RAIZ)
+from comunes import cargar_script
+
+# Nombre -> (práctica, función). Todas reciben (grafo, heuristicas, inicio, objetivo, ...)
+# y devuelven una tupla que empieza por (camino, exito)
+ALGORITMOS = {
+    'ascension_colinas': ("Busqueda Informada/0004_Busqueda_Ascensión_Colinas.py", "ascension_colinas"),
+    'busqueda_tabu': ("Busqueda Informada/0005_Busqueda_Tabu.py", "busqueda_tabu"),
+    'temple_simulado': ("Busqueda Informada/0006_Busqueda_Temple_Simulado.py", "temple_simulado"),
+    'busqueda_haz_local': ("Busqueda Informada/0007_Busqueda_Haz_Local.py", "busqueda_haz_local"),
+}
+
+
+def obtener_algoritmo(nombre):
+    practica, funcion = ALGORITMOS[nombre]
+    return getattr(cargar_script(practica), funcion)
+
+
+# =================== Un reinicio ===================
+class _MejorLocal:
+    # Mismo interfaz que multiprocessing.Value para el modo de un solo proceso
+    def __init__(self, valor):
+        self.value = valor
+
+    def get_lock(self):
+        return contextlib.nullcontext()
+
+
+_contexto = {}
+
+
+def _iniciar_trabajador(nombre, grafo, heuristicas, objetivo, opciones, mejor_global, umbral):
+    # Cada proceso recibe el problema y el valor compartido una sola vez
+    _contexto.update(funcion=obtener_algoritmo(nombre), grafo=grafo, heuristicas=heuristicas,
+                     objetivo=objetivo, opciones=opciones, mejor=mejor_global, umbral=umbral)
+
+
+def _ejecutar_reinicio(tarea):
+    """
+    Corre un reinicio con su propia semilla. Si otro reinicio ya alcanzó el
+    umbral (valor compartido), éste se omite sin buscar.
+    Devuelve (estadísticas, camino).
+    """
+    indice, semilla, inicio = tarea
+    c = _contexto
+    estadisticas = {'reinicio': indice, 'semilla': semilla, 'inicio': inicio, 'proceso': os.getpid(),
+                    'omitido': False, 'valor': float('inf'), 'mejor_nodo': None, 'exito': False,
+                    'longitud': 0, 'segundos': 0.0}
+    if c['mejor'].value <= c['umbral']:
+        estadisticas['omitido'] = True
+        return estadisticas, None
+
+    # Las búsquedas estocásticas usan el módulo random: se siembra por reinicio
+    random.seed(semilla)
+    t = time.perf_counter()
+    resultado = c['funcion'](c['grafo'], c['heuristicas'], inicio, c['objetivo'], **c['opciones'])
+    estadisticas['segundos'] = time.perf_counter() - t
+
+    camino, exito = resultado[0], resultado[1]
+    mejor_nodo = min(camino, key=c['heuristicas'].__getitem__)
+    estadisticas.update(valor=c['heuristicas'][mejor_nodo], mejor_nodo=mejor_nodo,
+                        exito=exito, longitud=len(camino))
+    with c['mejor'].get_lock():
+        if estadisticas['valor'] < c['mejor'].value:
+            c['mejor'].value = estadisticas['valor']
+    return estadisticas, camino
+
+
+def _contexto_procesos():
+    # Con fork los trabajadores heredan el grafo y las prácticas ya cargadas
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return multiprocessing.get_context()
+
+
+# =================== Reinicios en paralelo ===================
+def reinicios_paralelos(algoritmo, grafo, heuristicas, objetivo, reinicios=16, procesos=None,
+                        semilla=0, inicios=None, umbral=None, **opciones):
+    """
+    Lanza 'reinicios' ejecuciones independientes de una búsqueda local.
+    - algoritmo: nombre en ALGORITMOS
+    - inicios: nodos de partida; por defecto uno al azar por reinicio
+    - semilla: el reinicio i usa la semilla semilla + i, así que cada reinicio da
+      siempre lo mismo. El resultado completo sólo es reproducible, con cualquier
+      número de procesos, si ningún reinicio alcanza el umbral: si alguno lo
+      alcanza, qué reinicios se omiten (y por tanto el mejor) depende de cuándo
+      termine cada uno
+    - umbral: en cuanto algún reinicio alcanza h <= umbral, los que aún no
+      empezaron se omiten (por defecto la heurística del objetivo). Los que ya
+      están en marcha terminan su búsqueda: las prácticas 0004-0007 no tienen
+      forma de interrumpirse, así que con p procesos pueden ejecutarse hasta
+      p - 1 reinicios de más. Con umbral=float('-inf') nunca se omite ninguno
+    - opciones: parámetros extra de la búsqueda (k, tamano_tabu, ...)
+    Devuelve (mejor, estadisticas): mejor es el diccionario del mejor reinicio
+    con su 'camino', y estadisticas la lista de todos los reinicios.
+    """
+    if reinicios < 1:
+        raise ValueError(f"hace falta al menos un reinicio (reinicios={reinicios})")
+    if umbral is None:
+        umbral = heuristicas[objetivo]
+    nodos = list(grafo)
+    tareas = []
+    for indice in range(reinicios):
+        semilla_reinicio = semilla + indice
+        if inicios is None:
+            inicio = random.Random(semilla_reinicio).choice(nodos)
+        else:
+            inicio = inicios[indice % len(inicios)]
+        tareas.append((indice, semilla_reinicio, inicio))
+
+    if procesos is None:
+        procesos = os.cpu_count() or 1
+    argumentos = (algoritmo, grafo, heuristicas, objetivo, opciones)
+    if procesos <= 1:
+        _iniciar_trabajador(*argumentos, _MejorLocal(float('inf')), umbral)
+        resultados = [_ejecutar_reinicio(tarea) for tarea in tareas]
+    else:
+        contexto = _contexto_procesos()
+        mejor_global = contexto.Value('d', float('inf'))
+        with ProcessPoolExecutor(max_workers=procesos, mp_context=contexto,
+                                 initializer=_iniciar_trabajador,
+                                 initargs=argumentos + (mejor_global, umbral)) as pool:
+            # chunksize 1: cada reinicio mira el valor compartido justo antes de empezar
+            resultados = list(pool.map(_ejecutar_reinicio, tareas, chunksize=1))
+
+    estadisticas = [datos for datos, _ in resultados]
+    ejecutados = [(datos, camino) for datos, camino in resultados if not datos['omitido']]
+    datos, camino = min(ejecutados, key=lambda par: (par[0]['valor'], par[0]['reinicio']))
+    return dict(datos, camino=camino), estadisticas
+
+
+# =================== Ejemplo de uso ===================
+if __name__ == "__main__":
+    # Paisaje con muchos mínimos locales: rejilla donde h es la distancia al
+    # objetivo más un relieve aleatorio; sólo el objetivo tiene h = 0
+    rng = random.Random(7)
+    lado = 40
+    objetivo = (lado - 1, lado - 1)
+    grafo = {(f, c): [(f + df, c + dc) for df, dc in ((1, 0), (0, 1), (-1, 0), (0, -1))
+                      if 0 <= f + df < lado and 0 <= c + dc < lado]
+             for f in range(lado) for c in range(lado)}
+    heuristicas = {n: abs(objetivo[0] - n[0]) + abs(objetivo[1] - n[1]) + rng.randint(0, 6)
+                   for n in grafo}
+    heuristicas[objetivo] = 0
+
+    procesos = min(4, os.cpu_count() or 1)
+    casos = [
+        ('ascension_colinas', {}),
+        ('busqueda_tabu', {'tamano_tabu': 7, 'max_iteraciones': 200}),
+        ('temple_simulado', {'temperatura_inicial': 10, 'enfriamiento': 0.9}),
+        ('busqueda_haz_local', {'k': 3, 'max_iteraciones': 100}),
+    ]
+    for algoritmo, opciones in casos:
+        t = time.perf_counter()
+        mejor, estadisticas = reinicios_paralelos(algoritmo, grafo, heuristicas, objetivo,
+                                                  reinicios=64, procesos=procesos, **opciones)
+        ejecutados = [e for e in estadisticas if not e['omitido']]
+        exitos = sum(e['exito'] for e in ejecutados)
+        print(f"\n{algoritmo} ({procesos} procesos, {time.perf_counter() - t:.2f} s)")
+        print(f"  mejor: reinicio {mejor['reinicio']} desde {mejor['inicio']}, "
+              f"h = {mejor['valor']}, {mejor['longitud']} pasos")
+        print(f"  {len(ejecutados)} reinicios ejecutados, {exitos} llegaron al objetivo, "
+              f"{len(estadisticas) - len(ejecutados)} omitidos")
+        print(f"  h final por reinicio: {[e['valor'] for e in ejecutados][:16]}...")
+
+    # Con la misma semilla el resultado no depende del número de procesos
+    uno, _ = reinicios_paralelos('temple_simulado', grafo, heuristicas, objetivo, reinicios=8,
+                                 procesos=1, umbral=-1, temperatura_inicial=10)
+    varios, _ = reinicios_paralelos('temple_simulado', grafo, heuristicas, objetivo, reinicios=8,
+                                    procesos=procesos, umbral=-1, temperatura_inicial=10)
+    print("\nMismo mejor con 1 y con varios procesos:", uno['camino'] == varios['camino'])
+
+#Un solo recorrido de ascensión de colinas casi siempre se queda en un mínimo local;
+#con reinicios desde nodos al azar alguno cae en la cuenca del objetivo y los
+#reinicios que aún no empezaron se omiten.
@@ -0,0 +1,239 @@
+"""
+Prácticas de Inteligencia Artificial
+Algoritmo Genético vectorizado con NumPy
+(población como matriz de bits empaquetados, operadores como operaciones de arreglos)
+"""
+import contextlib
+import io
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ not in sys.path:
+    sys.path.insert(0, RAIZ)
+from comunes import cargar_script
+
+# Número de bits a 1 de cada byte, para contar unos sin desempaquetar
+UNOS_POR_BYTE = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1)
+
+
+# ============ Funciones de fitness vectorizadas ============
+# Reciben una matriz (individuos, genes) de 0 y 1 (uint8) y devuelven un arreglo con
+# el fitness de cada fila. Si tienen el atributo empaquetada = True reciben los bits
+# empaquetados (individuos, bytes) y se ahorran el desempaquetado.
+
+def unos(empaquetada):
+    # El mismo fitness que evaluar() en 0008: cuántos 1 tiene el cromosoma
+    return UNOS_POR_BYTE[empaquetada].sum(axis=1)
+
+
+unos.empaquetada = True
+
+
+def mochila(pesos, valores, capacidad, penalizacion=None):
+    # Valor de los objetos elegidos; si se pasa de la capacidad se resta el exceso penalizado
+    pesos = np.asarray(pesos, dtype=np.int64)
+    valores = np.asarray(valores, dtype=np.int64)
+    if penalizacion is None:
+        penalizacion = int(valores.max())
+
+    def evaluar(bits):
+        exceso = np.maximum(bits @ pesos - capacidad, 0)
+        return bits @ valores - penalizacion * exceso
+
+    return evaluar
+
+
+# ============ Operadores sobre la población empaquetada ============
+
+def crear_poblacion(individuos, genes, rng):
+    return np.packbits(rng.integers(0, 2, (individuos, genes), dtype=np.uint8), axis=1)
+
+
+def seleccion_torneo(fitness, cantidad, tamano, rng):
+    # Índices de los ganadores de 'cantidad' torneos de 'tamano' participantes
+    participantes = rng.integers(0, len(fitness), (cantidad, tamano))
+    ganadores = np.argmax(fitness[participantes], axis=1)
+    return participantes[np.arange(cantidad), ganadores]
+
+
+def cruce_un_punto(padres1, padres2, puntos):
+    """
+    Cruce de un punto hecho byte a byte: los bytes antes del punto vienen del
+    primer padre, los de después del segundo, y el byte donde cae el punto se
+    mezcla con una máscara de bits. Un punto igual al número de genes deja
+    copias exactas de los padres.
+    """
+    bytes_ = padres1.shape[1]
+    byte_corte = puntos // 8
+    parcial = ((0xFF << (8 - puntos % 8)) & 0xFF).astype(np.uint8)
+    columnas = np.arange(bytes_)
+    mascara = np.where(columnas < byte_corte[:, None], np.uint8(0xFF),
+                       np.where(columnas == byte_corte[:, None], parcial[:, None], np.uint8(0)))
+    mascara = mascara.astype(np.uint8)
+    hijos1 = (padres1 & mascara) | (padres2 & ~mascara)
+    hijos2 = (padres2 & mascara) | (padres1 & ~mascara)
+    return hijos1, hijos2
+
+
+def mutacion(poblacion, genes, prob_mutacion, rng):
+    """
+    Invierte cada gen con probabilidad prob_mutacion. En lugar de sortear un
+    número por gen se sortea cuántos genes mutan y cuáles (mucha menos memoria
+    con poblaciones grandes). Devuelve la máscara de filas que cambiaron.
+    """
+    individuos = poblacion.shape[0]
+    cuantos = rng.binomial(individuos * genes, prob_mutacion)
+    posiciones = np.unique(rng.integers(0, individuos * genes, cuantos))
+    filas, columnas = np.divmod(posiciones, genes)
+    # Varios genes pueden caer en el mismo byte: con ^= sólo se aplicaría la última
+    # máscara de cada celda; ufunc.at acumula todas
+    np.bitwise_xor.at(poblacion, (filas, columnas // 8), (0x80 >> (columnas % 8)).astype(np.uint8))
+    cambiadas = np.zeros(individuos, dtype=bool)
+    cambiadas[filas] = True
+    return cambiadas
+
+
+# ============ Evaluación con caché ============
+
+def evaluar_poblacion(evaluar, poblacion, genes, fitness, pendientes, bloque, estadisticas):
+    """
+    Calcula el fitness sólo de las filas pendientes (las que cambiaron); las
+    demás lo heredaron de su padre. Las filas repetidas se evalúan una vez.
+    Se desempaqueta por bloques para no crear una matriz de bytes gigante.
+    """
+    indices = np.flatnonzero(pendientes)
+    estadisticas['ahorradas'] += len(fitness) - len(indices)
+    if len(indices) == 0:
+        return
+    filas = np.ascontiguousarray(poblacion[indices])
+    claves = filas.view(np.dtype((np.void, filas.shape[1]))).ravel()
+    _, unicas, inversa = np.unique(claves, return_index=True, return_inverse=True)
+    estadisticas['ahorradas'] += len(indices) - len(unicas)
+    estadisticas['evaluaciones'] += len(unicas)
+
+    valores = np.empty(len(unicas), dtype=np.float64)
+    for inicio in range(0, len(unicas), bloque):
+        trozo = filas[unicas[inicio:inicio + bloque]]
+        if not getattr(evaluar, 'empaquetada', False):
+            trozo = np.unpackbits(trozo, axis=1, count=genes)
+        valores[inicio:inicio + bloque] = evaluar(trozo)
+    fitness[indices] = valores[inversa.ravel()]
+
+
+# ============ Algoritmo Genético Vectorizado ============
+
+def nueva_generacion(evaluar, poblacion, fitness, genes, rng, prob_cruce, prob_mutacion,
+                     tamano_torneo, elites, bloque, estadisticas):
+    # Una generación completa: élite, torneo, cruce, mutación y evaluación de lo que cambió
+    individuos = len(fitness)
+    orden_elite = np.argpartition(-fitness, elites - 1)[:elites] if elites else np.empty(0, int)
+    hijos_necesarios = individuos - elites
+    parejas = (hijos_necesarios + 1) // 2
+
+    seleccionados = seleccion_torneo(fitness, 2 * parejas, tamano_torneo, rng)
+    padres1, padres2 = seleccionados[:parejas], seleccionados[parejas:]
+    cruzan = rng.random(parejas) < prob_cruce
+    puntos = np.where(cruzan, rng.integers(1, genes, parejas), genes)
+    hijos1, hijos2 = cruce_un_punto(poblacion[padres1], poblacion[padres2], puntos)
+
+    nueva = np.concatenate([poblacion[orden_elite], hijos1, hijos2])[:individuos]
+    nuevo_fitness = np.concatenate([fitness[orden_elite], fitness[padres1],
+                                    fitness[padres2]])[:individuos]
+    pendientes = np.concatenate([np.zeros(elites, dtype=bool), cruzan, cruzan])[:individuos]
+
+    cambiadas = mutacion(nueva[elites:], genes, prob_mutacion, rng)
+    pendientes[elites:] |= cambiadas
+    evaluar_poblacion(evaluar, nueva, genes, nuevo_fitness, pendientes, bloque, estadisticas)
+    return nueva, nuevo_fitness
+
+
+def algoritmo_genetico_vectorizado(evaluar, genes, individuos=1000, generaciones=100,
+                                   prob_cruce=0.9, prob_mutacion=None, tamano_torneo=2,
+                                   elites=1, semilla=None, bloque=4096, objetivo=None,
+                                   al_terminar_generacion=None):
+    """
+    - evaluar: fitness vectorizado (ver unos y mochila); se maximiza
+    - prob_mutacion: por gen, por defecto 1 / genes
+    - elites: mejores individuos que pasan intactos a la siguiente generación
+    - objetivo: si se alcanza este fitness se detiene antes
+    - al_terminar_generacion(generacion, mejor_fitness, fitness_promedio): para mostrar avance
+    Devuelve (mejor_cromosoma, mejor_fitness, estadisticas).
+    """
+    rng = np.random.default_rng(semilla)
+    if prob_mutacion is None:
+        prob_mutacion = 1 / genes
+    estadisticas = {'evaluaciones': 0, 'ahorradas': 0, 'generaciones': 0}
+
+    poblacion = crear_poblacion(individuos, genes, rng)
+    fitness = np.empty(individuos, dtype=np.float64)
+    evaluar_poblacion(evaluar, poblacion, genes, fitness, np.ones(individuos, dtype=bool),
+                      bloque, estadisticas)
+
+    for generacion in range(generaciones):
+        mejor = int(np.argmax(fitness))
+        if al_terminar_generacion is not None:
+            al_terminar_generacion(generacion + 1, fitness[mejor], fitness.mean())
+        if objetivo is not None and fitness[mejor] >= objetivo:
+            break
+        poblacion, fitness = nueva_generacion(evaluar, poblacion, fitness, genes, rng, prob_cruce,
+                                              prob_mutacion, tamano_torneo, elites, bloque,
+                                              estadisticas)
+        estadisticas['generaciones'] = generacion + 1
+
+    mejor = int(np.argmax(fitness))
+    cromosoma = np.unpackbits(poblacion[mejor], count=genes)
+    return cromosoma, fitness[mejor], estadisticas
+
+
+# ============ Ejecutar ============
+if __name__ == "__main__":
+    # Mismo problema que 0008 (maximizar el número de unos) con 8 genes
+    cromosoma, fitness, _ = algoritmo_genetico_vectorizado(unos, 8, individuos=6, generaciones=20,
+                                                           semilla=0)
+    print("===== Resultado Final =====")
+    print(f"Mejor cromosoma: {cromosoma.tolist()}")
+    print(f"Fitness: {fitness:.0f}")
+
+    # Comparación con la versión de listas de 0008 con 2000 individuos x 200 genes
+    original = cargar_script("Busqueda Informada/0008_Algoritmos_Geneticos.py")
+    original.TAM_CROMOSOMA, original.POBLACION_INICIAL, original.GENERACIONES = 200, 2000, 10
+    random.seed(0)
+    t = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        original.algoritmo_genetico()
+    print(f"\nListas (0008), 2000 x 200, 10 generaciones: {time.perf_counter() - t:.2f} s")
+    t = time.perf_counter()
+    algoritmo_genetico_vectorizado(unos, 200, individuos=2000, generaciones=10, semilla=0)
+    print(f"Vectorizado, 2000 x 200, 10 generaciones: {time.perf_counter() - t:.3f} s")
+
+    # Escala grande: 100 000 individuos con 1000 genes (12.5 MB por población empaquetada)
+    def mostrar(generacion, mejor, promedio):
+        if generacion % 5 == 0:
+            print(f"  generación {generacion}: mejor {mejor:.0f}, promedio {promedio:.1f}")
+
+    t = time.perf_counter()
+    _, fitness, estadisticas = algoritmo_genetico_vectorizado(
+        unos, 1000, individuos=100_000, generaciones=20, tamano_torneo=3, semilla=1,
+        al_terminar_generacion=mostrar)
+    print(f"100000 x 1000, {estadisticas['generaciones']} generaciones: "
+          f"{time.perf_counter() - t:.1f} s, mejor {fitness:.0f}, "
+          f"{estadisticas['evaluaciones']} evaluaciones, {estadisticas['ahorradas']} ahorradas")
+
+    # Mochila 0/1 con 500 objetos: el fitness es un producto matriz-vector por bloque
+    generador = np.random.default_rng(2)
+    pesos = generador.integers(1, 100, 500)
+    valores = generador.integers(1, 100, 500)
+    capacidad = int(pesos.sum() // 3)
+    cromosoma, fitness, _ = algoritmo_genetico_vectorizado(
+        mochila(pesos, valores, capacidad), 500, individuos=20_000, generaciones=60,
+        tamano_torneo=3, elites=10, semilla=3)
+    print(f"\nMochila: valor {fitness:.0f}, peso {int(cromosoma @ pesos)} de {capacidad}")
+
+#===== Resultado Final =====
+#Mejor cromosoma: [1, 1, 1, 1, 1, 1, 1, 1]
+#Fitness: 8
@@ -0,0 +1,282 @@
+"""
+Prácticas de Inteligencia Artificial
+Algoritmo Genético con modelo de islas
+(varias poblaciones en procesos separados que intercambian sus mejores individuos)
+"""
+import multiprocessing
+import os
+import queue
+import sys
+import threading
+import time
+
+import numpy as np
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ not in sys.path:
+    sys.path.insert(0, RAIZ)
+from comunes import cargar_script
+
+
+# Operadores, evaluación con caché y generación completa de la versión vectorizada
+ag = cargar_script("Busqueda Informada/0015_Algoritmo_Genetico_Vectorizado.py")
+
+
+def _contexto_procesos():
+    # Con fork las islas heredan la función de fitness aunque no se pueda serializar.
+    # Con spawn habría que serializarla (y trampa o costosa son funciones locales):
+    # None = las islas corren como hilos del propio proceso
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return None
+
+
+# =================== Fitness de ejemplo ===================
+
+def trampa(tamano_bloque=4):
+    """
+    Función trampa (engañosa): el cromosoma se parte en bloques y cada bloque
+    vale tamano_bloque si está lleno de unos y, si no, tamano_bloque - 1 - unos.
+    La pendiente lleva a los bloques de ceros, así que una sola población
+    suele converger a un óptimo local; varias islas conservan más diversidad.
+    """
+    def evaluar(bits):
+        u = bits.reshape(len(bits), -1, tamano_bloque).sum(axis=2)
+        return np.where(u == tamano_bloque, tamano_bloque, tamano_bloque - 1 - u).sum(axis=1)
+
+    return evaluar
+
+
+def costosa(evaluar, repeticiones):
+    # Simula un fitness caro repitiendo el cálculo (el cuello de botella de una sola población)
+    def evaluar_costosa(bits):
+        for _ in range(repeticiones - 1):
+            evaluar(bits)
+        return evaluar(bits)
+
+    evaluar_costosa.empaquetada = getattr(evaluar, 'empaquetada', False)
+    return evaluar_costosa
+
+
+# =================== Una isla ===================
+
+def _migrantes(poblacion, fitness, cantidad):
+    # Los 'cantidad' mejores individuos (empaquetados) con su fitness
+    mejores = np.argpartition(-fitness, cantidad - 1)[:cantidad]
+    return poblacion[mejores].copy(), fitness[mejores].copy()
+
+
+def _recibir(poblacion, fitness, llegados, elites):
+    # Los inmigrantes reemplazan a los peores; la élite nunca se toca
+    individuos_migrantes, fitness_migrantes = llegados
+    cantidad = min(len(fitness_migrantes), len(fitness) - elites)
+    if cantidad <= 0:
+        return
+    peores = np.argpartition(fitness, cantidad - 1)[:cantidad]
+    poblacion[peores] = individuos_migrantes[:cantidad]
+    fitness[peores] = fitness_migrantes[:cantidad]
+
+
+def evolucionar_isla(indice, evaluar, genes, individuos, generaciones, intervalo, migrantes,
+                     semilla, entrada=None, salida=None, detener=None, objetivo=None,
+                     prob_cruce=0.9, prob_mutacion=None, tamano_torneo=2, elites=1, bloque=4096):
+    """
+    Evoluciona una población y cada 'intervalo' generaciones envía sus mejores
+    'migrantes' por 'salida' y mete en la población los que hayan llegado por
+    'entrada'. La migración es asíncrona: si la isla vecina va atrasada no se
+    espera, sus migrantes se recogen en la siguiente migración.
+    - detener: evento compartido; la isla que alcanza el objetivo lo activa y
+      las demás terminan en su siguiente generación
+    Devuelve un diccionario con el mejor individuo (empaquetado) y estadísticas.
+    """
+    rng = np.random.default_rng(semilla)
+    if prob_mutacion is None:
+        prob_mutacion = 1 / genes
+    estadisticas = {'evaluaciones': 0, 'ahorradas': 0, 'generaciones': 0,
+                    'enviados': 0, 'recibidos': 0}
+
+    poblacion = ag.crear_poblacion(individuos, genes, rng)
+    fitness = np.empty(individuos, dtype=np.float64)
+    ag.evaluar_poblacion(evaluar, poblacion, genes, fitness, np.ones(individuos, dtype=bool),
+                         bloque, estadisticas)
+    historial = []
+
+    for generacion in range(1, generaciones + 1):
+        historial.append(float(fitness.max()))
+        if objetivo is not None and historial[-1] >= objetivo:
+            if detener is not None:
+                detener.set()
+            break
+        if detener is not None and detener.is_set():
+            break
+        poblacion, fitness = ag.nueva_generacion(evaluar, poblacion, fitness, genes, rng,
+                                                 prob_cruce, prob_mutacion, tamano_torneo,
+                                                 elites, bloque, estadisticas)
+        estadisticas['generaciones'] = generacion
+
+        if generacion % intervalo == 0:
+            if salida is not None:
+                salida.put(_migrantes(poblacion, fitness, migrantes))
+                estadisticas['enviados'] += migrantes
+            while entrada is not None:
+                try:
+                    llegados = entrada.get_nowait()
+                except queue.Empty:
+                    break
+                _recibir(poblacion, fitness, llegados, elites)
+                estadisticas['recibidos'] += len(llegados[1])
+
+    mejor = int(np.argmax(fitness))
+    return dict(estadisticas, isla=indice, cromosoma=poblacion[mejor].copy(),
+                fitness=float(fitness[mejor]), historial=historial)
+
+
+def _proceso_isla(resultados, indice, argumentos, opciones):
+    # Punto de entrada de cada proceso: evoluciona y deja su resultado en la cola
+    resultados.put(evolucionar_isla(indice, *argumentos, **opciones))
+
+
+def _recoger(recogida, procesos, detener, espera=0.5):
+    """
+    Espera un resultado por isla. Una isla que muere (excepción, señal, falta
+    de memoria) no llega a escribir el suyo: en lugar de esperar para siempre,
+    cada 'espera' segundos se comprueba que ninguna haya terminado con error;
+    si alguna lo hizo, se detienen las demás y se lanza RuntimeError.
+    """
+    resultados = []
+    while len(resultados) < len(procesos):
+        try:
+            resultados.append(recogida.get(timeout=espera))
+        except queue.Empty:
+            caidas = [(i, proceso.exitcode) for i, proceso in enumerate(procesos)
+                      if proceso.exitcode not in (None, 0)]
+            if caidas:
+                detener.set()
+                for proceso in procesos:
+                    proceso.terminate()
+                    proceso.join()
+                raise RuntimeError("islas terminadas sin resultado (isla, código de salida): "
+                                   f"{caidas}") from None
+    return resultados
+
+
+def _islas_en_hilos(argumentos_por_isla, opciones, detener):
+    """
+    Alternativa sin fork: cada isla en un hilo, con queue.Queue como buzones
+    (la migración sigue siendo asíncrona). Sólo avanza una isla a la vez salvo
+    cuando NumPy suelta el GIL, pero no hay que serializar la función de fitness.
+    """
+    resultados, errores = [None] * len(argumentos_por_isla), []
+
+    def correr(indice, argumentos):
+        try:
+            resultados[indice] = evolucionar_isla(indice, *argumentos, **opciones)
+        except Exception as error:
+            errores.append((indice, error))
+            detener.set()
+
+    hilos = [threading.Thread(target=correr, args=(i, argumentos))
+             for i, argumentos in enumerate(argumentos_por_isla)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    if errores:
+        indice, error = errores[0]
+        raise RuntimeError(f"la isla {indice} falló") from error
+    return resultados
+
+
+# =================== Modelo de islas ===================
+
+def modelo_de_islas(evaluar, genes, islas=4, individuos=250, generaciones=100, intervalo=10,
+                    migrantes=2, semilla=0, objetivo=None, **opciones):
+    """
+    - evaluar: fitness vectorizado intercambiable (como en 0015: recibe la
+      matriz de bits, o los bytes si tiene empaquetada = True)
+    - islas: poblaciones, una por proceso (por hilo donde no existe fork)
+    - individuos: tamaño de cada isla
+    - intervalo: cada cuántas generaciones se migra
+    - migrantes: cuántos de los mejores viajan a la isla siguiente (anillo)
+    - semilla: la isla i usa semilla + i
+    - opciones: prob_cruce, prob_mutacion, tamano_torneo, elites, bloque
+    Devuelve (mejor_cromosoma, mejor_fitness, estadisticas por isla).
+    """
+    if islas <= 1:
+        resultados = [evolucionar_isla(0, evaluar, genes, individuos, generaciones, intervalo,
+                                       migrantes, semilla, objetivo=objetivo, **opciones)]
+    elif _contexto_procesos() is None:
+        buzones = [queue.Queue() for _ in range(islas)]
+        detener = threading.Event()
+        argumentos_por_isla = [(evaluar, genes, individuos, generaciones, intervalo, migrantes,
+                                semilla + i, buzones[i], buzones[(i + 1) % islas], detener,
+                                objetivo) for i in range(islas)]
+        resultados = _islas_en_hilos(argumentos_por_isla, opciones, detener)
+    else:
+        contexto = _contexto_procesos()
+        # Anillo: la isla i escribe en el buzón de la isla i + 1. Las colas usan
+        # tuberías por debajo y un hilo alimentador, así que enviar nunca bloquea
+        buzones = [contexto.Queue() for _ in range(islas)]
+        recogida = contexto.Queue()
+        detener = contexto.Event()
+        procesos = []
+        for i in range(islas):
+            argumentos = (evaluar, genes, individuos, generaciones, intervalo, migrantes,
+                          semilla + i, buzones[i], buzones[(i + 1) % islas], detener, objetivo)
+            proceso = contexto.Process(target=_proceso_isla,
+                                       args=(recogida, i, argumentos, opciones))
+            proceso.start()
+            procesos.append(proceso)
+        # Se recoge antes de join: un proceso con datos pendientes en una cola no termina
+        resultados = sorted(_recoger(recogida, procesos, detener), key=lambda r: r['isla'])
+        for proceso in procesos:
+            proceso.join()
+        for buzon in buzones:
+            buzon.cancel_join_thread()
+
+    mejor = max(resultados, key=lambda r: r['fitness'])
+    cromosoma = np.unpackbits(mejor['cromosoma'], count=genes)
+    estadisticas = [{clave: valor for clave, valor in r.items() if clave != 'cromosoma'}
+                    for r in resultados]
+    return cromosoma, mejor['fitness'], estadisticas
+
+
+# =================== Ejemplo de uso ===================
+if __name__ == "__main__":
+    genes = 200
+    evaluar = costosa(trampa(4), 5)
+    optimo = genes  # todos los bloques llenos de unos
+    islas = 4
+    total = 1000
+    generaciones = 200
+    semillas = (1, 2, 3)
+    print(f"Función trampa, {genes} genes (óptimo {optimo}), {total} individuos en total, "
+          f"torneo de 4")
+
+    # Sin migración (intervalo mayor que las generaciones) cada isla evoluciona aislada
+    casos = [("1 población", 1, 25), (f"{islas} islas", islas, 25),
+             (f"{islas} islas sin migración", islas, generaciones + 1)]
+    for etiqueta, numero, intervalo in casos:
+        t = time.perf_counter()
+        mejores, inmigrantes = [], []
+        for semilla in semillas:
+            _, fitness, estadisticas = modelo_de_islas(
+                evaluar, genes, islas=numero, individuos=total // numero,
+                generaciones=generaciones, intervalo=intervalo, migrantes=5, semilla=semilla,
+                objetivo=optimo, tamano_torneo=4)
+            mejores.append(fitness)
+            inmigrantes.append(sum(e['recibidos'] for e in estadisticas) // numero)
+        print(f"{etiqueta}: fitness {mejores} con semillas {list(semillas)} "
+              f"({inmigrantes} inmigrantes por isla), {time.perf_counter() - t:.1f} s")
+
+#Función trampa, 200 genes (óptimo 200), 1000 individuos en total, torneo de 4
+#1 población: fitness [190.0, 190.0, 186.0] con semillas [1, 2, 3] ([0, 0, 0] inmigrantes por isla)
+#4 islas: fitness [195.0, 197.0, 197.0] con semillas [1, 2, 3] ([37, 37, 37] inmigrantes por isla)
+#4 islas sin migración: fitness [183.0, 185.0, 185.0] con semillas [1, 2, 3] ([0, 0, 0] inmigrantes por isla)
+#Con torneo de 4 una sola población pierde pronto la diversidad y deja bloques en el
+#óptimo engañoso (todo ceros). Las islas aisladas son poblaciones pequeñas que se quedan
+#aún antes en óptimos locales, pero cada una resuelve bloques distintos y la migración
+#los combina. Con un fitness caro cada isla usa además su propio núcleo.
+#La migración es asíncrona, así que con islas los valores cambian un poco de una
+#ejecución a otra (p. ej. [192.0, 197.0, 194.0]), pero en todas las pruebas han
+#quedado por encima de una sola población.
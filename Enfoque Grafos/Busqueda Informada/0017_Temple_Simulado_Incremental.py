@@ -0,0 +1,314 @@
+"""
+Prácticas de Inteligencia Artificial
+Temple Simulado con evaluación incremental y esquemas de enfriamiento intercambiables
+(geométrico, logarítmico y adaptativo de Lam, con recalentamiento)
+"""
+import math
+import random
+import time
+
+import numpy as np
+
+
+# =================== Interfaz del problema ===================
+class ProblemaTemple:
+    """
+    El motor sólo necesita estas operaciones; el costo nunca se recalcula
+    completo durante el temple:
+      costo()              costo del estado actual (se llama una vez al inicio)
+      proponer(rng)        un movimiento al azar (rng es un random.Random)
+      delta(movimiento)    cambio del costo si se aplicara el movimiento
+      aplicar(movimiento)  cambia el estado
+      instantanea()        copia del estado para guardar la mejor solución
+    """
+
+    def costo(self):
+        raise NotImplementedError
+
+    def proponer(self, rng):
+        raise NotImplementedError
+
+    def delta(self, movimiento):
+        raise NotImplementedError
+
+    def aplicar(self, movimiento):
+        raise NotImplementedError
+
+    def instantanea(self):
+        raise NotImplementedError
+
+
+# =================== Esquemas de enfriamiento ===================
+# Se consultan al terminar cada bloque de movimientos:
+#   siguiente(temperatura, tasa_aceptacion, progreso) -> nueva temperatura
+# con progreso en [0, 1]. Todos trabajan sobre la temperatura actual, así que
+# siguen funcionando después de un recalentamiento.
+
+class EnfriamientoGeometrico:
+    # T <- alfa * T (el de temple_simulado en 0006)
+    def __init__(self, alfa=0.95):
+        self.alfa = alfa
+
+    def siguiente(self, temperatura, tasa, progreso):
+        return temperatura * self.alfa
+
+
+class EnfriamientoLogaritmico:
+    """
+    T_k = c / log(k + e): el esquema con garantía teórica de convergencia,
+    demasiado lento en la práctica. Se aplica como razón entre pasos
+    consecutivos, log(k + e) / log(k + 1 + e).
+    """
+
+    def __init__(self):
+        self.bloques = 0
+
+    def siguiente(self, temperatura, tasa, progreso):
+        k = self.bloques
+        self.bloques += 1
+        return temperatura * math.log(k + math.e) / math.log(k + 1 + math.e)
+
+
+class EnfriamientoLam:
+    """
+    Esquema adaptativo de Lam: la temperatura se ajusta para que la tasa de
+    aceptación siga una curva objetivo según el progreso: empieza cerca de 1,
+    baja a 0.44 hacia el 15 % del temple, se mantiene ahí hasta el 65 % y
+    luego cae hacia 0.
+    """
+
+    def __init__(self, factor=0.95):
+        self.factor = factor
+
+    @staticmethod
+    def tasa_objetivo(progreso):
+        if progreso < 0.15:
+            return 0.44 + 0.56 * 560 ** (-progreso / 0.15)
+        if progreso < 0.65:
+            return 0.44
+        return 0.44 * 440 ** (-(progreso - 0.65) / 0.35)
+
+    def siguiente(self, temperatura, tasa, progreso):
+        if tasa > self.tasa_objetivo(progreso):
+            return temperatura * self.factor
+        return temperatura / self.factor
+
+
+ESQUEMAS = {
+    'geometrico': EnfriamientoGeometrico,
+    'logaritmico': EnfriamientoLogaritmico,
+    'lam': EnfriamientoLam,
+}
+
+
+# =================== Motor de temple ===================
+
+def estimar_temperatura(problema, rng, aceptacion=0.8, muestras=200):
+    """
+    Temperatura inicial tal que un empeoramiento promedio se acepte con
+    probabilidad 'aceptacion': T0 = -promedio(delta > 0) / ln(aceptacion).
+    """
+    empeoramientos = [d for d in (problema.delta(problema.proponer(rng)) for _ in range(muestras))
+                      if d > 0]
+    if not empeoramientos:
+        return 1.0
+    return -(sum(empeoramientos) / len(empeoramientos)) / math.log(aceptacion)
+
+
+def temple_simulado_incremental(problema, esquema='geometrico', movimientos=100000, bloque=1000,
+                                temperatura_inicial=None, paciencia=None,
+                                fraccion_recalentamiento=0.5, temperatura_minima=1e-9,
+                                semilla=None, al_terminar_bloque=None):
+    """
+    - problema: objeto con la interfaz de ProblemaTemple (se modifica en el lugar)
+    - esquema: nombre en ESQUEMAS o un objeto con siguiente(temperatura, tasa, progreso)
+    - bloque: movimientos con la misma temperatura; los números de la prueba de
+      Metropolis de todo el bloque se sortean de una vez con NumPy
+    - temperatura_inicial: por defecto se estima con estimar_temperatura
+    - paciencia: si la mejor solución no mejora en 'paciencia' bloques se
+      recalienta a fraccion_recalentamiento * temperatura_inicial
+    - al_terminar_bloque(bloque, temperatura, tasa_aceptacion, costo, mejor_costo)
+    Devuelve (mejor_estado, mejor_costo, telemetria).
+    """
+    rng = random.Random(semilla)
+    generador = np.random.default_rng(semilla)
+    if isinstance(esquema, str):
+        esquema = ESQUEMAS[esquema]()
+    if temperatura_inicial is None:
+        temperatura_inicial = estimar_temperatura(problema, rng)
+
+    temperatura = temperatura_inicial
+    costo = problema.costo()
+    mejor_costo = costo
+    mejor_estado = problema.instantanea()
+    telemetria = {'temperaturas': [], 'aceptacion': [], 'costos': [], 'mejores': [],
+                  'recalentamientos': [], 'aceptados': 0, 'propuestos': 0}
+    bloques = max(1, movimientos // bloque)
+    sin_mejora = 0
+
+    for numero in range(bloques):
+        # Metropolis: aceptar si U < exp(-delta / T), es decir si delta < -T ln U.
+        # Se calculan los umbrales del bloque entero y no hay exp por movimiento
+        umbrales = (-temperatura * np.log(generador.random(bloque))).tolist()
+        aceptados = 0
+        mejoro = False
+        for umbral in umbrales:
+            movimiento = problema.proponer(rng)
+            cambio = problema.delta(movimiento)
+            if cambio <= 0 or cambio < umbral:
+                problema.aplicar(movimiento)
+                costo += cambio
+                aceptados += 1
+                if costo < mejor_costo:
+                    mejor_costo = costo
+                    mejor_estado = problema.instantanea()
+                    mejoro = True
+
+        tasa = aceptados / bloque
+        telemetria['aceptados'] += aceptados
+        telemetria['propuestos'] += bloque
+        telemetria['temperaturas'].append(temperatura)
+        telemetria['aceptacion'].append(tasa)
+        telemetria['costos'].append(costo)
+        telemetria['mejores'].append(mejor_costo)
+        if al_terminar_bloque is not None:
+            al_terminar_bloque(numero + 1, temperatura, tasa, costo, mejor_costo)
+
+        sin_mejora = 0 if mejoro else sin_mejora + 1
+        if paciencia is not None and sin_mejora >= paciencia:
+            temperatura = max(temperatura, fraccion_recalentamiento * temperatura_inicial)
+            telemetria['recalentamientos'].append(numero + 1)
+            sin_mejora = 0
+        else:
+            temperatura = esquema.siguiente(temperatura, tasa, (numero + 1) / bloques)
+        temperatura = max(temperatura, temperatura_minima)
+
+    return mejor_estado, mejor_costo, telemetria
+
+
+# =================== Problemas de ejemplo ===================
+class RecorridoGrafo(ProblemaTemple):
+    # El problema de temple_simulado (0006): moverse por el grafo minimizando h
+    def __init__(self, grafo, heuristicas, inicio):
+        self.grafo = grafo
+        self.heuristicas = heuristicas
+        self.actual = inicio
+
+    def costo(self):
+        return self.heuristicas[self.actual]
+
+    def proponer(self, rng):
+        vecinos = self.grafo.get(self.actual)
+        return rng.choice(vecinos) if vecinos else self.actual
+
+    def delta(self, vecino):
+        return self.heuristicas[vecino] - self.heuristicas[self.actual]
+
+    def aplicar(self, vecino):
+        self.actual = vecino
+
+    def instantanea(self):
+        return self.actual
+
+
+class ViajanteDosOpt(ProblemaTemple):
+    """
+    Viajante de comercio con movimientos 2-opt: invertir el tramo entre dos
+    posiciones cambia sólo dos aristas, así que delta es O(1) (cuatro
+    distancias) aunque el recorrido tenga miles de ciudades.
+    """
+
+    def __init__(self, coordenadas, recorrido=None):
+        self.coordenadas = coordenadas
+        self.recorrido = list(recorrido) if recorrido is not None else list(range(len(coordenadas)))
+
+    def distancia(self, a, b):
+        (xa, ya), (xb, yb) = self.coordenadas[a], self.coordenadas[b]
+        return math.hypot(xa - xb, ya - yb)
+
+    def costo(self):
+        r = self.recorrido
+        return sum(self.distancia(r[i - 1], r[i]) for i in range(len(r)))
+
+    def proponer(self, rng):
+        n = len(self.recorrido)
+        i, j = rng.randrange(n), rng.randrange(n)
+        if i > j:
+            i, j = j, i
+        if j - i < 2 or (i == 0 and j == n - 1):
+            return None  # no cambia el recorrido
+        return i, j
+
+    def delta(self, movimiento):
+        if movimiento is None:
+            return 0.0
+        i, j = movimiento
+        r = self.recorrido
+        a, b, c, d = r[i], r[i + 1], r[j], r[(j + 1) % len(r)]
+        return (self.distancia(a, c) + self.distancia(b, d)
+                - self.distancia(a, b) - self.distancia(c, d))
+
+    def aplicar(self, movimiento):
+        if movimiento is not None:
+            i, j = movimiento
+            self.recorrido[i + 1:j + 1] = self.recorrido[j:i:-1]
+
+    def instantanea(self):
+        return self.recorrido[:]
+
+
+# =================== Ejemplo de uso ===================
+if __name__ == "__main__":
+    grafo = {
+        'A': ['B', 'C'],
+        'B': ['D', 'E'],
+        'C': ['F'],
+        'D': [],
+        'E': ['F'],
+        'F': []
+    }
+    heuristicas = {'A': 6, 'B': 4, 'C': 5, 'D': 3, 'E': 2, 'F': 1}
+    mejor, costo, _ = temple_simulado_incremental(RecorridoGrafo(grafo, heuristicas, 'A'),
+                                                  movimientos=200, bloque=10, semilla=0)
+    print(f"Grafo de 0006: mejor nodo {mejor} (h={costo})")
+
+    # Viajante con 1000 ciudades al azar en el cuadrado unitario
+    generador = random.Random(1)
+    ciudades = [(generador.random(), generador.random()) for _ in range(1000)]
+    print(f"\nViajante, {len(ciudades)} ciudades, costo inicial "
+          f"{ViajanteDosOpt(ciudades).costo():.2f}")
+    print(f"{'esquema':<28}{'costo':>9}{'segundos':>10}{'aceptación':>12}{'recalent.':>11}")
+    casos = [
+        ("geométrico", 'geometrico', {}),
+        ("logarítmico", 'logaritmico', {}),
+        ("Lam (adaptativo)", 'lam', {}),
+        ("geométrico + recalentar", 'geometrico', {'paciencia': 10, 'fraccion_recalentamiento': 0.05}),
+    ]
+    for etiqueta, esquema, opciones in casos:
+        if esquema == 'geometrico':
+            # 1000 bloques: alfa lleva T0 a ~1e-4 T0 al final
+            esquema = EnfriamientoGeometrico(alfa=0.991)
+        problema = ViajanteDosOpt(ciudades)
+        t = time.perf_counter()
+        recorrido, costo, telemetria = temple_simulado_incremental(
+            problema, esquema, movimientos=1000000, bloque=1000, semilla=2, **opciones)
+        segundos = time.perf_counter() - t
+        assert abs(ViajanteDosOpt(ciudades, recorrido).costo() - costo) < 1e-6
+        tasa = telemetria['aceptados'] / telemetria['propuestos']
+        print(f"{etiqueta:<28}{costo:>9.2f}{segundos:>10.2f}{tasa:>12.1%}"
+              f"{len(telemetria['recalentamientos']):>11}")
+
+    # Telemetría del esquema de Lam: la tasa de aceptación sigue la curva objetivo
+    problema = ViajanteDosOpt(ciudades)
+    _, _, telemetria = temple_simulado_incremental(problema, 'lam', movimientos=1000000,
+                                                   bloque=1000, semilla=2)
+    print("\nLam: progreso, tasa medida, tasa objetivo, temperatura")
+    for indice in range(0, 1000, 125):
+        print(f"  {indice / 1000:>5.0%}{telemetria['aceptacion'][indice]:>8.2f}"
+              f"{EnfriamientoLam.tasa_objetivo(indice / 1000):>8.2f}"
+              f"{telemetria['temperaturas'][indice]:>10.5f}")
+
+#Viajante, 1000 ciudades, costo inicial 523.72
+#geométrico 33.44, logarítmico 293.41, Lam 46.81, geométrico + recalentar 33.98 (8 recalentamientos)
+#El logarítmico enfría demasiado lento para un millón de movimientos; el de Lam
+#mantiene la tasa de aceptación en la curva objetivo sin ajustar alfa a mano.
@@ -4,18 +4,29 @@ Ejemplos de Busqueda en Anchura
 """
 from collections import deque
 
-def bfs(grafo, inicio):
+def bfs(grafo, inicio, observador=None):
+    # observador (opcional) recibe los eventos al_insertar / al_extraer / al_expandir
     visitados = set()              # Para registrar los nodos ya visitados
     cola = deque([inicio])          # Usamos una cola para BFS
     resultado = []                  # Para registrar el orden de visita
+    if observador is not None:
+        observador.al_insertar(inicio)
 
     while cola:
         nodo = cola.popleft()       # Sacamos el primer nodo de la cola
+        if observador is not None:
+            observador.al_extraer(nodo)
         if nodo not in visitados:
             visitados.add(nodo)      # Marcamos el nodo como visitado
             resultado.append(nodo)   # Guardamos el nodo visitado
+            if observador is not None:
+                observador.al_expandir(nodo)
             # Agregamos a la cola todos los vecinos que no hayan sido visitados
-            cola.extend(vecino for vecino in grafo[nodo] if vecino not in visitados)
+            nuevos = [vecino for vecino in grafo[nodo] if vecino not in visitados]
+            cola.extend(nuevos)
+            if observador is not None:
+                for vecino in nuevos:
+                    observador.al_insertar(vecino)
 
     return resultado
 
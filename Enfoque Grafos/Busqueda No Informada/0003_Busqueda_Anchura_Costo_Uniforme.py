@@ -2,25 +2,56 @@
 Prácticas de Inteligencia Artificial
 Ejemplos de Búsqueda en Anchura de Costo Uniforme
 """
-import heapq
+import os
+import random
+import sys
 
-def busqueda_costo_uniforme(grafo, inicio, objetivo):
-    # La cola de prioridad almacena tuplas de (costo acumulado, nodo actual, camino recorrido)
-    cola = [(0, inicio, [inicio])]
-    visitados = set()
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ not in sys.path:
+    sys.path.insert(0, RAIZ)
+from comunes import ColaPrioridadIndexada, reconstruir_camino
+
+
+def busqueda_costo_uniforme(grafo, inicio, objetivo, cola=None, observador=None):
+    # Cola de prioridad indexada: cada nodo aparece como mucho una vez.
+    # Se puede pasar una cola propia para consultar después sus estadísticas,
+    # y un observador que reciba los eventos de la búsqueda (ver 0011 de Búsqueda Informada).
+    if cola is None:
+        cola = ColaPrioridadIndexada()
+    mejor_costo = {inicio: 0}       # Mejor costo conocido para llegar a cada nodo
+    padres = {inicio: None}         # Padre con el que se obtuvo ese mejor costo
+    cerrados = set()
+    cola.insertar_o_reducir(inicio, 0)
+    if observador is not None:
+        observador.al_insertar(inicio)
 
     while cola:
-        costo_actual, nodo_actual, camino = heapq.heappop(cola)
+        costo_actual, nodo_actual = cola.extraer()
+        if observador is not None:
+            observador.al_extraer(nodo_actual)
 
         if nodo_actual == objetivo:
+            camino = reconstruir_camino(padres, nodo_actual)
+            if observador is not None:
+                observador.al_objetivo(nodo_actual, camino)
             return camino, costo_actual
-        
-        if nodo_actual not in visitados:
-            visitados.add(nodo_actual)
 
-            for vecino, costo in grafo.get(nodo_actual, []):
-                if vecino not in visitados:
-                    heapq.heappush(cola, (costo_actual + costo, vecino, camino + [vecino]))
+        cerrados.add(nodo_actual)
+        if observador is not None:
+            observador.al_expandir(nodo_actual)
+        for vecino, costo in grafo.get(nodo_actual, []):
+            if vecino in cerrados:
+                continue
+            nuevo_costo = costo_actual + costo
+            # Si ya conocemos un camino igual o mejor, no se toca la cola
+            if nuevo_costo >= mejor_costo.get(vecino, float('inf')):
+                cola.estadisticas['dominadas'] += 1
+                continue
+            mejor_costo[vecino] = nuevo_costo
+            padres[vecino] = nodo_actual
+            if observador is not None and vecino not in cola:
+                observador.al_insertar(vecino)  # Una reducción no agranda la frontera
+            cola.insertar_o_reducir(vecino, nuevo_costo)
     
     return None, float('inf') #Si no se encuentra camino
 
@@ -41,4 +72,16 @@ camino, costo_total = busqueda_costo_uniforme(grafo, inicio, objetivo)
 print(f"Camino encontrado: {camino}")
 print(f"Costo total: {costo_total}")
 
-#Camino encontrado: ['A', 'C', 'F'] Costo total: 5
\ No newline at end of file
+#Camino encontrado: ['A', 'C', 'F'] Costo total: 5
+
+# Estadísticas de la cola en un grafo denso aleatorio (300 nodos, 60% de aristas)
+random.seed(0)
+denso = {i: [(j, random.randint(1, 100)) for j in range(300) if j != i and random.random() < 0.6]
+         for i in range(300)}
+for perezosa in (True, False):
+    cola = ColaPrioridadIndexada(perezosa=perezosa)
+    busqueda_costo_uniforme(denso, 0, 299, cola)
+    print(f"{'heapq perezoso' if perezosa else 'decrease-key'}: {cola.estadisticas}")
+
+#Las 'dominadas' son relajaciones que no mejoran el mejor costo conocido: la versión
+#original las habría insertado todas en heapq y luego las habría sacado como obsoletas.
@@ -2,24 +2,44 @@
 Prácticas de Inteligencia Artificial
 Ejemplos de Búsqueda en Profundidad 
 """
-def busqueda_en_profundidad(grafo, inicio, objetivo):
-    # Usamos una pila (LIFO) para mantener los nodos pendientes
-    pila = [(inicio, [inicio])]  # Cada tupla contiene el nodo actual y el camino
-    visitados = set()
+import os
+import sys
 
-    while pila:
-        nodo_actual, camino = pila.pop()
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ not in sys.path:
+    sys.path.insert(0, RAIZ)
+from comunes import reconstruir_camino
 
-        # Si encontramos el objetivo, devolvemos el camino
-        if nodo_actual == objetivo:
-            return camino
-        
-        if nodo_actual not in visitados:
-            visitados.add(nodo_actual)
 
+def busqueda_en_profundidad(grafo, inicio, objetivo, observador=None):
+    # Usamos una pila (LIFO) para mantener los nodos pendientes
+    pila = [(inicio, None)]  # Cada tupla contiene el nodo actual y su padre
+    padres = {}              # Nodo visitado -> nodo desde el que se visitó
+    if observador is not None:
+        observador.al_insertar(inicio)
+
+    while pila:
+        nodo_actual, padre = pila.pop()
+        if observador is not None:
+            observador.al_extraer(nodo_actual)
+
+        if nodo_actual not in padres:
+            padres[nodo_actual] = padre
+
+            # Si encontramos el objetivo, reconstruimos el camino una sola vez
+            if nodo_actual == objetivo:
+                camino = reconstruir_camino(padres, nodo_actual)
+                if observador is not None:
+                    observador.al_objetivo(nodo_actual, camino)
+                return camino
+
+            if observador is not None:
+                observador.al_expandir(nodo_actual)
             for vecino in grafo.get(nodo_actual, []):
-                if vecino not in visitados:
-                    pila.append((vecino, camino + [vecino]))
+                if vecino not in padres:
+                    pila.append((vecino, nodo_actual))
+                    if observador is not None:
+                        observador.al_insertar(vecino)
 
     return None  # Si no se encuentra el objetivo
 
@@ -2,23 +2,44 @@
 Prácticas de Inteligencia Artificial
 Ejemplos de Búsqueda en Profundidad Limitada
 """
-def busqueda_profundidad_limitada(grafo, inicio, objetivo, limite):
-    pila = [(inicio, [inicio], 0)]  # Nodo, Camino y Profundidad actual
-    visitados = set()
+import os
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ not in sys.path:
+    sys.path.insert(0, RAIZ)
+from comunes import reconstruir_camino
+
+
+def busqueda_profundidad_limitada(grafo, inicio, objetivo, limite, observador=None):
+    pila = [(inicio, None, 0)]  # Nodo, Padre y Profundidad actual
+    padres = {}                 # Nodo expandido -> nodo desde el que se expandió
+    if observador is not None:
+        observador.al_insertar(inicio)
 
     while pila:
-        nodo_actual, camino, profundidad = pila.pop()
+        nodo_actual, padre, profundidad = pila.pop()
+        if observador is not None:
+            observador.al_extraer(nodo_actual)
 
         if nodo_actual == objetivo:
+            # El padre ya fue expandido, así que su cadena de padres está completa
+            camino = reconstruir_camino(padres, padre) + [nodo_actual]
+            if observador is not None:
+                observador.al_objetivo(nodo_actual, camino)
             return camino
         
         if profundidad < limite:
-            if nodo_actual not in visitados:
-                visitados.add(nodo_actual)
+            if nodo_actual not in padres:
+                padres[nodo_actual] = padre
+                if observador is not None:
+                    observador.al_expandir(nodo_actual)
 
                 for vecino in grafo.get(nodo_actual, []):
-                    if vecino not in visitados:
-                        pila.append((vecino, camino + [vecino], profundidad + 1))
+                    if vecino not in padres:
+                        pila.append((vecino, nodo_actual, profundidad + 1))
+                        if observador is not None:
+                            observador.al_insertar(vecino)
 
     return None  # Si no se encuentra el objetivo dentro del límite
 
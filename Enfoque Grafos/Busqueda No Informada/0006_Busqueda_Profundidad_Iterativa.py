@@ -2,27 +2,101 @@
 Prácticas de Inteligencia Artificial
 Ejemplos de Búsqueda en Profundidad Iterativa
 """
-def busqueda_profundidad_limitada(grafo, nodo_actual, objetivo, limite):
-    if nodo_actual == objetivo:
-        return [nodo_actual]
-    if limite == 0:
-        return None
-
-    for vecino in grafo.get(nodo_actual, []):
-        resultado = busqueda_profundidad_limitada(grafo, vecino, objetivo, limite - 1)
-        if resultado:
-            return [nodo_actual] + resultado
+def busqueda_profundidad_limitada(grafo, inicio, objetivo, limite, observador=None):
+    """
+    Profundidad limitada con una pila explícita (sin recursión).
+    Devuelve (camino, hubo_corte): hubo_corte indica si algún nodo se quedó
+    sin expandir por el límite, es decir, si tiene sentido aumentarlo.
+    """
+    # Tabla de transposición de esta iteración: menor profundidad a la que se alcanzó
+    # cada nodo. Llegar otra vez igual o más hondo sólo repetiría trabajo (o un ciclo).
+    mejor_profundidad = {inicio: 0}
+    pila = [(inicio, 0)]
+    camino = []  # camino[i] es el nodo a profundidad i de la rama actual
+    hubo_corte = False
+    if observador is not None:
+        observador.al_insertar(inicio)
+
+    while pila:
+        nodo_actual, profundidad = pila.pop()
+        if observador is not None:
+            observador.al_extraer(nodo_actual)
+        del camino[profundidad:]
+        camino.append(nodo_actual)
+
+        if nodo_actual == objetivo:
+            if observador is not None:
+                observador.al_objetivo(nodo_actual, list(camino))
+            return camino, hubo_corte
+
+        vecinos = grafo.get(nodo_actual, [])
+        if profundidad == limite:
+            hubo_corte = hubo_corte or bool(vecinos)
+            continue
+
+        if observador is not None:
+            observador.al_expandir(nodo_actual)
+        # Se apilan al revés para visitar los vecinos en el mismo orden que la recursión
+        for vecino in reversed(vecinos):
+            if profundidad + 1 < mejor_profundidad.get(vecino, float('inf')):
+                mejor_profundidad[vecino] = profundidad + 1
+                pila.append((vecino, profundidad + 1))
+                if observador is not None:
+                    observador.al_insertar(vecino)
 
-    return None
+    return None, hubo_corte
 
-def busqueda_profundidad_iterativa(grafo, inicio, objetivo):
+def busqueda_profundidad_iterativa(grafo, inicio, objetivo, observador=None):
+    # El observador acumula los eventos de todas las iteraciones
     profundidad = 0
     while True:
-        resultado = busqueda_profundidad_limitada(grafo, inicio, objetivo, profundidad)
+        resultado, hubo_corte = busqueda_profundidad_limitada(grafo, inicio, objetivo, profundidad,
+                                                              observador)
         if resultado:
             return resultado
+        if not hubo_corte:
+            return None  # Ya se exploró todo lo alcanzable: aumentar el límite no sirve
         profundidad += 1
 
+def busqueda_ida_estrella(grafo, heuristicas, inicio, objetivo):
+    """
+    IDA*: profundidad iterativa donde el límite es f = g + h en lugar de la
+    profundidad. Usa el mismo diccionario de heurísticas que las prácticas de
+    Búsqueda Informada. Acepta grafos con costos [(vecino, costo)] o sin ellos
+    (cada arista vale 1). Devuelve (camino, costo).
+    """
+    umbral = heuristicas[inicio]
+    while True:
+        mejor_costo = {inicio: 0}   # Tabla de transposición: menor g de esta iteración
+        pila = [(inicio, 0, 0)]     # Nodo, g y profundidad en la rama
+        camino = []
+        siguiente_umbral = float('inf')
+
+        while pila:
+            nodo_actual, costo_actual, profundidad = pila.pop()
+            if costo_actual > mejor_costo[nodo_actual]:
+                continue  # Después de apilarlo se llegó a él por un camino mejor
+            del camino[profundidad:]
+            camino.append(nodo_actual)
+
+            f = costo_actual + heuristicas[nodo_actual]
+            if f > umbral:
+                siguiente_umbral = min(siguiente_umbral, f)
+                continue
+            if nodo_actual == objetivo:
+                return camino, costo_actual
+
+            for arista in reversed(grafo.get(nodo_actual, [])):
+                vecino, costo = arista if isinstance(arista, tuple) else (arista, 1)
+                nuevo_costo = costo_actual + costo
+                if nuevo_costo < mejor_costo.get(vecino, float('inf')):
+                    mejor_costo[vecino] = nuevo_costo
+                    pila.append((vecino, nuevo_costo, profundidad + 1))
+
+        if siguiente_umbral == float('inf'):
+            return None, float('inf')  # Ningún nodo quedó fuera del umbral
+        umbral = siguiente_umbral
+
 # Ejemplo de grafo:
 grafo = {
     'A': ['B', 'C'],
@@ -39,4 +113,25 @@ objetivo = 'F'
 camino = busqueda_profundidad_iterativa(grafo, inicio, objetivo)
 print(f"Camino encontrado: {camino}")
 
-#Camino encontrado: ['A', 'C', 'F']
\ No newline at end of file
+#Camino encontrado: ['A', 'C', 'F']
+
+# IDA* con las heurísticas de Búsqueda Informada
+grafo_con_costos = {
+    'A': [('B', 1), ('C', 4)],
+    'B': [('D', 2), ('E', 5)],
+    'C': [('F', 1)],
+    'D': [],
+    'E': [('F', 1)],
+    'F': []
+}
+heuristicas = {'A': 6, 'B': 4, 'C': 4, 'D': 2, 'E': 1, 'F': 0}
+
+camino, costo = busqueda_ida_estrella(grafo_con_costos, heuristicas, inicio, objetivo)
+print(f"Camino encontrado IDA*: {camino} (costo {costo})")
+
+#Camino encontrado IDA*: ['A', 'B', 'E', 'F'] (costo 7)
+
+# Un ciclo largo ya no agota la recursión ni se explora en bucle
+ciclo = {i: [(i + 1) % 1500] for i in range(1500)}
+print(f"Ciclo de 1500 nodos: {len(busqueda_profundidad_iterativa(ciclo, 0, 1499))} nodos en el camino")
+print(f"Objetivo inalcanzable: {busqueda_profundidad_iterativa(grafo, 'F', 'A')}")
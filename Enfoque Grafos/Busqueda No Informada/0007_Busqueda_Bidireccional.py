@@ -2,57 +2,155 @@
 Prácticas de Inteligencia Artificial
 Ejemplos de Búsqueda Bidireccional
 """
-from collections import deque
-
-def hacer_grafo_bidireccional(grafo):
-    grafo_bidi = {}
+import heapq
+import os
+import random
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ not in sys.path:
+    sys.path.insert(0, RAIZ)
+from comunes import es_ponderado
+
+def construir_indice_inverso(grafo, ponderado=None):
+    # Para cada nodo, los nodos que tienen una arista hacia él (con su costo si lo hay).
+    # Se construye una sola vez y se reutiliza en todas las consultas sobre el grafo.
+    # Si no se indica ponderado se deduce del grafo (los nombres de nodo pueden ser tuplas)
+    if ponderado is None:
+        ponderado = es_ponderado(grafo)
+    inverso = {}
     for nodo, vecinos in grafo.items():
-        for vecino in vecinos:
-            grafo_bidi.setdefault(nodo, []).append(vecino)
-            grafo_bidi.setdefault(vecino, []).append(nodo)
-    return grafo_bidi
-
-def busqueda_bidireccional(grafo, inicio, objetivo):
+        inverso.setdefault(nodo, [])
+        for arista in vecinos:
+            if ponderado:
+                vecino, costo = arista
+                inverso.setdefault(vecino, []).append((nodo, costo))
+            else:
+                inverso.setdefault(arista, []).append(nodo)
+    return inverso
+
+def unir_caminos(padres_inicio, padres_objetivo, encuentro):
+    # Mitad inicio -> encuentro siguiendo padres, y encuentro -> objetivo siguiendo sucesores
+    camino = []
+    nodo = encuentro
+    while nodo is not None:
+        camino.append(nodo)
+        nodo = padres_inicio[nodo]
+    camino.reverse()
+    nodo = padres_objetivo[encuentro]
+    while nodo is not None:
+        camino.append(nodo)
+        nodo = padres_objetivo[nodo]
+    return camino
+
+def expandir_capa(adyacencia, frontera, padres, padres_otro_lado, observador=None):
+    # Expande una capa completa; devuelve la capa siguiente y el nodo de encuentro (si lo hay)
+    siguiente = []
+    for nodo in frontera:
+        if observador is not None:
+            observador.al_extraer(nodo)
+            observador.al_expandir(nodo)
+        for vecino in adyacencia.get(nodo, []):
+            if vecino not in padres:
+                padres[vecino] = nodo
+                if vecino in padres_otro_lado:
+                    return siguiente, vecino  # Se encontraron
+                siguiente.append(vecino)
+                if observador is not None:
+                    observador.al_insertar(vecino)
+    return siguiente, None
+
+def busqueda_bidireccional(grafo, inicio, objetivo, inverso=None, estadisticas=None,
+                           observador=None):
     if inicio == objetivo:
         return [inicio]
-
-    grafo = hacer_grafo_bidireccional(grafo)  # Convertir el grafo a bidireccional
-
-    # Inicializar estructuras de datos
-    cola_inicio = deque([[inicio]])
-    cola_objetivo = deque([[objetivo]])
-    visitados_inicio = {inicio: [inicio]}
-    visitados_objetivo = {objetivo: [objetivo]}
-
-    while cola_inicio and cola_objetivo:
-        # Expandir desde el inicio
-        camino_inicio = cola_inicio.popleft()
-        nodo_inicio = camino_inicio[-1]
-
-        for vecino in grafo.get(nodo_inicio, []):
-            if vecino not in visitados_inicio:
-                nuevo_camino = camino_inicio + [vecino]
-                visitados_inicio[vecino] = nuevo_camino
-                cola_inicio.append(nuevo_camino)
-
-                if vecino in visitados_objetivo:
-                    # Se encontraron
-                    return nuevo_camino + visitados_objetivo[vecino][-2::-1]
-
-        # Expandir desde el objetivo
-        camino_objetivo = cola_objetivo.popleft()
-        nodo_objetivo = camino_objetivo[-1]
-
-        for vecino in grafo.get(nodo_objetivo, []):
-            if vecino not in visitados_objetivo:
-                nuevo_camino = camino_objetivo + [vecino]
-                visitados_objetivo[vecino] = nuevo_camino
-                cola_objetivo.append(nuevo_camino)
-
-                if vecino in visitados_inicio:
-                    return visitados_inicio[vecino] + nuevo_camino[-2::-1]
-
-    return None
+    if inverso is None:
+        inverso = construir_indice_inverso(grafo)
+
+    # Sólo guardamos el padre de cada nodo en cada dirección
+    padres_inicio = {inicio: None}
+    padres_objetivo = {objetivo: None}   # Aquí el "padre" es el sucesor hacia el objetivo
+    frontera_inicio = [inicio]
+    frontera_objetivo = [objetivo]
+    encuentro = None
+    if observador is not None:
+        observador.al_insertar(inicio)
+        observador.al_insertar(objetivo)
+
+    while frontera_inicio and frontera_objetivo and encuentro is None:
+        # Se expande por capas el lado con la frontera más pequeña
+        if len(frontera_inicio) <= len(frontera_objetivo):
+            frontera_inicio, encuentro = expandir_capa(grafo, frontera_inicio,
+                                                       padres_inicio, padres_objetivo, observador)
+        else:
+            frontera_objetivo, encuentro = expandir_capa(inverso, frontera_objetivo,
+                                                         padres_objetivo, padres_inicio, observador)
+
+    if estadisticas is not None:
+        estadisticas['visitados'] = len(padres_inicio) + len(padres_objetivo)
+    if encuentro is None:
+        return None
+    camino = unir_caminos(padres_inicio, padres_objetivo, encuentro)
+    if observador is not None:
+        observador.al_objetivo(encuentro, camino)
+    return camino
+
+def busqueda_bidireccional_dijkstra(grafo, inicio, objetivo, inverso=None, estadisticas=None,
+                                    observador=None):
+    """
+    Versión con costos: costo uniforme hacia delante desde el inicio y hacia
+    atrás desde el objetivo. Se detiene cuando la suma de los mínimos de ambas
+    colas ya no puede mejorar el mejor camino encontrado (mu).
+    """
+    if inverso is None:
+        inverso = construir_indice_inverso(grafo)
+
+    lados = [
+        # (adyacencia, cola, distancias, padres, cerrados)
+        (grafo, [(0, inicio)], {inicio: 0}, {inicio: None}, set()),
+        (inverso, [(0, objetivo)], {objetivo: 0}, {objetivo: None}, set()),
+    ]
+    mu = 0 if inicio == objetivo else float('inf')
+    encuentro = inicio if inicio == objetivo else None
+    if observador is not None:
+        observador.al_insertar(inicio)
+        observador.al_insertar(objetivo)
+
+    while lados[0][1] and lados[1][1] and lados[0][1][0][0] + lados[1][1][0][0] < mu:
+        # Avanza el lado con la cola más pequeña
+        lado = 0 if len(lados[0][1]) <= len(lados[1][1]) else 1
+        adyacencia, cola, distancias, padres, cerrados = lados[lado]
+        distancias_otro = lados[1 - lado][2]
+
+        costo_actual, nodo = heapq.heappop(cola)
+        if observador is not None:
+            observador.al_extraer(nodo)
+        if nodo in cerrados:
+            continue
+        cerrados.add(nodo)
+        if observador is not None:
+            observador.al_expandir(nodo)
+
+        for vecino, costo in adyacencia.get(nodo, []):
+            nuevo_costo = costo_actual + costo
+            if nuevo_costo < distancias.get(vecino, float('inf')):
+                distancias[vecino] = nuevo_costo
+                padres[vecino] = nodo
+                heapq.heappush(cola, (nuevo_costo, vecino))
+                if observador is not None:
+                    observador.al_insertar(vecino)
+            if vecino in distancias_otro and distancias[vecino] + distancias_otro[vecino] < mu:
+                mu = distancias[vecino] + distancias_otro[vecino]
+                encuentro = vecino
+
+    if estadisticas is not None:
+        estadisticas['visitados'] = len(lados[0][2]) + len(lados[1][2])
+    if encuentro is None:
+        return None, float('inf')
+    camino = unir_caminos(lados[0][3], lados[1][3], encuentro)
+    if observador is not None:
+        observador.al_objetivo(encuentro, camino)
+    return camino, mu
 
 # ======= Ejemplo de grafo dirigido =======
 
@@ -68,7 +166,43 @@ grafo = {
 inicio = 'A'
 objetivo = 'F'
 
-camino = busqueda_bidireccional(grafo, inicio, objetivo)
+indice_inverso = construir_indice_inverso(grafo)  # Se construye una vez y se reutiliza
+camino = busqueda_bidireccional(grafo, inicio, objetivo, indice_inverso)
 print(f"Camino encontrado: {camino}")
 
-#Camino encontrado: ['A', 'B', 'D', 'F']
\ No newline at end of file
+#Camino encontrado: ['A', 'B', 'D', 'F']
+
+# Sin costos y con nodos que son tuplas: las aristas no son pares (vecino, costo)
+casillas = {(0, 0): [(0, 1), (5, 5)], (0, 1): [(1, 1)], (1, 1): [(2, 2)], (2, 2): [], (5, 5): []}
+print(f"Camino entre casillas: {busqueda_bidireccional(casillas, (0, 0), (2, 2))}")
+
+#Camino entre casillas: [(0, 0), (0, 1), (1, 1), (2, 2)]
+
+# ======= Ejemplo con costos =======
+grafo_con_costos = {
+    'A': [('B', 1), ('C', 4)],
+    'B': [('D', 2), ('E', 5)],
+    'C': [('F', 1)],
+    'D': [],
+    'E': [('F', 1)],
+    'F': []
+}
+camino, costo = busqueda_bidireccional_dijkstra(grafo_con_costos, inicio, objetivo)
+print(f"Camino encontrado con costos: {camino} (costo {costo})")
+
+#Camino encontrado con costos: ['A', 'C', 'F'] (costo 5)
+
+# ======= Nodos tocados en una cuadrícula grande =======
+random.seed(0)
+lado = 300
+rejilla = {}
+for f in range(lado):
+    for c in range(lado):
+        rejilla[(f, c)] = [((f + df, c + dc), random.randint(1, 9))
+                           for df, dc in ((1, 0), (0, 1), (-1, 0), (0, -1))
+                           if 0 <= f + df < lado and 0 <= c + dc < lado]
+inverso_rejilla = construir_indice_inverso(rejilla)
+estadisticas = {}
+camino, costo = busqueda_bidireccional_dijkstra(rejilla, (100, 100), (200, 200), inverso_rejilla, estadisticas)
+print(f"Bidireccional con costos en {lado}x{lado}: costo {costo}, "
+      f"{estadisticas['visitados']} nodos tocados de {len(rejilla)}")
@@ -4,25 +4,35 @@ Ejemplos de Búsqueda en Grafos (general)
 """
 from collections import deque
 
-def busqueda_en_grafos(grafo, inicio, objetivo):
+def busqueda_en_grafos(grafo, inicio, objetivo, observador=None):
     cola = deque([[inicio]])
     visitados = set()
+    if observador is not None:
+        observador.al_insertar(inicio)
 
     while cola:
         camino = cola.popleft()
         nodo_actual = camino[-1]
+        if observador is not None:
+            observador.al_extraer(nodo_actual)
 
         if nodo_actual == objetivo:
+            if observador is not None:
+                observador.al_objetivo(nodo_actual, camino)
             return camino
 
         if nodo_actual not in visitados:
             visitados.add(nodo_actual)
+            if observador is not None:
+                observador.al_expandir(nodo_actual)
 
             for vecino in grafo.get(nodo_actual, []):
                 if vecino not in visitados:
                     nueva_ruta = list(camino)
                     nueva_ruta.append(vecino)
                     cola.append(nueva_ruta)
+                    if observador is not None:
+                        observador.al_insertar(vecino)
 
     return None
 
@@ -0,0 +1,358 @@
+"""
+Prácticas de Inteligencia Artificial
+Grafo compacto en formato CSR (Compressed Sparse Row)
+y búsquedas no informadas sobre él
+"""
+import heapq
+import os
+import sys
+from array import array
+from collections import deque
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ not in sys.path:
+    sys.path.insert(0, RAIZ)
+from comunes import es_ponderado
+
+
+# =================== Representación CSR ===================
+def codigo_tipo(arreglo):
+    # Código de tipo ('i', 'q', 'd', ...) de un array o de una vista memoryview
+    # (las de 0013_Grafo_En_Disco.py no tienen el atributo typecode)
+    return memoryview(arreglo).format
+
+
+class GrafoCSR:
+    """
+    Grafo dirigido con los nodos internados como enteros 0..n-1.
+    Las aristas del nodo i ocupan las posiciones
+    desplazamientos[i] .. desplazamientos[i+1]-1 de los arreglos
+    vecinos (índice del nodo destino) y pesos (costo de la arista).
+    Si el grafo no tiene costos, pesos es None y cada arista vale 1.
+    """
+
+    def __init__(self, nombres, desplazamientos, vecinos, pesos=None):
+        self.nombres = nombres                                # índice -> nombre
+        self.indices = {nombre: i for i, nombre in enumerate(nombres)}  # nombre -> índice
+        self.desplazamientos = desplazamientos                # n + 1 enteros
+        self.vecinos = vecinos                                # m enteros
+        self.pesos = pesos                                    # m reales o None
+        self._traspuesto = None
+
+    def __len__(self):
+        return len(self.nombres)
+
+    def __str__(self):
+        return f"GrafoCSR({len(self)} nodos, {self.num_aristas()} aristas)"
+
+    def num_aristas(self):
+        return len(self.vecinos)
+
+    def ponderado(self):
+        return self.pesos is not None
+
+    def aristas(self, i):
+        # Rango de posiciones de las aristas que salen del nodo i
+        return range(self.desplazamientos[i], self.desplazamientos[i + 1])
+
+    def memoria_bytes(self):
+        # Bytes ocupados por los arreglos (sin contar la tabla de nombres)
+        total = 0
+        for arreglo in (self.desplazamientos, self.vecinos, self.pesos):
+            if arreglo is not None:
+                total += arreglo.itemsize * len(arreglo)
+        return total
+
+    def traspuesto(self):
+        """
+        Devuelve el grafo con todas las aristas invertidas (se calcula una sola vez).
+        Se construye con un conteo por nodo destino, sin pasar por diccionarios.
+        """
+        if self._traspuesto is not None:
+            return self._traspuesto
+
+        n = len(self)
+        desplazamientos = array('q', bytes(8 * (n + 1)))
+        for j in self.vecinos:
+            desplazamientos[j + 1] += 1
+        for i in range(n):
+            desplazamientos[i + 1] += desplazamientos[i]
+
+        siguiente = array('q', desplazamientos[:-1])
+        vecinos = array(codigo_tipo(self.vecinos), bytes(self.vecinos.itemsize * len(self.vecinos)))
+        pesos = (array(codigo_tipo(self.pesos), bytes(self.pesos.itemsize * len(self.pesos)))
+                 if self.ponderado() else None)
+        for i in range(n):
+            for k in self.aristas(i):
+                j = self.vecinos[k]
+                posicion = siguiente[j]
+                vecinos[posicion] = i
+                if pesos is not None:
+                    pesos[posicion] = self.pesos[k]
+                siguiente[j] = posicion + 1
+
+        self._traspuesto = GrafoCSR(self.nombres, desplazamientos, vecinos, pesos)
+        self._traspuesto._traspuesto = self
+        return self._traspuesto
+
+
+def construir_grafo_csr(grafo, ponderado=None):
+    """
+    Convierte el formato de diccionario usado en el resto de prácticas
+    ({'A': ['B', 'C']} o {'A': [('B', 1), ('C', 4)]}) a un GrafoCSR.
+    Los nodos que sólo aparecen como vecinos también se internan.
+    - ponderado: si las aristas llevan costo; None lo deduce de su forma
+      (con nombres de nodo que son tuplas conviene indicarlo)
+    """
+    nombres = list(grafo.keys())
+    indices = {nombre: i for i, nombre in enumerate(nombres)}
+
+    if ponderado is None:
+        ponderado = es_ponderado(grafo)
+    desplazamientos = array('q', [0])
+    vecinos = []
+    pesos = [] if ponderado else None
+
+    for nombre in list(nombres):
+        for arista in grafo[nombre]:
+            if ponderado:
+                vecino, costo = arista
+                pesos.append(costo)
+            else:
+                vecino = arista
+            if vecino not in indices:
+                indices[vecino] = len(nombres)
+                nombres.append(vecino)
+            vecinos.append(indices[vecino])
+        desplazamientos.append(len(vecinos))
+
+    # Nodos descubiertos sólo como destino: no tienen aristas de salida
+    while len(desplazamientos) < len(nombres) + 1:
+        desplazamientos.append(len(vecinos))
+
+    # Enteros de 32 bits mientras quepan, para reducir a la mitad la memoria
+    codigo = 'i' if len(nombres) < 2 ** 31 else 'q'
+    if ponderado:
+        # Costos enteros se guardan como enteros para no alterar los resultados
+        pesos = array('q' if all(isinstance(p, int) for p in pesos) else 'd', pesos)
+    return GrafoCSR(nombres, desplazamientos, array(codigo, vecinos), pesos)
+
+
+def reconstruir_camino(grafo_csr, padres, destino):
+    camino = []
+    i = destino
+    while i != -1:
+        camino.append(grafo_csr.nombres[i])
+        i = padres[i]
+    camino.reverse()
+    return camino
+
+
+def _arreglo_padres(n):
+    return array('q', [-1]) * n
+
+
+# =================== Búsquedas sobre CSR ===================
+def bfs_csr(grafo_csr, inicio):
+    # Equivalente a bfs(): devuelve los nodos en orden de visita
+    desplazamientos, vecinos = grafo_csr.desplazamientos, grafo_csr.vecinos
+    origen = grafo_csr.indices[inicio]
+    visitados = bytearray(len(grafo_csr))
+    visitados[origen] = 1
+    cola = deque([origen])
+    resultado = []
+
+    while cola:
+        nodo = cola.popleft()
+        resultado.append(grafo_csr.nombres[nodo])
+        for k in range(desplazamientos[nodo], desplazamientos[nodo + 1]):
+            vecino = vecinos[k]
+            if not visitados[vecino]:
+                visitados[vecino] = 1
+                cola.append(vecino)
+
+    return resultado
+
+
+def busqueda_costo_uniforme_csr(grafo_csr, inicio, objetivo):
+    # Equivalente a busqueda_costo_uniforme(): devuelve (camino, costo)
+    desplazamientos, vecinos, pesos = grafo_csr.desplazamientos, grafo_csr.vecinos, grafo_csr.pesos
+    origen, meta = grafo_csr.indices[inicio], grafo_csr.indices[objetivo]
+    n = len(grafo_csr)
+    distancias = array('d', [float('inf')]) * n
+    padres = _arreglo_padres(n)
+    cerrados = bytearray(n)
+    distancias[origen] = 0
+    cola = [(0, origen)]
+
+    while cola:
+        costo_actual, nodo = heapq.heappop(cola)
+        if cerrados[nodo]:
+            continue
+        if nodo == meta:
+            return reconstruir_camino(grafo_csr, padres, meta), costo_actual
+        cerrados[nodo] = 1
+
+        for k in range(desplazamientos[nodo], desplazamientos[nodo + 1]):
+            vecino = vecinos[k]
+            nuevo_costo = costo_actual + (pesos[k] if pesos is not None else 1)
+            if not cerrados[vecino] and nuevo_costo < distancias[vecino]:
+                distancias[vecino] = nuevo_costo
+                padres[vecino] = nodo
+                heapq.heappush(cola, (nuevo_costo, vecino))
+
+    return None, float('inf')
+
+
+def busqueda_en_profundidad_csr(grafo_csr, inicio, objetivo):
+    # Equivalente a busqueda_en_profundidad(): la pila guarda (nodo, padre)
+    desplazamientos, vecinos = grafo_csr.desplazamientos, grafo_csr.vecinos
+    origen, meta = grafo_csr.indices[inicio], grafo_csr.indices[objetivo]
+    visitados = bytearray(len(grafo_csr))
+    padres = _arreglo_padres(len(grafo_csr))
+    pila = [(origen, -1)]
+
+    while pila:
+        nodo, padre = pila.pop()
+        if visitados[nodo]:
+            continue
+        visitados[nodo] = 1
+        padres[nodo] = padre
+        if nodo == meta:
+            return reconstruir_camino(grafo_csr, padres, meta)
+
+        for k in range(desplazamientos[nodo], desplazamientos[nodo + 1]):
+            vecino = vecinos[k]
+            if not visitados[vecino]:
+                pila.append((vecino, nodo))
+
+    return None
+
+
+def busqueda_bidireccional_csr(grafo_csr, inicio, objetivo):
+    """
+    Búsqueda bidireccional sobre CSR. El lado del objetivo avanza por el
+    grafo traspuesto, así que se respeta la dirección de las aristas.
+    """
+    if inicio == objetivo:
+        return [inicio]
+
+    n = len(grafo_csr)
+    origen, meta = grafo_csr.indices[inicio], grafo_csr.indices[objetivo]
+    lados = [
+        (grafo_csr, deque([origen]), _arreglo_padres(n), bytearray(n)),
+        (grafo_csr.traspuesto(), deque([meta]), _arreglo_padres(n), bytearray(n)),
+    ]
+    lados[0][3][origen] = 1
+    lados[1][3][meta] = 1
+
+    while lados[0][1] and lados[1][1]:
+        for lado, otro in ((0, 1), (1, 0)):
+            grafo_lado, cola, padres, visitados = lados[lado]
+            nodo = cola.popleft()
+            for k in grafo_lado.aristas(nodo):
+                vecino = grafo_lado.vecinos[k]
+                if visitados[vecino]:
+                    continue
+                visitados[vecino] = 1
+                padres[vecino] = nodo
+                cola.append(vecino)
+
+                if lados[otro][3][vecino]:
+                    # Se encontraron: unimos las dos mitades por el nodo común
+                    padres_inicio, padres_objetivo = lados[0][2], lados[1][2]
+                    camino = reconstruir_camino(grafo_csr, padres_inicio, vecino)
+                    i = padres_objetivo[vecino]
+                    while i != -1:
+                        camino.append(grafo_csr.nombres[i])
+                        i = padres_objetivo[i]
+                    return camino
+            if not cola:
+                return None
+
+    return None
+
+
+def busqueda_en_grafos_csr(grafo_csr, inicio, objetivo):
+    # Equivalente a busqueda_en_grafos(): anchura con punteros a padre
+    desplazamientos, vecinos = grafo_csr.desplazamientos, grafo_csr.vecinos
+    origen, meta = grafo_csr.indices[inicio], grafo_csr.indices[objetivo]
+    visitados = bytearray(len(grafo_csr))
+    padres = _arreglo_padres(len(grafo_csr))
+    visitados[origen] = 1
+    cola = deque([origen])
+
+    while cola:
+        nodo = cola.popleft()
+        if nodo == meta:
+            return reconstruir_camino(grafo_csr, padres, meta)
+
+        for k in range(desplazamientos[nodo], desplazamientos[nodo + 1]):
+            vecino = vecinos[k]
+            if not visitados[vecino]:
+                visitados[vecino] = 1
+                padres[vecino] = nodo
+                cola.append(vecino)
+
+    return None
+
+
+# =================== Ejemplo de uso ===================
+if __name__ == "__main__":
+    import sys
+
+    grafo = {
+        'A': ['B', 'C'],
+        'B': ['D', 'E'],
+        'C': ['F'],
+        'D': [],
+        'E': ['F'],
+        'F': []
+    }
+    grafo_con_costos = {
+        'A': [('B', 1), ('C', 4)],
+        'B': [('D', 2), ('E', 5)],
+        'C': [('F', 1)],
+        'D': [],
+        'E': [('F', 1)],
+        'F': []
+    }
+
+    csr = construir_grafo_csr(grafo)
+    csr_costos = construir_grafo_csr(grafo_con_costos)
+    print(csr)
+    print("Orden de visita (BFS):", bfs_csr(csr, 'A'))
+    print("Costo uniforme:", busqueda_costo_uniforme_csr(csr_costos, 'A', 'F'))
+    print("Profundidad:", busqueda_en_profundidad_csr(csr, 'A', 'F'))
+    print("Bidireccional:", busqueda_bidireccional_csr(csr, 'A', 'F'))
+    print("Grafos general:", busqueda_en_grafos_csr(csr, 'A', 'F'))
+
+    # Comparación de memoria en una cuadrícula de 300 x 300 con costos
+    lado = 300
+    rejilla = {}
+    for f in range(lado):
+        for c in range(lado):
+            vecinos = []
+            if f + 1 < lado:
+                vecinos.append((f"{f + 1},{c}", 1))
+            if c + 1 < lado:
+                vecinos.append((f"{f},{c + 1}", 1))
+            rejilla[f"{f},{c}"] = vecinos
+    rejilla_csr = construir_grafo_csr(rejilla)
+
+    # Tamaño del diccionario: tabla hash, listas de adyacencia y tuplas (vecino, costo)
+    memoria_diccionario = sys.getsizeof(rejilla) + sum(
+        sys.getsizeof(lista) + sum(sys.getsizeof(arista) for arista in lista)
+        for lista in rejilla.values())
+
+    print(f"\n{rejilla_csr}")
+    print(f"Memoria del diccionario (sin nombres): {memoria_diccionario / 2 ** 20:.1f} MiB")
+    print(f"Memoria de los arreglos CSR: {rejilla_csr.memoria_bytes() / 2 ** 20:.1f} MiB")
+    print("Costo uniforme en la cuadrícula:",
+          busqueda_costo_uniforme_csr(rejilla_csr, "0,0", f"{lado - 1},{lado - 1}")[1])
+
+#Orden de visita (BFS): ['A', 'B', 'C', 'D', 'E', 'F']
+#Costo uniforme: (['A', 'C', 'F'], 5)
+#Profundidad: ['A', 'C', 'F']
+#Bidireccional: ['A', 'C', 'F']
+#Grafos general: ['A', 'C', 'F']
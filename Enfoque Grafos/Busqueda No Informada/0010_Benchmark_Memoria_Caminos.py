@@ -0,0 +1,225 @@
+"""
+Prácticas de Inteligencia Artificial
+Comparación de memoria: copiar el camino en cada nodo frente a guardar sólo el padre
+"""
+import heapq
+import os
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ not in sys.path:
+    sys.path.insert(0, RAIZ)
+from comunes import cargar_script
+
+
+# =================== Versiones anteriores (copian el camino) ===================
+class MemoriaCaminos:
+    """
+    Cuenta lo que ocupan los caminos que guarda la frontera de las versiones
+    con copias: entradas y bytes de las listas (sys.getsizeof), actuales y máximos
+    """
+
+    def __init__(self):
+        self.entradas = self.max_entradas = 0
+        self.bytes = self.max_bytes = 0
+
+    def guardar(self, camino):
+        self.entradas += 1
+        self.bytes += sys.getsizeof(camino)
+        self.max_entradas = max(self.max_entradas, self.entradas)
+        self.max_bytes = max(self.max_bytes, self.bytes)
+
+    def soltar(self, camino):
+        self.entradas -= 1
+        self.bytes -= sys.getsizeof(camino)
+
+
+def costo_uniforme_copiando_caminos(grafo, inicio, objetivo, medidor=None):
+    medidor = medidor or MemoriaCaminos()
+    cola = [(0, inicio, [inicio])]
+    medidor.guardar(cola[0][2])
+    visitados = set()
+    while cola:
+        costo_actual, nodo_actual, camino = heapq.heappop(cola)
+        medidor.soltar(camino)
+        if nodo_actual == objetivo:
+            return camino, costo_actual
+        if nodo_actual not in visitados:
+            visitados.add(nodo_actual)
+            for vecino, costo in grafo.get(nodo_actual, []):
+                if vecino not in visitados:
+                    nuevo_camino = camino + [vecino]
+                    heapq.heappush(cola, (costo_actual + costo, vecino, nuevo_camino))
+                    medidor.guardar(nuevo_camino)
+    return None, float('inf')
+
+
+def profundidad_copiando_caminos(grafo, inicio, objetivo, medidor=None):
+    medidor = medidor or MemoriaCaminos()
+    pila = [(inicio, [inicio])]
+    medidor.guardar(pila[0][1])
+    visitados = set()
+    while pila:
+        nodo_actual, camino = pila.pop()
+        medidor.soltar(camino)
+        if nodo_actual == objetivo:
+            return camino
+        if nodo_actual not in visitados:
+            visitados.add(nodo_actual)
+            for vecino in grafo.get(nodo_actual, []):
+                if vecino not in visitados:
+                    nuevo_camino = camino + [vecino]
+                    pila.append((vecino, nuevo_camino))
+                    medidor.guardar(nuevo_camino)
+    return None
+
+
+def a_estrella_copiando_caminos(grafo, heuristicas, inicio, objetivo, medidor=None):
+    medidor = medidor or MemoriaCaminos()
+    cola = [(heuristicas[inicio], 0, inicio, [inicio])]
+    medidor.guardar(cola[0][3])
+    visitados = set()
+    while cola:
+        _, costo_actual, nodo_actual, camino = heapq.heappop(cola)
+        medidor.soltar(camino)
+        if nodo_actual == objetivo:
+            return camino, costo_actual
+        if nodo_actual not in visitados:
+            visitados.add(nodo_actual)
+            for vecino, costo in grafo.get(nodo_actual, []):
+                if vecino not in visitados:
+                    nuevo_costo = costo_actual + costo
+                    nuevo_camino = camino + [vecino]
+                    heapq.heappush(cola, (nuevo_costo + heuristicas[vecino], nuevo_costo,
+                                          vecino, nuevo_camino))
+                    medidor.guardar(nuevo_camino)
+    return None, float('inf')
+
+
+# =================== Grafos de prueba ===================
+def grafo_cadena(n):
+    # 0 -> 1 -> ... -> n-1: la profundidad de la solución es n
+    return {i: [(i + 1, 1)] if i + 1 < n else [] for i in range(n)}
+
+
+def grafo_rejilla(lado):
+    # Cuadrícula con movimientos en las cuatro direcciones
+    grafo = {}
+    for f in range(lado):
+        for c in range(lado):
+            vecinos = []
+            for df, dc in ((1, 0), (0, 1), (-1, 0), (0, -1)):
+                if 0 <= f + df < lado and 0 <= c + dc < lado:
+                    vecinos.append(((f + df) * lado + c + dc, 1))
+            grafo[f * lado + c] = vecinos
+    return grafo
+
+
+def sin_costos(grafo):
+    return {nodo: [vecino for vecino, _ in vecinos] for nodo, vecinos in grafo.items()}
+
+
+def bytes_diccionario(claves):
+    # Lo que ocupa un diccionario de padres con ese número de claves (sin contar
+    # los nodos, que el grafo ya tiene)
+    return sys.getsizeof(dict.fromkeys(range(claves)))
+
+
+def cronometrar(funcion, *argumentos):
+    inicio = time.perf_counter()
+    funcion(*argumentos)
+    return time.perf_counter() - inicio
+
+
+def comparar(casos, instrumentacion):
+    """
+    Para cada caso mide, con la versión con copias y con la de padres:
+    - la frontera máxima (entradas)
+    - la memoria dedicada a los caminos: en la versión con copias, el máximo
+      de bytes de las listas que guarda la frontera; en la de padres, el
+      diccionario de padres al terminar (nunca se le quitan claves)
+    - el tiempo, en una ejecución aparte sin instrumentar
+    """
+    class NodosPadres(instrumentacion.FronteraMaxima):
+        # Nodos distintos que han entrado en la frontera o salido de ella
+        def __init__(self):
+            super().__init__()
+            self.insertados, self.extraidos = set(), set()
+
+        def al_insertar(self, nodo):
+            super().al_insertar(nodo)
+            self.insertados.add(nodo)
+
+        def al_extraer(self, nodo):
+            super().al_extraer(nodo)
+            self.extraidos.add(nodo)
+
+    print(f"{'búsqueda':<16}{'grafo':<15}{'N':>6}{'frontera copias':>17}{'frontera padres':>17}"
+          f"{'caminos KiB copias':>20}{'caminos KiB padres':>20}{'copias s':>10}{'padres s':>10}")
+    for nombre, descripcion, n, anterior, nueva, claves, argumentos in casos:
+        medidor = MemoriaCaminos()
+        anterior(*argumentos, medidor=medidor)
+        observador = NodosPadres()
+        nueva(*argumentos, observador=observador)
+        # Costo uniforme y A* apuntan un padre por cada nodo insertado;
+        # profundidad, por cada nodo que saca de la pila por primera vez
+        padres = bytes_diccionario(len(getattr(observador, claves)))
+        print(f"{nombre:<16}{descripcion:<15}{n:>6}{medidor.max_entradas:>17}{observador.maximo:>17}"
+              f"{medidor.max_bytes / 1024:>20.0f}{padres / 1024:>20.0f}"
+              f"{cronometrar(anterior, *argumentos):>10.3f}{cronometrar(nueva, *argumentos):>10.3f}")
+
+
+# =================== Ejecutar comparación ===================
+if __name__ == "__main__":
+    costo_uniforme = cargar_script("Busqueda No Informada/0003_Busqueda_Anchura_Costo_Uniforme.py"
+                                   ).busqueda_costo_uniforme
+    profundidad = cargar_script("Busqueda No Informada/0004_Busqueda_Profundidad.py"
+                                ).busqueda_en_profundidad
+    a_estrella = cargar_script("Busqueda Informada/0003_Busqueda_A y AO.py").busqueda_a_estrella
+    instrumentacion = cargar_script("Busqueda Informada/0011_Instrumentacion_Busquedas.py")
+
+    casos = []
+    for n in (2000, 8000, 16000):
+        cadena = grafo_cadena(n)
+        h = {nodo: n - 1 - nodo for nodo in cadena}
+        casos.append(("costo uniforme", "cadena", n, costo_uniforme_copiando_caminos,
+                      costo_uniforme, 'insertados', (cadena, 0, n - 1)))
+        casos.append(("profundidad", "cadena", n, profundidad_copiando_caminos,
+                      profundidad, 'extraidos', (sin_costos(cadena), 0, n - 1)))
+        casos.append(("A*", "cadena", n, a_estrella_copiando_caminos,
+                      a_estrella, 'insertados', (cadena, h, 0, n - 1)))
+
+    for lado in (20, 40, 60):
+        n = lado * lado
+        rejilla = grafo_rejilla(lado)
+        h = {nodo: (lado - 1 - nodo // lado) + (lado - 1 - nodo % lado) for nodo in rejilla}
+        casos.append(("costo uniforme", f"rejilla {lado}x{lado}", n, costo_uniforme_copiando_caminos,
+                      costo_uniforme, 'insertados', (rejilla, 0, n - 1)))
+        casos.append(("profundidad", f"rejilla {lado}x{lado}", n, profundidad_copiando_caminos,
+                      profundidad, 'extraidos', (sin_costos(rejilla), 0, n - 1)))
+        casos.append(("A*", f"rejilla {lado}x{lado}", n, a_estrella_copiando_caminos,
+                      a_estrella, 'insertados', (rejilla, h, 0, n - 1)))
+
+    comparar(casos, instrumentacion)
+
+#Salida (los tiempos dependen de la máquina):
+#búsqueda        grafo               N  frontera copias  frontera padres  caminos KiB copias  caminos KiB padres  copias s  padres s
+#costo uniforme  cadena          16000                1                1                 125                 576     0.686     0.045
+#profundidad     cadena          16000                1                1                 125                 576     0.671     0.011
+#A*              cadena          16000                1                1                 125                 576     0.700     0.052
+#costo uniforme  rejilla 60x60   3600              119               60                  64                 144     0.032     0.025
+#profundidad     rejilla 60x60   3600             3482             3482               48381                 144     0.150     0.003
+#A*              rejilla 60x60   3600              119               60                  64                 144     0.035     0.028
+#
+#Los punteros a padre no ahorran memoria siempre: el diccionario de padres es O(N) y se
+#conserva toda la búsqueda, mientras que las copias sólo viven mientras su entrada está
+#en la frontera.
+#- En la cadena la frontera tiene una sola entrada y sólo hay un camino vivo, así que las
+#  copias ocupan menos (125 frente a 576 KiB). Lo que se gana con padres es tiempo: cada
+#  inserción copia un camino de longitud creciente y la versión con copias es cuadrática.
+#- En costo uniforme y A* sobre la rejilla la frontera es estrecha y los caminos cortos;
+#  las copias siguen ocupando menos que el diccionario. La frontera con copias es el doble
+#  porque admite entradas repetidas, y la cola indexada de 0003 rebaja la prioridad en su lugar.
+#- En profundidad sobre la rejilla la pila llega a miles de caminos largos: 48381 KiB de
+#  copias frente a 144 KiB de padres con sólo 3600 nodos. Ahí está la ganancia de memoria.
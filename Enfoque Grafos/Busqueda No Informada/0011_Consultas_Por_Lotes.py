@@ -0,0 +1,213 @@
+"""
+Prácticas de Inteligencia Artificial
+Costo uniforme por lotes: muchas consultas (inicio, objetivo) sobre el mismo grafo
+"""
+import multiprocessing
+import os
+import random
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ not in sys.path:
+    sys.path.insert(0, RAIZ)
+from comunes import ColaPrioridadIndexada, reconstruir_camino
+
+
+# =================== Costo uniforme desde un origen a todos ===================
+def costo_uniforme_desde(grafo, origen):
+    """
+    Búsqueda de costo uniforme (Dijkstra) sin objetivo: recorre todo lo
+    alcanzable desde el origen y devuelve el árbol de caminos mínimos
+    como dos diccionarios (distancias, padres).
+    """
+    distancias = {origen: 0}
+    padres = {origen: None}
+    cerrados = set()
+    # Modo perezoso (heapq con entradas repetidas): al recorrer todo el grafo sale
+    # más rápido que reducir en el sitio. El orden de inserción deshace los empates
+    # sin comparar nodos
+    cola = ColaPrioridadIndexada(perezosa=True)
+    cola.insertar_o_reducir(origen, 0)
+
+    while cola:
+        costo_actual, nodo_actual = cola.extraer()
+        cerrados.add(nodo_actual)
+
+        for vecino, costo in grafo.get(nodo_actual, []):
+            if vecino in cerrados:
+                continue
+            nuevo_costo = costo_actual + costo
+            if nuevo_costo < distancias.get(vecino, float('inf')):
+                distancias[vecino] = nuevo_costo
+                padres[vecino] = nodo_actual
+                cola.insertar_o_reducir(vecino, nuevo_costo)
+
+    return distancias, padres
+
+
+def camino_en_arbol(arbol, objetivo):
+    # Extrae (camino, costo) hacia el objetivo de un árbol de caminos mínimos
+    distancias, padres = arbol
+    if objetivo not in distancias:
+        return None, float('inf')
+    return reconstruir_camino(padres, objetivo), distancias[objetivo]
+
+
+# =================== Caché LRU de árboles ===================
+class CacheLRU:
+    """
+    Guarda como mucho 'capacidad' árboles; al llenarse descarta el que
+    lleva más tiempo sin consultarse.
+    """
+
+    def __init__(self, capacidad):
+        self.capacidad = capacidad
+        self.datos = OrderedDict()
+        self.aciertos = 0
+        self.fallos = 0
+
+    def __contains__(self, clave):
+        return clave in self.datos
+
+    def obtener(self, clave):
+        if clave in self.datos:
+            self.datos.move_to_end(clave)
+            self.aciertos += 1
+            return self.datos[clave]
+        self.fallos += 1
+        return None
+
+    def guardar(self, clave, valor):
+        self.datos[clave] = valor
+        self.datos.move_to_end(clave)
+        while len(self.datos) > self.capacidad:
+            self.datos.popitem(last=False)
+
+
+# =================== Trabajadores del pool ===================
+_grafo_trabajador = None
+
+
+def _iniciar_trabajador(grafo):
+    # Cada proceso recibe el grafo una sola vez, no en cada tarea
+    global _grafo_trabajador
+    _grafo_trabajador = grafo
+
+
+def _arbol_en_trabajador(origen):
+    return origen, costo_uniforme_desde(_grafo_trabajador, origen)
+
+
+def _contexto_procesos():
+    # Con fork los trabajadores heredan el grafo sin serializarlo
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return multiprocessing.get_context()
+
+
+# =================== Motor de consultas por lotes ===================
+class CaminosPorLotes:
+    """
+    Responde listas de consultas (inicio, objetivo) agrupándolas por inicio:
+    se hace un solo recorrido de costo uniforme por cada inicio distinto y
+    el árbol resultante se guarda en una caché LRU para lotes posteriores.
+    Con procesos > 1 los inicios que faltan en la caché se reparten en un pool.
+    """
+
+    def __init__(self, grafo, capacidad_cache=256, procesos=1):
+        self.grafo = grafo
+        self.cache = CacheLRU(capacidad_cache)
+        self.procesos = procesos
+        self.recorridos = 0  # Número de árboles calculados
+
+    def consultar(self, consultas):
+        # Devuelve [(camino, costo), ...] en el mismo orden que las consultas
+        por_origen = {}
+        for posicion, (inicio, objetivo) in enumerate(consultas):
+            por_origen.setdefault(inicio, []).append((posicion, objetivo))
+
+        resultados = [None] * len(consultas)
+        faltantes = []
+        for origen, pendientes in por_origen.items():
+            arbol = self.cache.obtener(origen)
+            if arbol is None:
+                faltantes.append(origen)
+            else:
+                self._responder(arbol, pendientes, resultados)
+
+        for origen, arbol in self._calcular_arboles(faltantes):
+            self.cache.guardar(origen, arbol)
+            self._responder(arbol, por_origen[origen], resultados)
+
+        return resultados
+
+    def _responder(self, arbol, pendientes, resultados):
+        for posicion, objetivo in pendientes:
+            resultados[posicion] = camino_en_arbol(arbol, objetivo)
+
+    def _calcular_arboles(self, origenes):
+        # Generador: cada árbol se usa en cuanto está listo, así la caché
+        # puede ser más pequeña que el número de inicios distintos del lote
+        self.recorridos += len(origenes)
+        if self.procesos <= 1 or len(origenes) < 2:
+            for origen in origenes:
+                yield origen, costo_uniforme_desde(self.grafo, origen)
+            return
+
+        with ProcessPoolExecutor(max_workers=self.procesos, mp_context=_contexto_procesos(),
+                                 initializer=_iniciar_trabajador, initargs=(self.grafo,)) as pool:
+            yield from pool.map(_arbol_en_trabajador, origenes,
+                                chunksize=max(1, len(origenes) // (4 * self.procesos)))
+
+
+# =================== Ejemplo de uso ===================
+if __name__ == "__main__":
+    grafo = {
+        'A': [('B', 1), ('C', 4)],
+        'B': [('D', 2), ('E', 5)],
+        'C': [('F', 1)],
+        'D': [],
+        'E': [('F', 1)],
+        'F': []
+    }
+
+    motor = CaminosPorLotes(grafo, capacidad_cache=2)
+    consultas = [('A', 'F'), ('B', 'F'), ('A', 'D'), ('C', 'F'), ('A', 'E')]
+    for (inicio, objetivo), (camino, costo) in zip(consultas, motor.consultar(consultas)):
+        print(f"{inicio} -> {objetivo}: {camino} (costo {costo})")
+    print(f"Recorridos: {motor.recorridos}, aciertos de caché: {motor.cache.aciertos}")
+
+    # Lote grande: 5000 consultas con 50 inicios distintos en una cuadrícula de 80 x 80
+    random.seed(0)
+    lado = 80
+    rejilla = {}
+    for f in range(lado):
+        for c in range(lado):
+            rejilla[(f, c)] = [((f + df, c + dc), random.randint(1, 9))
+                               for df, dc in ((1, 0), (0, 1), (-1, 0), (0, -1))
+                               if 0 <= f + df < lado and 0 <= c + dc < lado]
+    nodos = list(rejilla)
+    origenes = random.sample(nodos, 50)
+    lote = [(random.choice(origenes), random.choice(nodos)) for _ in range(5000)]
+
+    for procesos in sorted({1, min(4, os.cpu_count() or 1)}):
+        motor = CaminosPorLotes(rejilla, capacidad_cache=64, procesos=procesos)
+        t = time.perf_counter()
+        respuestas = motor.consultar(lote)
+        print(f"\n{procesos} proceso(s): {len(respuestas)} consultas, {motor.recorridos} recorridos, "
+              f"{time.perf_counter() - t:.2f} s")
+
+    t = time.perf_counter()
+    respuestas_cache = motor.consultar(lote)
+    print(f"Mismo lote con la caché caliente: {time.perf_counter() - t:.2f} s "
+          f"({motor.cache.aciertos} aciertos)")
+    assert [c for _, c in respuestas_cache] == [c for _, c in respuestas]
+
+#A -> F: ['A', 'C', 'F'] (costo 5)
+#B -> F: ['B', 'E', 'F'] (costo 6)
+#A -> D: ['A', 'B', 'D'] (costo 3)
+#C -> F: ['C', 'F'] (costo 1)
+#A -> E: ['A', 'B', 'E'] (costo 6)
@@ -0,0 +1,180 @@
+"""
+Prácticas de Inteligencia Artificial
+Búsqueda en Anchura por niveles vectorizada con NumPy
+(top-down, bottom-up y cambio automático de dirección)
+"""
+import os
+import sys
+import time
+from array import array
+
+import numpy as np
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ not in sys.path:
+    sys.path.insert(0, RAIZ)
+from comunes import cargar_script
+
+
+csr = cargar_script("Busqueda No Informada/0009_Grafo_CSR.py")
+
+
+# =================== Adyacencia CSR como arreglos NumPy ===================
+class AdyacenciaNumPy:
+    """
+    Vista NumPy de un GrafoCSR (sin copiar los arreglos de aristas) y de su
+    traspuesto, que hace falta para el paso bottom-up.
+    """
+
+    def __init__(self, grafo_csr):
+        self.grafo_csr = grafo_csr
+        self.n = len(grafo_csr)
+        self.desplazamientos = np.frombuffer(grafo_csr.desplazamientos, dtype=np.int64)
+        self.vecinos = np.frombuffer(grafo_csr.vecinos, dtype=csr.codigo_tipo(grafo_csr.vecinos))
+        traspuesto = grafo_csr.traspuesto()
+        self.desplazamientos_entrada = np.frombuffer(traspuesto.desplazamientos, dtype=np.int64)
+        self.vecinos_entrada = np.frombuffer(traspuesto.vecinos, dtype=self.vecinos.dtype)
+        self.grados = np.diff(self.desplazamientos)
+        self.grados_entrada = np.diff(self.desplazamientos_entrada)
+
+
+def _reunir(desplazamientos, vecinos, nodos):
+    """
+    Reúne en un solo arreglo los vecinos de todos los nodos dados.
+    Devuelve (vecinos, dueño) donde dueño[k] es el nodo del que sale vecinos[k].
+    """
+    inicios = desplazamientos[nodos]
+    cantidades = desplazamientos[nodos + 1] - inicios
+    total = int(cantidades.sum())
+    if total == 0:
+        return vecinos[:0], nodos[:0]
+    # Posición de cada arista: inicio de su nodo + índice dentro de su tramo
+    bases = np.repeat(inicios - (np.cumsum(cantidades) - cantidades), cantidades)
+    posiciones = bases + np.arange(total)
+    return vecinos[posiciones], np.repeat(nodos, cantidades)
+
+
+def paso_top_down(ady, frontera, visitados, padres):
+    # Cada nodo de la frontera mira a sus sucesores
+    vecinos, duenos = _reunir(ady.desplazamientos, ady.vecinos, frontera)
+    nuevos = ~visitados[vecinos]
+    vecinos, duenos = vecinos[nuevos], duenos[nuevos]
+    # Un nodo puede descubrirse desde varios padres: nos quedamos con el primero
+    siguiente, primero = np.unique(vecinos, return_index=True)
+    padres[siguiente] = duenos[primero]
+    visitados[siguiente] = True
+    return siguiente
+
+
+def paso_bottom_up(ady, mascara_frontera, visitados, padres):
+    # Cada nodo no visitado busca algún predecesor que esté en la frontera
+    candidatos = np.flatnonzero(~visitados & (ady.grados_entrada > 0))
+    predecesores, duenos = _reunir(ady.desplazamientos_entrada, ady.vecinos_entrada, candidatos)
+    en_frontera = mascara_frontera[predecesores]
+    # Para cada candidato, el primer predecesor que está en la frontera
+    encontrados, primero = np.unique(duenos[en_frontera], return_index=True)
+    padres[encontrados] = predecesores[en_frontera][primero]
+    visitados[encontrados] = True
+    return encontrados
+
+
+def bfs_por_niveles(ady, origen, destino=None, alfa=14, beta=24, modo='auto'):
+    """
+    Anchura síncrona por niveles. modo puede ser 'top-down', 'bottom-up' o
+    'auto' (heurística de Beamer: pasa a bottom-up cuando las aristas de la
+    frontera superan a las de los no visitados / alfa, y vuelve a top-down
+    cuando la frontera baja de n / beta).
+    Devuelve (niveles, padres, direcciones) como arreglos de índices; -1 = no alcanzado.
+    """
+    n = ady.n
+    visitados = np.zeros(n, dtype=bool)
+    padres = np.full(n, -1, dtype=np.int64)
+    niveles = np.full(n, -1, dtype=np.int64)
+    frontera = np.array([origen], dtype=np.int64)
+    visitados[origen] = True
+    niveles[origen] = 0
+    aristas_sin_visitar = int(ady.grados.sum()) - int(ady.grados[origen])
+    direcciones = []
+    abajo_arriba = modo == 'bottom-up'
+    nivel = 0
+
+    while frontera.size and not (destino is not None and visitados[destino]):
+        if modo == 'auto':
+            aristas_frontera = int(ady.grados[frontera].sum())
+            if not abajo_arriba and aristas_frontera > aristas_sin_visitar / alfa:
+                abajo_arriba = True
+            elif abajo_arriba and frontera.size < n / beta:
+                abajo_arriba = False
+
+        if abajo_arriba:
+            mascara = np.zeros(n, dtype=bool)
+            mascara[frontera] = True
+            frontera = paso_bottom_up(ady, mascara, visitados, padres)
+        else:
+            frontera = paso_top_down(ady, frontera, visitados, padres)
+
+        nivel += 1
+        niveles[frontera] = nivel
+        aristas_sin_visitar -= int(ady.grados[frontera].sum())
+        direcciones.append('bottom-up' if abajo_arriba else 'top-down')
+
+    return niveles, padres, direcciones
+
+
+def bfs_vectorizado(ady, inicio, modo='auto'):
+    # Como bfs(): nodos alcanzables ordenados por nivel (dentro de un nivel, por índice)
+    niveles, _, _ = bfs_por_niveles(ady, ady.grafo_csr.indices[inicio], modo=modo)
+    alcanzados = np.flatnonzero(niveles >= 0)
+    orden = alcanzados[np.argsort(niveles[alcanzados], kind='stable')]
+    return [ady.grafo_csr.nombres[i] for i in orden]
+
+
+def busqueda_en_grafos_vectorizada(ady, inicio, objetivo, modo='auto'):
+    # Como busqueda_en_grafos(): camino con el menor número de aristas, o None
+    origen, destino = ady.grafo_csr.indices[inicio], ady.grafo_csr.indices[objetivo]
+    niveles, padres, _ = bfs_por_niveles(ady, origen, destino, modo=modo)
+    if niveles[destino] < 0:
+        return None
+    return csr.reconstruir_camino(ady.grafo_csr, padres, destino)
+
+
+# =================== Ejemplo de uso ===================
+if __name__ == "__main__":
+    grafo = {
+        'A': ['B', 'C'],
+        'B': ['A', 'D', 'E'],
+        'C': ['A', 'F'],
+        'D': ['B'],
+        'E': ['B', 'F'],
+        'F': ['C', 'E']
+    }
+    ady = AdyacenciaNumPy(csr.construir_grafo_csr(grafo))
+    print("Orden por niveles:", bfs_vectorizado(ady, 'A'))
+    print("Camino encontrado:", busqueda_en_grafos_vectorizada(ady, 'A', 'F'))
+
+    # Grafo aleatorio de diámetro pequeño: 200.000 nodos y 2.000.000 de aristas
+    n, m = 200_000, 2_000_000
+    generador = np.random.default_rng(0)
+    origenes = np.sort(generador.integers(0, n, m))
+    destinos = generador.integers(0, n, m)
+    desplazamientos = np.zeros(n + 1, dtype=np.int64)
+    np.add.at(desplazamientos, origenes + 1, 1)
+    desplazamientos = np.cumsum(desplazamientos)
+    grande = csr.GrafoCSR(list(range(n)), array('q', desplazamientos.tobytes()),
+                          array('i', destinos.astype(np.int32).tobytes()))
+    ady_grande = AdyacenciaNumPy(grande)
+
+    for modo in ('top-down', 'bottom-up', 'auto'):
+        t = time.perf_counter()
+        niveles, _, direcciones = bfs_por_niveles(ady_grande, 0, modo=modo)
+        print(f"\n{modo}: {time.perf_counter() - t:.3f} s, "
+              f"{int((niveles >= 0).sum())} nodos alcanzados en {len(direcciones)} niveles")
+        if modo == 'auto':
+            print("Direcciones por nivel:", direcciones)
+
+    t = time.perf_counter()
+    orden = csr.bfs_csr(grande, 0)
+    print(f"\nbfs_csr nodo a nodo: {time.perf_counter() - t:.3f} s, {len(orden)} nodos")
+
+#Orden por niveles: ['A', 'B', 'C', 'D', 'E', 'F']
+#Camino encontrado: ['A', 'C', 'F']
@@ -0,0 +1,315 @@
+"""
+Prácticas de Inteligencia Artificial
+Formato binario de grafos para abrir con mmap (carga casi instantánea)
+"""
+import bisect
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import time
+from array import array
+from collections.abc import Mapping
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ not in sys.path:
+    sys.path.insert(0, RAIZ)
+from comunes import cargar_script
+
+
+csr = cargar_script("Busqueda No Informada/0009_Grafo_CSR.py")
+
+# =================== Formato del archivo ===================
+# Cabecera (little-endian), seguida de las secciones alineadas a 8 bytes:
+#   firma 8s, versión I, banderas I, n Q, m Q,
+#   posición de: desplazamientos, vecinos, pesos, heurística, índice de nombres,
+#                nombres (UTF-8), orden alfabético de nombres        (7 x Q)
+#   desplazamientos  int64[n + 1]
+#   vecinos          int32[m] (int64 si n >= 2**31)
+#   pesos            int64[m] o float64[m]       (si PONDERADO)
+#   heurística       int64[n] o float64[n]       (si HEURISTICA)
+#   índice nombres   int64[n + 1]  posiciones de cada nombre dentro del bloque UTF-8
+#   nombres          bytes UTF-8 concatenados
+#   orden            int64[n]  índices ordenados por nombre (búsqueda binaria sin diccionario)
+FIRMA = b"GRAFOCSR"
+VERSION = 1
+CABECERA = struct.Struct("<8sIIQQ7Q")
+
+PONDERADO = 1
+PESOS_ENTEROS = 2
+HEURISTICA = 4
+HEURISTICA_ENTERA = 8
+VECINOS_64 = 16
+NOMBRES_ENTEROS = 32
+
+
+def _alinear(archivo):
+    relleno = -archivo.tell() % 8
+    archivo.write(b"\0" * relleno)
+    return archivo.tell()
+
+
+def guardar_grafo(ruta, grafo, heuristicas=None):
+    """
+    Escribe un grafo (diccionario de las prácticas o GrafoCSR) y, si se da,
+    su diccionario de heurísticas. Los nombres de nodo deben ser todos str o todos
+    int (el archivo guarda su texto y al leerlo sólo sabe convertirlo de vuelta a
+    uno de los dos tipos); si no, se lanza TypeError.
+    """
+    grafo_csr = grafo if isinstance(grafo, csr.GrafoCSR) else csr.construir_grafo_csr(grafo)
+    n, m = len(grafo_csr), grafo_csr.num_aristas()
+    nombres = grafo_csr.nombres
+
+    banderas = 0
+    tipos = {type(nombre) for nombre in nombres}
+    if tipos == {int}:
+        banderas |= NOMBRES_ENTEROS
+    elif tipos - {str}:
+        raise TypeError("los nombres de nodo deben ser todos str o todos int, no "
+                        + ", ".join(sorted(tipo.__name__ for tipo in tipos)))
+    vecinos = grafo_csr.vecinos
+    if csr.codigo_tipo(vecinos) != 'i':
+        banderas |= VECINOS_64
+        vecinos = array('q', vecinos)
+    pesos = None
+    if grafo_csr.ponderado():
+        banderas |= PONDERADO
+        enteros = csr.codigo_tipo(grafo_csr.pesos) in 'qil'
+        banderas |= PESOS_ENTEROS if enteros else 0
+        pesos = array('q' if enteros else 'd', grafo_csr.pesos)
+    columna_h = None
+    if heuristicas is not None:
+        valores = [heuristicas.get(nombre, 0) for nombre in nombres]
+        enteros = all(isinstance(h, int) for h in valores)
+        banderas |= HEURISTICA | (HEURISTICA_ENTERA if enteros else 0)
+        columna_h = array('q' if enteros else 'd', valores)
+
+    codificados = [str(nombre).encode("utf-8") for nombre in nombres]
+    indice_nombres = array('q', [0])
+    for nombre in codificados:
+        indice_nombres.append(indice_nombres[-1] + len(nombre))
+    orden = array('q', sorted(range(n), key=nombres.__getitem__))
+
+    posiciones = [0] * 7
+    with open(ruta, "wb") as archivo:
+        archivo.write(b"\0" * CABECERA.size)
+        secciones = [array('q', grafo_csr.desplazamientos), vecinos, pesos, columna_h,
+                     indice_nombres, b"".join(codificados), orden]
+        for i, seccion in enumerate(secciones):
+            if seccion is None:
+                continue
+            posiciones[i] = _alinear(archivo)
+            archivo.write(seccion if isinstance(seccion, bytes) else seccion.tobytes())
+        archivo.seek(0)
+        archivo.write(CABECERA.pack(FIRMA, VERSION, banderas, n, m, *posiciones))
+
+
+# =================== Lectura con mmap ===================
+class _TablaNombres:
+    # Secuencia de nombres que se decodifican del archivo sólo cuando se piden
+    def __init__(self, indice, bloque, enteros):
+        self.indice, self.bloque, self.enteros = indice, bloque, enteros
+
+    def __len__(self):
+        return len(self.indice) - 1
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        texto = str(self.bloque[self.indice[i]:self.indice[i + 1]], "utf-8")
+        return int(texto) if self.enteros else texto
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+
+class _Indices(Mapping):
+    # nombre -> índice por búsqueda binaria sobre la sección 'orden' (sin diccionario en memoria)
+    def __init__(self, nombres, orden):
+        self.nombres, self.orden = nombres, orden
+
+    def __getitem__(self, nombre):
+        posicion = bisect.bisect_left(self.orden, nombre, key=self.nombres.__getitem__)
+        if posicion < len(self.orden) and self.nombres[self.orden[posicion]] == nombre:
+            return self.orden[posicion]
+        raise KeyError(nombre)
+
+    def __iter__(self):
+        return iter(self.nombres)
+
+    def __len__(self):
+        return len(self.nombres)
+
+
+class GrafoEnDisco(csr.GrafoCSR):
+    """
+    Grafo CSR cuyos arreglos son vistas sobre el archivo mapeado en memoria:
+    abrirlo no lee las aristas, y varios procesos que abran el mismo archivo
+    comparten las páginas de la caché del sistema operativo.
+    Sirve directamente para las funciones *_csr de 0009_Grafo_CSR.py, y sus
+    vistas adyacencia / adyacencia_con_costos / heuristicas se comportan como
+    los diccionarios que esperan bfs, busqueda_costo_uniforme y busqueda_a_estrella.
+    """
+
+    def __init__(self, ruta):
+        self._archivo = open(ruta, "rb")
+        self._mapa = mmap.mmap(self._archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        firma, version, banderas, n, m, *posiciones = CABECERA.unpack_from(self._mapa, 0)
+        if firma != FIRMA or version != VERSION:
+            raise ValueError(f"{ruta} no es un grafo en formato {FIRMA.decode()} v{VERSION}")
+        self.banderas = banderas
+        vista = memoryview(self._mapa)
+
+        def seccion(posicion, tipo, cantidad):
+            tamano = struct.calcsize(tipo) * cantidad
+            return vista[posicion:posicion + tamano].cast(tipo)
+
+        p_desp, p_vec, p_pesos, p_h, p_indice, p_nombres, p_orden = posiciones
+        self.desplazamientos = seccion(p_desp, 'q', n + 1)
+        self.vecinos = seccion(p_vec, 'q' if banderas & VECINOS_64 else 'i', m)
+        self.pesos = None
+        if banderas & PONDERADO:
+            self.pesos = seccion(p_pesos, 'q' if banderas & PESOS_ENTEROS else 'd', m)
+        self.columna_heuristica = None
+        if banderas & HEURISTICA:
+            self.columna_heuristica = seccion(p_h, 'q' if banderas & HEURISTICA_ENTERA else 'd', n)
+        indice_nombres = seccion(p_indice, 'q', n + 1)
+        bloque = vista[p_nombres:p_nombres + indice_nombres[n]]
+        self.nombres = _TablaNombres(indice_nombres, bloque, bool(banderas & NOMBRES_ENTEROS))
+        self.indices = _Indices(self.nombres, seccion(p_orden, 'q', n))
+        self._traspuesto = None
+        self._vistas = [self.desplazamientos, self.vecinos, self.pesos, self.columna_heuristica,
+                        indice_nombres, bloque, self.indices.orden, vista]
+
+        self.adyacencia = _VistaAdyacencia(self, con_costos=False)
+        self.adyacencia_con_costos = _VistaAdyacencia(self, con_costos=True)
+        self.heuristicas = _VistaHeuristicas(self) if self.columna_heuristica is not None else None
+
+    def cerrar(self):
+        self._traspuesto = None
+        for vista in reversed(self._vistas):
+            if vista is not None:
+                vista.release()
+        self._mapa.close()
+        self._archivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
+
+
+class _VistaAdyacencia(Mapping):
+    # Se comporta como {'A': ['B', 'C']} o {'A': [('B', 1), ('C', 4)]} leyendo del archivo
+    def __init__(self, grafo, con_costos):
+        self.grafo, self.con_costos = grafo, con_costos
+
+    def __getitem__(self, nombre):
+        g = self.grafo
+        i = g.indices[nombre]
+        if self.con_costos:
+            return [(g.nombres[g.vecinos[k]], g.pesos[k] if g.pesos is not None else 1)
+                    for k in g.aristas(i)]
+        return [g.nombres[g.vecinos[k]] for k in g.aristas(i)]
+
+    def __iter__(self):
+        return iter(self.grafo.nombres)
+
+    def __len__(self):
+        return len(self.grafo)
+
+
+class _VistaHeuristicas(Mapping):
+    def __init__(self, grafo):
+        self.grafo = grafo
+
+    def __getitem__(self, nombre):
+        return self.grafo.columna_heuristica[self.grafo.indices[nombre]]
+
+    def __iter__(self):
+        return iter(self.grafo.nombres)
+
+    def __len__(self):
+        return len(self.grafo)
+
+
+# =================== Ejemplo de uso ===================
+if __name__ == "__main__":
+    bfs = cargar_script("Busqueda No Informada/0002_Busqueda_Anchura.py").bfs
+    busqueda_costo_uniforme = cargar_script("Busqueda No Informada/0003_Busqueda_Anchura_Costo_Uniforme.py"
+                                            ).busqueda_costo_uniforme
+    busqueda_a_estrella = cargar_script("Busqueda Informada/0003_Busqueda_A y AO.py").busqueda_a_estrella
+    vectorizado = cargar_script("Busqueda No Informada/0012_BFS_Vectorizado.py")
+
+    grafo_con_costos = {
+        'A': [('B', 1), ('C', 4)],
+        'B': [('D', 2), ('E', 5)],
+        'C': [('F', 1)],
+        'D': [],
+        'E': [('F', 1)],
+        'F': []
+    }
+    heuristicas = {'A': 6, 'B': 4, 'C': 4, 'D': 2, 'E': 1, 'F': 0}
+
+    carpeta = tempfile.mkdtemp()
+    ruta = os.path.join(carpeta, "ejemplo.grafo")
+    guardar_grafo(ruta, grafo_con_costos, heuristicas)
+
+    with GrafoEnDisco(ruta) as grafo:
+        print("Orden de visita:", bfs(grafo.adyacencia, 'A'))
+        print("Costo uniforme:", busqueda_costo_uniforme(grafo.adyacencia_con_costos, 'A', 'F'))
+        print("A*:", busqueda_a_estrella(grafo.adyacencia_con_costos, grafo.heuristicas, 'A', 'F'))
+        print("Costo uniforme CSR:", csr.busqueda_costo_uniforme_csr(grafo, 'A', 'F'))
+        print("Bidireccional CSR:", csr.busqueda_bidireccional_csr(grafo, 'A', 'F'))
+
+    # Sólo se admiten nombres todos str o todos int
+    for nombres_malos in ({'A': [1], 1: []}, {(0, 0): [(0, 1)], (0, 1): []}):
+        try:
+            guardar_grafo(os.path.join(carpeta, "malo.grafo"), nombres_malos)
+        except TypeError as error:
+            print("Rechazado:", error)
+
+    # Cuadrícula de 500 x 500: cargar el archivo frente a reconstruir el diccionario
+    lado = 500
+    rejilla = {}
+    for f in range(lado):
+        for c in range(lado):
+            rejilla[f * lado + c] = [((f + df) * lado + c + dc, 1)
+                                     for df, dc in ((1, 0), (0, 1), (-1, 0), (0, -1))
+                                     if 0 <= f + df < lado and 0 <= c + dc < lado]
+    ruta = os.path.join(carpeta, "rejilla.grafo")
+    guardar_grafo(ruta, rejilla)
+
+    t = time.perf_counter()
+    with GrafoEnDisco(ruta) as grafo:
+        apertura = time.perf_counter() - t
+        print(f"\n{grafo}: abierto en {apertura * 1000:.2f} ms "
+              f"({os.path.getsize(ruta) / 2 ** 20:.1f} MiB en disco)")
+        t = time.perf_counter()
+        camino, costo = csr.busqueda_costo_uniforme_csr(grafo, 0, lado * lado - 1)
+        print(f"Costo uniforme CSR sobre el archivo: costo {costo} en {time.perf_counter() - t:.2f} s")
+        # Los arreglos NumPy son vistas del archivo: hay que soltarlos antes de cerrarlo
+        ady = vectorizado.AdyacenciaNumPy(grafo)
+        t = time.perf_counter()
+        camino = vectorizado.busqueda_en_grafos_vectorizada(ady, 0, lado * lado - 1)
+        print(f"BFS vectorizado sobre el archivo: {len(camino) - 1} aristas "
+              f"en {time.perf_counter() - t:.2f} s")
+        del ady
+
+    for nombre in os.listdir(carpeta):
+        os.remove(os.path.join(carpeta, nombre))
+    os.rmdir(carpeta)
+
+#Orden de visita: ['A', 'B', 'C', 'D', 'E', 'F']
+#Costo uniforme: (['A', 'C', 'F'], 5)
+#A*: (['A', 'B', 'E', 'F'], 7)
+#Costo uniforme CSR: (['A', 'C', 'F'], 5)
+#Bidireccional CSR: ['A', 'C', 'F']
+#Rechazado: los nombres de nodo deben ser todos str o todos int, no int, str
+#Rechazado: los nombres de nodo deben ser todos str o todos int, no tuple
+#
+#GrafoCSR(250000 nodos, 998000 aristas): abierto en 0.27 ms (18.5 MiB en disco)
+#Costo uniforme CSR sobre el archivo: costo 998 en 0.65 s
+#BFS vectorizado sobre el archivo: 998 aristas en 0.09 s
@@ -3,33 +3,170 @@ Prácticas de Inteligencia Artificial
 Propagación de Restricciones: Algoritmo AC-3 
 """
 
+import time
 from collections import deque
 
-# Revisa si un arco (X, Y) es consistente y modifica el dominio si es necesario
-def revisar(arco, dominios, restricciones):
-    x, y = arco
-    revisado = False
-    for val_x in dominios[x][:]:
-        # Si no hay ningún valor en y que satisfaga la restricción, se elimina val_x
-        if not any(restricciones[(x, y)](val_x, val_y) for val_y in dominios[y]):
-            dominios[x].remove(val_x)
-            revisado = True
-    return revisado
-
-# Algoritmo AC-3
-def ac3(variables, dominios, restricciones):
-    cola = deque(restricciones.keys())
-
-    while cola:
-        arco = cola.popleft()
-        if revisar(arco, dominios, restricciones):
-            if not dominios[arco[0]]:
-                return False  # Dominio vacío → inconsistencia
-            # Se vuelven a añadir arcos relacionados con la variable modificada
-            for vecino in variables:
-                if vecino != arco[0] and (vecino, arco[0]) in restricciones:
-                    cola.append((vecino, arco[0]))
-    return True
+class MotorAC:
+    """
+    Propagación de arcos con:
+    - índice de arcos entrantes: al cambiar el dominio de X sólo se vuelven a
+      encolar los arcos (Z, X), sin recorrer todas las variables
+    - marca por arco de "ya está en la cola", para no encolarlo dos veces
+    - soportes residuales de AC-2001: para cada (arco, valor de X) se guarda la
+      posición del último soporte encontrado en Y. Si ese valor sigue en el
+      dominio no hay que comprobar nada; si no, se sigue buscando desde ahí
+      (los anteriores ya se descartaron). Con residuos=False se busca desde el
+      principio cada vez, como en AC-3.
+    - contadores de comprobaciones de restricciones, revisiones y podas
+    Los dominios se guardan como conjuntos junto con el orden original, y cada
+    cambio se anota en un rastro para poder deshacerlo en la búsqueda con MAC,
+    con una etiqueta explícita porque los nombres de variable pueden ser tuplas:
+    ('poda', var, valor) o ('soporte', (arco, valor_x), posición anterior o None).
+    """
+
+    def __init__(self, variables, dominios, restricciones, residuos=True):
+        self.variables = variables
+        self.orden = {var: list(dominios[var]) for var in variables}
+        self.presentes = {var: set(dominios[var]) for var in variables}
+        self.arcos = list(restricciones)
+        self.pruebas = [restricciones[arco] for arco in self.arcos]
+        self.entrantes = {var: [] for var in variables}
+        for indice, (x, y) in enumerate(self.arcos):
+            if x != y:
+                self.entrantes[y].append(indice)
+        self.residuos = residuos
+        self.ultimo = {}
+        self.rastro = []
+        self.estadisticas = {'comprobaciones': 0, 'revisiones': 0, 'podas': 0}
+
+    def dominio(self, var):
+        # Valores que quedan, en el orden original
+        presentes = self.presentes[var]
+        return [val for val in self.orden[var] if val in presentes]
+
+    # Revisa si un arco (X, Y) es consistente y poda el dominio de X si es necesario
+    def revisar(self, indice):
+        x, y = self.arcos[indice]
+        prueba = self.pruebas[indice]
+        orden_y, presentes_y = self.orden[y], self.presentes[y]
+        presentes_x = self.presentes[x]
+        revisado = False
+        self.estadisticas['revisiones'] += 1
+        for val_x in self.dominio(x):
+            clave = (indice, val_x)
+            desde = 0
+            if self.residuos and clave in self.ultimo:
+                desde = self.ultimo[clave]
+                if orden_y[desde] in presentes_y:
+                    continue  # el último soporte sigue en pie
+                desde += 1
+            for posicion in range(desde, len(orden_y)):
+                val_y = orden_y[posicion]
+                if val_y in presentes_y:
+                    self.estadisticas['comprobaciones'] += 1
+                    if prueba(val_x, val_y):
+                        if self.residuos:
+                            self.rastro.append(('soporte', clave, self.ultimo.get(clave)))
+                            self.ultimo[clave] = posicion
+                        break
+            else:
+                # Si no hay ningún valor en y que satisfaga la restricción, se elimina val_x
+                presentes_x.discard(val_x)
+                self.rastro.append(('poda', x, val_x))
+                self.estadisticas['podas'] += 1
+                revisado = True
+        return revisado
+
+    def propagar(self, arcos=None):
+        """
+        AC-3 con los arcos indicados (por defecto todos). Devuelve False si
+        algún dominio queda vacío.
+        """
+        if arcos is None:
+            arcos = range(len(self.arcos))
+        en_cola = [False] * len(self.arcos)
+        cola = deque()
+        for indice in arcos:
+            if not en_cola[indice]:
+                en_cola[indice] = True
+                cola.append(indice)
+
+        while cola:
+            indice = cola.popleft()
+            en_cola[indice] = False
+            if self.revisar(indice):
+                x = self.arcos[indice][0]
+                if not self.presentes[x]:
+                    return False  # Dominio vacío → inconsistencia
+                # Se vuelven a añadir los arcos que llegan a la variable modificada
+                # ((Y, X) también: puede ser una restricción distinta de (X, Y))
+                for entrante in self.entrantes[x]:
+                    if not en_cola[entrante]:
+                        en_cola[entrante] = True
+                        cola.append(entrante)
+        return True
+
+    def asignar(self, var, valor):
+        # Reduce el dominio de var a un valor (anotado en el rastro) y propaga
+        for otro in self.dominio(var):
+            if otro != valor:
+                self.presentes[var].discard(otro)
+                self.rastro.append(('poda', var, otro))
+        return self.propagar(self.entrantes[var])
+
+    def deshacer(self, marca):
+        # Restaura valores podados y soportes movidos hasta la marca del rastro
+        while len(self.rastro) > marca:
+            tipo, clave, valor = self.rastro.pop()
+            if tipo == 'poda':
+                self.presentes[clave].add(valor)
+            elif valor is None:
+                del self.ultimo[clave]
+            else:
+                self.ultimo[clave] = valor
+
+# Algoritmo AC-3 (con índice de arcos y soportes residuales)
+def ac3(variables, dominios, restricciones, estadisticas=None, residuos=True):
+    motor = MotorAC(variables, dominios, restricciones, residuos)
+    consistente = motor.propagar()
+    for var in variables:
+        dominios[var][:] = motor.dominio(var)
+    if estadisticas is not None:
+        estadisticas.update(motor.estadisticas)
+    return consistente
+
+# Vuelta atrás manteniendo la consistencia de arcos (MAC)
+def mac(variables, dominios, restricciones, estadisticas=None, residuos=True):
+    """
+    Después de cada asignación se propaga AC-3 desde los arcos que llegan a
+    la variable asignada; si algún dominio se vacía se retrocede deshaciendo
+    el rastro. Variable con MRV (menos valores restantes).
+    """
+    motor = MotorAC(variables, dominios, restricciones, residuos)
+    motor.estadisticas['nodos'] = 0
+    asignacion = {}
+
+    def buscar():
+        if len(asignacion) == len(variables):
+            return dict(asignacion)
+        var = min((v for v in variables if v not in asignacion),
+                  key=lambda v: len(motor.presentes[v]))
+        for valor in motor.dominio(var):
+            motor.estadisticas['nodos'] += 1
+            marca = len(motor.rastro)
+            asignacion[var] = valor
+            if motor.asignar(var, valor):
+                resultado = buscar()
+                if resultado:
+                    return resultado
+            del asignacion[var]
+            motor.deshacer(marca)
+        return None
+
+    resultado = buscar() if motor.propagar() else None
+    if estadisticas is not None:
+        estadisticas.update(motor.estadisticas)
+    return resultado
 
 # ================== Definición del problema ==================
 
@@ -60,3 +197,38 @@ if exito:
         print(f"{var} → dominio reducido: {dominios[var]}")
 else:
     print("No hay solución posible (dominio vacío)")
+
+# ================== MAC en N-reinas ==================
+# Restricciones en ambos sentidos, como arriba. Se comparan las comprobaciones
+# de restricciones con soportes residuales (AC-2001) y sin ellos (AC-3)
+n = 24
+reinas = list(range(n))
+restricciones_reinas = {(i, j): (lambda a, b, d=abs(j - i): a != b and abs(a - b) != d)
+                        for i in reinas for j in reinas if i != j}
+for residuos in (False, True):
+    estadisticas = {}
+    inicio = time.perf_counter()
+    solucion = mac(reinas, {fila: list(range(n)) for fila in reinas}, restricciones_reinas,
+                   estadisticas, residuos)
+    print(f"\nMAC, {n} reinas, {'AC-2001' if residuos else 'AC-3'}: "
+          f"{time.perf_counter() - inicio:.2f} s")
+    print(f"  {estadisticas['nodos']} nodos, {estadisticas['revisiones']} revisiones, "
+          f"{estadisticas['comprobaciones']} comprobaciones, {estadisticas['podas']} podas")
+print(f"Solución: {[solucion[fila] for fila in reinas]}")
+
+# ================== Variables con nombres de tupla ==================
+# Casillas de una cuadrícula 3x3 con sus vecinas distintas (colorear con 3 colores)
+casillas = [(f, c) for f in range(3) for c in range(3)]
+distintas = {(a, b): (lambda x, y: x != y) for a in casillas for b in casillas
+             if abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1}
+colores = mac(casillas, {casilla: [0, 1, 2] for casilla in casillas}, distintas)
+assert colores is not None and all(colores[a] != colores[b] for a, b in distintas)
+print(f"\nCuadrícula 3x3 con 3 colores: {[[colores[(f, c)] for c in range(3)] for f in range(3)]}")
+
+#===== Propagación de Restricciones (AC-3) =====
+#X → dominio reducido: [1, 2, 3]
+#Y → dominio reducido: [1, 2, 3]
+#Z → dominio reducido: [1, 2, 3]
+#MAC, 24 reinas: 30 nodos y 7502 revisiones en los dos casos, 81430 comprobaciones
+#con AC-3 y 36223 con AC-2001: el último soporte suele seguir en el dominio.
+#Cuadrícula 3x3 con 3 colores: [[0, 1, 0], [1, 0, 1], [0, 1, 0]]
@@ -2,74 +2,137 @@
 Prácticas de Inteligencia Artificial
 Propagación de Restricciones: Salto Atrás Dirigido por Conflictos
 """
+import os
+import random
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ not in sys.path:
+    sys.path.insert(0, RAIZ)
+from comunes import cargar_script
+
+
 class ConflictDirectedBacktracking:
-    def __init__(self, variables, dominios, restricciones):
+    def __init__(self, variables, dominios, restricciones, aprender=True, max_nogood=None):
+        """
+        Salto atrás dirigido por conflictos (CBJ) con orden estático de variables.
+        - aprender: guardar nogoods (combinaciones de asignaciones sin solución)
+        - max_nogood: tamaño máximo de los nogoods guardados (None = sin límite)
+        Los dominios y las restricciones no se modifican.
+        """
         self.variables = variables
         self.dominios = dominios
         self.restricciones = restricciones
+        self.aprender = aprender
+        self.max_nogood = max_nogood
         self.asignaciones = {}
-        self.conflictos = []
-
-    # Verifica si una asignación es consistente con las restricciones
-    def es_consistente(self, var, valor):
-        for (x, y), restriccion in self.restricciones.items():
-            if x == var and y in self.asignaciones:
-                if not restriccion(valor, self.asignaciones[y]):
-                    return False
-            elif y == var and x in self.asignaciones:
-                if not restriccion(self.asignaciones[x], valor):
-                    return False
-        return True
-
-    # Encuentra el siguiente valor a asignar
-    def selecciona_variable(self):
-        # Elige una variable no asignada
-        for var in self.variables:
-            if var not in self.asignaciones:
-                return var
+        self.posicion = {var: i for i, var in enumerate(variables)}
+        # anteriores[i] = [(h, prueba)] con h < i ordenados: la primera
+        # restricción violada es la de la variable más antigua
+        self.anteriores = [[] for _ in variables]
+        for (x, y), restriccion in restricciones.items():
+            i, h = self.posicion[x], self.posicion[y]
+            if i > h:
+                self.anteriores[i].append((h, restriccion))
+            elif h > i:
+                self.anteriores[h].append((i, lambda valor_y, valor_x, r=restriccion: r(valor_x, valor_y)))
+        for lista in self.anteriores:
+            lista.sort(key=lambda par: par[0])
+        # Almacén de nogoods: (variable, valor) más profunda -> otras asignaciones
+        self.nogoods = {}
+        self.estadisticas = {'nodos': 0, 'comprobaciones': 0, 'saltos': 0,
+                             'nogoods': 0, 'podas_nogood': 0}
+
+    def conflicto(self, i, valor, valores):
+        """
+        Devuelve None si variables[i] = valor es compatible con las asignaciones
+        anteriores, o el conjunto de posiciones culpables del conflicto.
+        """
+        for h, prueba in self.anteriores[i]:
+            self.estadisticas['comprobaciones'] += 1
+            if not prueba(valor, valores[h]):
+                return {h}
+        for otras in self.nogoods.get((self.variables[i], valor), ()):
+            if all(valores[self.posicion[var]] == val for var, val in otras):
+                self.estadisticas['podas_nogood'] += 1
+                return {self.posicion[var] for var, _ in otras}
         return None
 
-    # Realiza el salto atrás inteligente
-    def salta_atras(self):
-        if self.conflictos:
-            variable_conflictiva, valor_conflictivo = self.conflictos.pop()
-            print(f"Conflicto encontrado en la asignación de {variable_conflictiva} = {valor_conflictivo}")
-            self.asignaciones.pop(variable_conflictiva, None)  # Eliminar la asignación conflictiva
-            self.dominios[variable_conflictiva].remove(valor_conflictivo)  # Eliminar el valor conflictivo
-            return True
-        return False
+    # Guarda que las asignaciones de las posiciones culpables no tienen solución
+    def aprender_nogood(self, culpables, valores):
+        if not self.aprender or (self.max_nogood is not None and len(culpables) > self.max_nogood):
+            return
+        h = max(culpables)
+        otras = frozenset((self.variables[k], valores[k]) for k in culpables if k != h)
+        # Un dict como conjunto ordenado: se revisan en el orden en que se aprendieron
+        lista = self.nogoods.setdefault((self.variables[h], valores[h]), {})
+        if otras not in lista:
+            lista[otras] = True
+            self.estadisticas['nogoods'] += 1
 
     # Resolución del CSP con Salto Atrás Dirigido por Conflictos
     def resolver(self):
-        if len(self.asignaciones) == len(self.variables):
-            return self.asignaciones  # Se ha encontrado una solución
-        
-        # Selecciona la siguiente variable para asignar
-        variable = self.selecciona_variable()
-
-        if variable is None:
-            return None  # No hay más variables por asignar
-
-        # Recorre los valores posibles en el dominio de la variable
-        for valor in self.dominios[variable]:
-            if self.es_consistente(variable, valor):
-                # Asigna el valor a la variable y realiza la asignación
-                self.asignaciones[variable] = valor
-
-                # Verifica el estado actual
-                resultado = self.resolver()
-                if resultado:
-                    return resultado
-
-                # Si ocurre un conflicto, realiza un salto atrás dirigido
-                if not self.salta_atras():
-                    continue  # Si no hay más conflictos, sigue con el siguiente valor
-
-                # Si no se puede resolver con los valores actuales, vuelve a intentar con el siguiente valor
-                self.asignaciones.pop(variable, None)
-                self.conflictos.append((variable, valor))  # Guarda el conflicto para retroceder
-                self.dominios[variable].remove(valor)
-        return None
+        """
+        Cada variable acumula su conjunto de conflicto: las posiciones de las
+        variables anteriores que le quitaron algún valor. Cuando se le acaban
+        los valores se salta directamente a la más profunda de ellas (h), que
+        hereda el resto del conjunto, y se deshacen todas las asignaciones
+        intermedias: ninguna de ellas causó el fallo.
+        """
+        n = len(self.variables)
+        valores = [None] * n
+        siguiente = [0] * n  # próximo índice del dominio a probar
+        conflictos = [set() for _ in range(n)]
+        i = 0
+        while i < n:
+            dominio = self.dominios[self.variables[i]]
+            while siguiente[i] < len(dominio):
+                valor = dominio[siguiente[i]]
+                siguiente[i] += 1
+                self.estadisticas['nodos'] += 1
+                culpables = self.conflicto(i, valor, valores)
+                if culpables is None:
+                    valores[i] = valor
+                    break
+                conflictos[i] |= culpables
+            else:
+                # Sin valores: salto atrás a la variable culpable más profunda
+                if not conflictos[i]:
+                    return None  # nadie es culpable: el problema no tiene solución
+                h = max(conflictos[i])
+                self.aprender_nogood(conflictos[i], valores)
+                conflictos[h] |= conflictos[i] - {h}
+                if h < i - 1:
+                    self.estadisticas['saltos'] += 1
+                for k in range(h + 1, i + 1):
+                    valores[k] = None
+                    siguiente[k] = 0
+                    conflictos[k] = set()
+                valores[h] = None
+                i = h
+                continue
+            i += 1
+        self.asignaciones = {var: valores[k] for k, var in enumerate(self.variables)}
+        return self.asignaciones
+
+
+# Problema binario aleatorio (modelo B): n variables con d valores, una fracción
+# 'densidad' de los pares restringidos y en cada uno una fracción 'dureza' de
+# pares de valores prohibidos
+def csp_aleatorio(n, d, densidad, dureza, rng):
+    variables = [f"V{i}" for i in range(n)]
+    dominios = {var: list(range(d)) for var in variables}
+    restricciones = {}
+    pares = [(a, b) for a in range(d) for b in range(d)]
+    for i in range(n):
+        for j in range(i + 1, n):
+            if rng.random() < densidad:
+                prohibidos = frozenset(rng.sample(pares, round(dureza * d * d)))
+                restricciones[(variables[i], variables[j])] = \
+                    lambda a, b, p=prohibidos: (a, b) not in p
+    return variables, dominios, restricciones
+
 
 # ================== Definición del problema ==================
 
@@ -102,3 +165,39 @@ if solucion:
         print(f"{var} = {valor}")
 else:
     print("No se pudo encontrar una solución")
+
+# ================== Comparación en la transición de fase ==================
+# CSP aleatorios de 16 variables y 5 valores: con dureza ~0.42 la mitad tiene
+# solución y la otra mitad no, y ahí están los problemas más difíciles
+backtracking = cargar_script("Satisfacción de Restricciones/0002_Vuelta_Atras.py").backtracking
+generador = random.Random(0)
+print(f"\n{'dureza':>7}{'con sol.':>9}{'vuelta atrás':>14}{'CBJ':>12}{'CBJ + nogoods':>35}")
+for dureza in (0.3, 0.4, 0.45, 0.5):
+    tiempos = [0.0, 0.0, 0.0]
+    nodos = [0, 0]
+    nogoods = 0
+    con_solucion = 0
+    for _ in range(10):
+        problema = csp_aleatorio(16, 5, 0.35, dureza, generador)
+        inicio = time.perf_counter()
+        solucion = backtracking({}, *problema)
+        tiempos[0] += time.perf_counter() - inicio
+        con_solucion += solucion is not None
+        for k, aprender in enumerate((False, True)):
+            solver = ConflictDirectedBacktracking(*problema, aprender=aprender)
+            inicio = time.perf_counter()
+            assert (solver.resolver() is None) == (solucion is None)
+            tiempos[k + 1] += time.perf_counter() - inicio
+            nodos[k] += solver.estadisticas['nodos']
+            nogoods += solver.estadisticas['nogoods']
+    print(f"{dureza:>7}{con_solucion:>9}{tiempos[0]:>12.2f} s"
+          f"{tiempos[1]:>8.2f} s {nodos[0]:>7} nod.{tiempos[2]:>8.2f} s {nodos[1]:>7} nod. "
+          f"({nogoods} nogoods)")
+
+#===== Resultado Final =====
+#X = 1
+#Y = 2
+#Z = 3
+#En la transición de fase la vuelta atrás cronológica repite el mismo fallo en cada
+#rama de las variables intermedias; CBJ salta directo a la culpable y es un orden de
+#magnitud más rápido. Los nogoods ahorran nodos, a cambio de revisarlos en cada valor.
@@ -4,48 +4,119 @@ Búsqueda Local: Mínimos-Conflictos
 """
 
 import random
+import time
+
+import numpy as np
+
+class _ConjuntoAleatorio:
+    """
+    Conjunto con inserción, borrado y elección al azar en O(1): una lista con
+    los elementos y un diccionario con la posición de cada uno (para borrar se
+    mueve el último a su lugar).
+    """
+    def __init__(self):
+        self.elementos = []
+        self.posicion = {}
+
+    def agregar(self, elemento):
+        if elemento not in self.posicion:
+            self.posicion[elemento] = len(self.elementos)
+            self.elementos.append(elemento)
+
+    def quitar(self, elemento):
+        indice = self.posicion.pop(elemento, None)
+        if indice is not None:
+            ultimo = self.elementos.pop()
+            if indice < len(self.elementos):
+                self.elementos[indice] = ultimo
+                self.posicion[ultimo] = indice
+
+    def elegir(self, rng):
+        return self.elementos[rng.randrange(len(self.elementos))]
+
+    def __len__(self):
+        return len(self.elementos)
 
 class MinConflicts:
-    def __init__(self, variables, dominios, restricciones, max_iter=100):
+    def __init__(self, variables, dominios, restricciones, max_iter=100, semilla=None, ruido=0.0):
         """
         Inicializa el algoritmo de Mínimos-Conflictos.
         - variables: Lista de las variables del problema.
         - dominios: Diccionario con los dominios de cada variable (posibles valores).
         - restricciones: Diccionario con las restricciones entre variables.
         - max_iter: Número máximo de iteraciones para la búsqueda local.
+        - semilla: semilla del generador aleatorio (None = no reproducible).
+        - ruido: probabilidad de dar a la variable un valor al azar en lugar del
+          de menos conflictos (paso aleatorio para salir de mesetas).
         """
         self.variables = variables
         self.dominios = dominios
         self.restricciones = restricciones
         self.max_iter = max_iter
-        self.asignacion = {var: random.choice(dominio) for var, dominio in dominios.items()}  # Asignación aleatoria
+        self.ruido = ruido
+        self.rng = random.Random(semilla)
+        self.asignacion = {var: self.rng.choice(dominio) for var, dominio in dominios.items()}  # Asignación aleatoria
+
+        # Restricciones indexadas por variable: vecinos[x] = [(y, prueba)] con
+        # prueba(valor_x, valor_y). Cada restricción cuenta como un conflicto,
+        # igual que antes: si están (X, Y) y (Y, X) un choque cuenta dos veces.
+        self.vecinos = {var: [] for var in variables}
+        for (x, y), restriccion in restricciones.items():
+            self.vecinos[x].append((y, restriccion))
+            self.vecinos[y].append((x, lambda valor_y, valor_x, r=restriccion: r(valor_x, valor_y)))
+
+        # Tabla de conflictos: conflictos[x][valor] = restricciones que violaría
+        # x = valor con los valores actuales de sus vecinos
+        self.conflictos = {var: {valor: 0 for valor in dominios[var]} for var in variables}
+        for var in variables:
+            tabla = self.conflictos[var]
+            for otra_variable, prueba in self.vecinos[var]:
+                otro_valor = self.asignacion[otra_variable]
+                for valor in tabla:
+                    if not prueba(valor, otro_valor):
+                        tabla[valor] += 1
+
+        # Variables cuyo valor actual viola alguna restricción
+        self.conflictivas = _ConjuntoAleatorio()
+        for var in variables:
+            if self.contar_conflictos(var, self.asignacion[var]) > 0:
+                self.conflictivas.agregar(var)
 
     def es_consistente(self, variable, valor):
         """
         Verifica si la asignación de un valor a una variable no viola ninguna restricción.
         """
-        for otra_variable, otro_valor in self.asignacion.items():
-            if (variable, otra_variable) in self.restricciones:
-                if not self.restricciones[(variable, otra_variable)](valor, otro_valor):
-                    return False
-            if (otra_variable, variable) in self.restricciones:
-                if not self.restricciones[(otra_variable, variable)](otro_valor, valor):
-                    return False
-        return True
+        return self.contar_conflictos(variable, valor) == 0
 
     def contar_conflictos(self, variable, valor):
         """
-        Cuenta cuántos conflictos tendría una asignación dada a una variable.
+        Cuenta cuántos conflictos tendría una asignación dada a una variable (consulta a la tabla).
         """
-        conflictos = 0
-        for otra_variable, otro_valor in self.asignacion.items():
-            if (variable, otra_variable) in self.restricciones:
-                if not self.restricciones[(variable, otra_variable)](valor, otro_valor):
-                    conflictos += 1
-            if (otra_variable, variable) in self.restricciones:
-                if not self.restricciones[(otra_variable, variable)](otro_valor, valor):
-                    conflictos += 1
-        return conflictos
+        return self.conflictos[variable][valor]
+
+    def asignar(self, variable, valor):
+        """
+        Cambia el valor de una variable y actualiza sólo las filas de la tabla
+        de sus vecinos: O(grado * tamaño del dominio) en lugar de recorrer toda
+        la asignación por cada valor candidato.
+        """
+        anterior = self.asignacion[variable]
+        if valor == anterior:
+            return
+        self.asignacion[variable] = valor
+        for otra_variable, prueba in self.vecinos[variable]:
+            # prueba(valor_variable, valor_otra): se actualizan los valores de la otra variable
+            tabla = self.conflictos[otra_variable]
+            for otro_valor in tabla:
+                tabla[otro_valor] += (not prueba(valor, otro_valor)) - (not prueba(anterior, otro_valor))
+            self._actualizar_conflictiva(otra_variable)
+        self._actualizar_conflictiva(variable)
+
+    def _actualizar_conflictiva(self, variable):
+        if self.conflictos[variable][self.asignacion[variable]] > 0:
+            self.conflictivas.agregar(variable)
+        else:
+            self.conflictivas.quitar(variable)
 
     def resolver(self):
         """
@@ -59,59 +130,157 @@ class MinConflicts:
             # Seleccionamos una variable que tiene conflictos
             variable_conflictiva = self.seleccionar_variable_conflictiva()
 
-            # Si no hay conflictos, continuamos
-            if variable_conflictiva is None:
-                continue
-
-            # Buscamos el valor que minimiza los conflictos
-            valor_min_conflictos = self.minimizar_conflictos(variable_conflictiva)
+            # Buscamos el valor que minimiza los conflictos (o uno al azar con probabilidad ruido)
+            if self.ruido and self.rng.random() < self.ruido:
+                valor_min_conflictos = self.rng.choice(self.dominios[variable_conflictiva])
+            else:
+                valor_min_conflictos = self.minimizar_conflictos(variable_conflictiva)
 
             # Asignamos el valor a la variable
-            self.asignacion[variable_conflictiva] = valor_min_conflictos
+            self.asignar(variable_conflictiva, valor_min_conflictos)
 
-        return None  # No se encontró solución dentro del número máximo de iteraciones
+        return self.asignacion if self.satisface_restricciones() else None
 
     def seleccionar_variable_conflictiva(self):
         """
-        Selecciona la variable con el mayor número de conflictos.
+        Selecciona al azar una de las variables que violan alguna restricción.
         """
-        variable_conflictiva = None
-        max_conflictos = 0
-
-        # Buscamos la variable con el mayor número de conflictos
-        for variable in self.variables:
-            if variable not in self.asignacion:
-                conflictos = sum(1 for otra_variable in self.variables if (variable, otra_variable) in self.restricciones)
-                if conflictos > max_conflictos:
-                    max_conflictos = conflictos
-                    variable_conflictiva = variable
-
-        return variable_conflictiva
+        return self.conflictivas.elegir(self.rng)
 
     def minimizar_conflictos(self, variable):
         """
-        Asigna el valor a la variable que minimiza los conflictos.
+        Devuelve el valor de la variable con menos conflictos (empates al azar).
         """
-        min_conflictos = float('inf')
-        valor_min_conflictos = None
-
-        # Probamos todos los valores en el dominio de la variable
-        for valor in self.dominios[variable]:
-            conflictos = self.contar_conflictos(variable, valor)
-            if conflictos < min_conflictos:
-                min_conflictos = conflictos
-                valor_min_conflictos = valor
-
-        return valor_min_conflictos
+        tabla = self.conflictos[variable]
+        min_conflictos = min(tabla.values())
+        return self.rng.choice([valor for valor, conflictos in tabla.items() if conflictos == min_conflictos])
 
     def satisface_restricciones(self):
         """
         Verifica si la asignación actual satisface todas las restricciones.
         """
-        for (var1, var2), restr in self.restricciones.items():
-            if not restr(self.asignacion.get(var1), self.asignacion.get(var2)):
-                return False
-        return True
+        return len(self.conflictivas) == 0
+
+
+class MinConflictosReinas:
+    """
+    Mínimos-conflictos especializado en N-reinas (reina[fila] = columna).
+    Las columnas forman siempre una permutación, así que sólo pueden chocar
+    las diagonales y un movimiento intercambia las columnas de dos filas
+    (Sosic y Gu). En lugar de una tabla n x n se cuentan las reinas de cada
+    diagonal: los conflictos de la fila r son diagonales[r + c] +
+    antidiagonales[r - c + n - 1] - 2, y probar o deshacer un intercambio
+    cuesta O(1).
+    - Inicio voraz: cada fila prueba hasta 'intentos' columnas libres al azar
+      (al menos 1: la última probada es la que se queda)
+    - completo: hasta este n la fila conflictiva prueba a intercambiarse con
+      todas las demás; por encima sólo con 'intentos' filas al azar
+    - ruido: probabilidad de hacer un intercambio al azar cuando ninguno mejora
+    - Las filas en conflicto se recalculan (vectorizado) sólo cuando se acaban
+      las pendientes
+    """
+
+    def __init__(self, n, max_iter=100000, intentos=128, completo=1000, ruido=0.2, semilla=None):
+        if intentos < 1:
+            raise ValueError(f"intentos debe ser al menos 1 (intentos={intentos})")
+        self.n = n
+        self.max_iter = max_iter
+        self.intentos = intentos
+        self.completo = completo
+        self.ruido = ruido
+        self.rng = random.Random(semilla)
+        self.diagonales = [0] * (2 * n - 1)
+        self.antidiagonales = [0] * (2 * n - 1)
+        self.reina = list(range(n))
+        reina, diagonales, antidiagonales = self.reina, self.diagonales, self.antidiagonales
+        aleatorio = self.rng.random
+        for fila in range(n):
+            # Las columnas libres son reina[fila:]; se queda la primera sin conflictos
+            libres = n - fila
+            for _ in range(intentos):
+                k = fila + int(aleatorio() * libres)
+                c = reina[k]
+                reina[fila], reina[k] = c, reina[fila]
+                if diagonales[fila + c] == 0 and antidiagonales[fila - c + n - 1] == 0:
+                    break
+            diagonales[fila + c] += 1
+            antidiagonales[fila - c + n - 1] += 1
+        self.pasos = 0
+
+    def costo(self, fila):
+        # Reinas en las diagonales de la casilla de la fila (incluida ella si está colocada)
+        c = self.reina[fila]
+        return self.diagonales[fila + c] + self.antidiagonales[fila - c + self.n - 1]
+
+    def conflictos_fila(self, fila):
+        # Conflictos de la reina de la fila con las demás
+        return self.costo(fila) - 2
+
+    def colocar(self, fila, signo):
+        # signo = 1 suma la reina de la fila a los contadores, -1 la quita
+        c = self.reina[fila]
+        self.diagonales[fila + c] += signo
+        self.antidiagonales[fila - c + self.n - 1] += signo
+
+    def intercambiar(self, i, j):
+        self.colocar(i, -1)
+        self.colocar(j, -1)
+        self.reina[i], self.reina[j] = self.reina[j], self.reina[i]
+        self.colocar(i, 1)
+        self.colocar(j, 1)
+
+    def filas_conflictivas(self):
+        n = self.n
+        filas = np.arange(n)
+        c = np.array(self.reina)
+        conflictos = (np.array(self.diagonales)[filas + c]
+                      + np.array(self.antidiagonales)[filas - c + n - 1])
+        return np.flatnonzero(conflictos > 2).tolist()
+
+    def mejor_intercambio(self, fila, otras):
+        # Fila con la que intercambiar que deja menos conflictos (empates al azar)
+        mejores, minimo = [], None
+        for otra in otras:
+            antes = self.conflictos_fila(fila) + self.conflictos_fila(otra)
+            self.intercambiar(fila, otra)
+            diferencia = self.conflictos_fila(fila) + self.conflictos_fila(otra) - antes
+            self.intercambiar(fila, otra)
+            if minimo is None or diferencia < minimo:
+                mejores, minimo = [otra], diferencia
+            elif diferencia == minimo:
+                mejores.append(otra)
+        return self.rng.choice(mejores), minimo
+
+    def resolver(self):
+        n = self.n
+        pendientes = []
+        while self.pasos < self.max_iter:
+            if not pendientes:
+                pendientes = self.filas_conflictivas()
+                if not pendientes:
+                    return self.reina
+            indice = self.rng.randrange(len(pendientes))
+            pendientes[indice], pendientes[-1] = pendientes[-1], pendientes[indice]
+            fila = pendientes.pop()
+            if self.conflictos_fila(fila) == 0:
+                continue
+            self.pasos += 1
+            if n <= self.completo:
+                otras = [otra for otra in range(n) if otra != fila]
+            else:
+                otras = [otra for otra in self.rng.choices(range(n), k=self.intentos)
+                         if otra != fila] or [(fila + 1) % n]
+            otra, diferencia = self.mejor_intercambio(fila, otras)
+            if diferencia >= 0 and self.rng.random() < self.ruido:
+                # Paso aleatorio: dos reinas que se atacan pueden quedarse
+                # rebotando entre intercambios igual de malos
+                otra = self.rng.choice(otras)
+            elif diferencia > 0:
+                continue
+            # Con empate se intercambia igualmente (movimiento lateral). Las filas
+            # que quedan atacadas entran en el siguiente recálculo
+            self.intercambiar(fila, otra)
+        return None
 
 
 # ================== Definición del Problema ==================
@@ -149,3 +318,44 @@ if solucion:
         print(f"{var} tiene el valor: {valor}")
 else:
     print("No se encontró una solución.")
+
+# ================== Problemas grandes ==================
+
+# Colorear con 4 colores un grafo aleatorio de 5000 vértices que admite una
+# coloración escondida (las aristas sólo unen vértices de clases distintas)
+generador = random.Random(7)
+vertices = [f"v{i}" for i in range(5000)]
+clase = {v: generador.randrange(4) for v in vertices}
+aristas = set()
+while len(aristas) < 3 * len(vertices):  # grado medio 6
+    a, b = generador.sample(vertices, 2)
+    if clase[a] != clase[b]:
+        aristas.add((min(a, b), max(a, b)))
+colores = ['rojo', 'azul', 'verde', 'amarillo']
+print(f"\nColoración de {len(vertices)} vértices y {len(aristas)} aristas:")
+for ruido in (0.0, 0.1):
+    t = time.perf_counter()
+    coloreado = MinConflicts(vertices, {v: colores for v in vertices},
+                             {arista: lambda x, y: x != y for arista in aristas},
+                             max_iter=200000, semilla=1, ruido=ruido)
+    coloracion = coloreado.resolver()
+    print(f"  ruido {ruido}: {'resuelta' if coloracion else 'sin resolver'} en "
+          f"{time.perf_counter() - t:.2f} s, {len(coloreado.conflictivas)} vértices en conflicto")
+
+for n in (1000, 1000000):
+    t = time.perf_counter()
+    reinas = MinConflictosReinas(n, semilla=0)
+    inicial = len(reinas.filas_conflictivas())
+    solucion_reinas = reinas.resolver()
+    print(f"{n} reinas: {inicial} filas en conflicto tras el inicio voraz, "
+          f"{'resuelto' if solucion_reinas else 'sin solución'} con {reinas.pasos} intercambios "
+          f"en {time.perf_counter() - t:.2f} s")
+
+#Coloración de 5000 vértices y 15000 aristas:
+#  ruido 0.0: sin resolver en 1.40 s, 102 vértices en conflicto
+#  ruido 0.1: resuelta en 0.48 s, 0 vértices en conflicto
+#1000 reinas: 19 filas en conflicto tras el inicio voraz, resuelto con 10 intercambios en 0.03 s
+#1000000 reinas: 25 filas en conflicto tras el inicio voraz, resuelto con 21 intercambios en 8.26 s
+#Cada paso sólo toca las filas de la tabla de los vecinos de la variable
+#movida; en las reinas los contadores de diagonales hacen O(1) cada
+#intercambio y casi todo el tiempo se va en el inicio voraz.
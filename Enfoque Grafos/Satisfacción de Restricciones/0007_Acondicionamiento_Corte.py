@@ -1,134 +1,319 @@
 """
 Prácticas de Inteligencia Artificial
-Búsqueda Local con Acondicionamiento del Corte (Poda)
+Acondicionamiento del Corte (Cycle Cutset Conditioning)
 """
-
+import multiprocessing
+import os
 import random
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ not in sys.path:
+    sys.path.insert(0, RAIZ)
+from comunes import cargar_script
+
 
 class CorteCondicionamiento:
-    def __init__(self, variables, dominios, restricciones, max_iter=100):
+    def __init__(self, variables, dominios, restricciones, max_iter=None, procesos=1):
         """
-        Inicializa el algoritmo de Búsqueda Local con Acondicionamiento del Corte.
+        Acondicionamiento del corte: se elige un corte de ciclos (variables que,
+        al quitarlas, dejan el grafo de restricciones sin ciclos), se prueban
+        las asignaciones consistentes del corte y, para cada una, el resto es
+        un bosque que se resuelve en tiempo lineal con consistencia de arco
+        dirigida. Con un corte de c variables el costo es O(d^c * n * d^2).
         - variables: Lista de las variables del problema.
         - dominios: Diccionario con los dominios de cada variable (posibles valores).
         - restricciones: Diccionario con las restricciones entre variables.
-        - max_iter: Número máximo de iteraciones para la búsqueda local.
+        - max_iter: Máximo de asignaciones del corte que se prueban (None = todas;
+          en paralelo, por tarea).
+        - procesos: Procesos entre los que se reparten las asignaciones del corte.
+          Hace falta fork (los procesos heredan las restricciones, que suelen ser
+          lambdas y no se pueden serializar); si no existe, se resuelve en serie.
         """
         self.variables = variables
         self.dominios = dominios
         self.restricciones = restricciones
         self.max_iter = max_iter
-        self.asignacion = {var: random.choice(dominio) for var, dominio in dominios.items()}  # Asignación aleatoria
+        self.procesos = procesos
 
-    def es_consistente(self, variable, valor):
-        """
-        Verifica si la asignación de un valor a una variable no viola ninguna restricción.
-        """
-        for otra_variable, otro_valor in self.asignacion.items():
-            if (variable, otra_variable) in self.restricciones:
-                if not self.restricciones[(variable, otra_variable)](valor, otro_valor):
-                    return False
-            if (otra_variable, variable) in self.restricciones:
-                if not self.restricciones[(otra_variable, variable)](otro_valor, valor):
-                    return False
-        return True
+        # pruebas[(x, y)] = funciones f(valor_x, valor_y); una restricción (X, Y)
+        # se guarda en los dos sentidos y las de una sola variable filtran su dominio
+        self.pruebas = {}
+        unarias = {var: [] for var in variables}
+        for (x, y), restriccion in restricciones.items():
+            if x == y:
+                unarias[x].append(restriccion)
+                continue
+            self.pruebas.setdefault((x, y), []).append(restriccion)
+            self.pruebas.setdefault((y, x), []).append(
+                lambda valor_y, valor_x, r=restriccion: r(valor_x, valor_y))
+        self.vecinos = {var: [] for var in variables}
+        for x, y in self.pruebas:
+            self.vecinos[x].append(y)
+        self.valores = {var: [valor for valor in dominios[var]
+                              if all(r(valor, valor) for r in unarias[var])]
+                        for var in variables}
+
+        self.corte = self.encontrar_corte()
+        self.preparar_bosque()
+        self.estadisticas = {'asignaciones_corte': 0, 'arboles': 0}
 
-    def contar_conflictos(self, variable, valor):
+    def compatibles(self, x, valor_x, y, valor_y):
         """
-        Cuenta cuántos conflictos tendría una asignación dada a una variable.
+        Verifica si X = valor_x e Y = valor_y cumplen todas las restricciones entre ambas.
         """
-        conflictos = 0
-        for otra_variable, otro_valor in self.asignacion.items():
-            if (variable, otra_variable) in self.restricciones:
-                if not self.restricciones[(variable, otra_variable)](valor, otro_valor):
-                    conflictos += 1
-            if (otra_variable, variable) in self.restricciones:
-                if not self.restricciones[(otra_variable, variable)](otro_valor, valor):
-                    conflictos += 1
-        return conflictos
+        return all(prueba(valor_x, valor_y) for prueba in self.pruebas[(x, y)])
 
-    def resolver(self):
+    # ================== Corte de ciclos ==================
+
+    def encontrar_corte(self):
         """
-        Resuelve el CSP utilizando el algoritmo de búsqueda local con acondicionamiento del corte (poda).
+        Corte voraz: se quitan una y otra vez las variables de grado <= 1 (no
+        pueden estar en un ciclo); si queda algo, se pasa al corte la de mayor
+        grado. Al final se devuelven al grafo las del corte que ya no cierran
+        ningún ciclo.
         """
-        for _ in range(self.max_iter):
-            # Verificamos si ya hemos encontrado una solución válida
-            if self.satisface_restricciones():
-                return self.asignacion
+        grado = {var: len(self.vecinos[var]) for var in self.variables}
+        activas = set(self.variables)
+        corte = []
 
-            # Seleccionamos una variable que tiene conflictos
-            variable_conflictiva = self.seleccionar_variable_conflictiva()
+        def quitar(var, cola):
+            activas.discard(var)
+            for otra in self.vecinos[var]:
+                if otra in activas:
+                    grado[otra] -= 1
+                    if grado[otra] <= 1:
+                        cola.append(otra)
 
-            # Si no hay más conflictos, significa que hemos encontrado la solución
-            if variable_conflictiva is None:
-                continue
+        cola = [var for var in self.variables if grado[var] <= 1]
+        while True:
+            while cola:
+                var = cola.pop()
+                if var in activas and grado[var] <= 1:
+                    quitar(var, cola)
+            if not activas:
+                break
+            # En caso de empate, la primera en el orden de las variables
+            elegida = max((var for var in self.variables if var in activas), key=grado.__getitem__)
+            corte.append(elegida)
+            quitar(elegida, cola)
 
-            # Buscamos el valor que minimiza los conflictos
-            valor_min_conflictos = self.minimizar_conflictos(variable_conflictiva)
+        for var in reversed(corte[:]):
+            resto = set(corte) - {var}
+            if self.es_bosque(resto):
+                corte.remove(var)
+        return corte
 
-            # Asignamos el valor a la variable
-            self.asignacion[variable_conflictiva] = valor_min_conflictos
+    def es_bosque(self, excluidas):
+        """
+        Verifica con unión-búsqueda que el grafo sin las variables excluidas no tiene ciclos.
+        """
+        raiz = {var: var for var in self.variables if var not in excluidas}
 
-            # Realizamos un acondicionamiento (corte) si la solución ya es insostenible
-            if self.poda_corte(variable_conflictiva):
-                break
+        def buscar(var):
+            while raiz[var] != var:
+                raiz[var] = raiz[raiz[var]]
+                var = raiz[var]
+            return var
 
-        return None  # No se encontró solución dentro del número máximo de iteraciones
+        vistas = set()
+        for x, y in self.pruebas:
+            if x not in raiz or y not in raiz or (y, x) in vistas:
+                continue
+            vistas.add((x, y))
+            rx, ry = buscar(x), buscar(y)
+            if rx == ry:
+                return False
+            raiz[rx] = ry
+        return True
 
-    def seleccionar_variable_conflictiva(self):
+    def preparar_bosque(self):
         """
-        Selecciona la variable con el mayor número de conflictos.
+        Ordena las variables que no están en el corte recorriendo en anchura
+        cada árbol desde una raíz: cada variable aparece después de su padre.
         """
-        variable_conflictiva = None
-        max_conflictos = 0
-
-        # Buscamos la variable con el mayor número de conflictos
-        for variable in self.variables:
-            if variable not in self.asignacion:
-                conflictos = sum(1 for otra_variable in self.variables if (variable, otra_variable) in self.restricciones)
-                if conflictos > max_conflictos:
-                    max_conflictos = conflictos
-                    variable_conflictiva = variable
+        en_corte = set(self.corte)
+        self.padre = {}
+        self.orden = []
+        for raiz in self.variables:
+            if raiz in en_corte or raiz in self.padre:
+                continue
+            self.padre[raiz] = None
+            inicio = len(self.orden)
+            self.orden.append(raiz)
+            while inicio < len(self.orden):
+                var = self.orden[inicio]
+                inicio += 1
+                for hijo in self.vecinos[var]:
+                    if hijo not in en_corte and hijo not in self.padre:
+                        self.padre[hijo] = var
+                        self.orden.append(hijo)
+        # Vecinos de cada variable del bosque que están en el corte
+        self.vecinos_corte = {var: [otra for otra in self.vecinos[var] if otra in en_corte]
+                              for var in self.orden}
+        # soportes[(x, y)][valor_y] = valores de X compatibles con Y = valor_y, para
+        # cada variable del bosque con su padre y con sus vecinos del corte. Se
+        # calculan una sola vez; en cada árbol sólo se intersecan conjuntos.
+        self.soportes = {}
+        for var in self.orden:
+            otras = self.vecinos_corte[var] + ([self.padre[var]] if self.padre[var] is not None else [])
+            for otra in otras:
+                self.soportes[(var, otra)] = {
+                    valor_otra: frozenset(valor for valor in self.valores[var]
+                                          if self.compatibles(var, valor, otra, valor_otra))
+                    for valor_otra in self.valores[otra]}
 
-        return variable_conflictiva
+    # ================== Árbol ==================
 
-    def minimizar_conflictos(self, variable):
+    def resolver_arbol(self, valores_corte):
         """
-        Asigna el valor a la variable que minimiza los conflictos.
+        Resuelve el bosque con el corte ya asignado, en O(n * d^2):
+        1. cada dominio se reduce a los valores compatibles con el corte
+        2. consistencia de arco dirigida: de las hojas hacia la raíz, se quitan
+           del padre los valores sin soporte en el hijo
+        3. de la raíz hacia las hojas se asigna a cada hijo un valor compatible
+           con su padre (siempre existe tras el paso 2, no hay vuelta atrás)
         """
-        min_conflictos = float('inf')
-        valor_min_conflictos = None
+        self.estadisticas['arboles'] += 1
+        dominios = {}
+        for var in self.orden:
+            dominio = frozenset(self.valores[var])
+            for otra in self.vecinos_corte[var]:
+                dominio = dominio & self.soportes[(var, otra)][valores_corte[otra]]
+            if not dominio:
+                return None
+            dominios[var] = dominio
+
+        for var in reversed(self.orden):
+            padre = self.padre[var]
+            if padre is None:
+                continue
+            hijo, soportes = dominios[var], self.soportes[(var, padre)]
+            dominios[padre] = frozenset(valor for valor in dominios[padre]
+                                        if not hijo.isdisjoint(soportes[valor]))
+            if not dominios[padre]:
+                return None
 
-        # Probamos todos los valores en el dominio de la variable
-        for valor in self.dominios[variable]:
-            conflictos = self.contar_conflictos(variable, valor)
-            if conflictos < min_conflictos:
-                min_conflictos = conflictos
-                valor_min_conflictos = valor
+        # Se recorre cada dominio en su orden original para que el resultado no
+        # dependa del orden de los conjuntos
+        asignacion = dict(valores_corte)
+        for var in self.orden:
+            padre = self.padre[var]
+            permitidos = dominios[var]
+            if padre is not None:
+                permitidos = permitidos & self.soportes[(var, padre)][asignacion[padre]]
+            asignacion[var] = next(valor for valor in self.valores[var] if valor in permitidos)
+        return {var: asignacion[var] for var in self.variables}
 
-        return valor_min_conflictos
+    # ================== Enumeración del corte ==================
 
-    def satisface_restricciones(self):
+    def asignaciones_corte(self, valores, hasta):
         """
-        Verifica si la asignación actual satisface todas las restricciones.
+        Genera las asignaciones consistentes entre sí de corte[len(valores):hasta]
+        que extienden 'valores' (vuelta atrás sobre las variables del corte).
         """
-        for (var1, var2), restr in self.restricciones.items():
-            if not restr(self.asignacion.get(var1), self.asignacion.get(var2)):
-                return False
-        return True
+        i = len(valores)
+        if i == hasta:
+            yield dict(valores)
+            return
+        var = self.corte[i]
+        for valor in self.valores[var]:
+            if all(self.compatibles(var, valor, otra, valores[otra])
+                   for otra in self.vecinos[var] if otra in valores):
+                valores[var] = valor
+                yield from self.asignaciones_corte(valores, hasta)
+                del valores[var]
 
-    def poda_corte(self, variable):
+    def resolver_desde(self, prefijo, detener=None):
         """
-        Realiza una poda de corte si encontramos que el problema ya no tiene solución.
-        Este corte interrumpe la búsqueda si se llega a una asignación insostenible.
+        Prueba las asignaciones del corte que empiezan por 'prefijo' hasta que
+        el bosque tenga solución.
         """
-        # Si alguna variable ya ha sido asignada a un valor insostenible, cortamos la búsqueda
-        for var in self.variables:
-            if var not in self.asignacion:
-                if not self.es_consistente(var, random.choice(self.dominios[var])):
-                    print(f"Se ha producido un corte en la búsqueda debido a que la variable {var} no puede ser consistente.")
-                    return True
-        return False
+        for probadas, valores in enumerate(self.asignaciones_corte(dict(prefijo), len(self.corte))):
+            if self.max_iter is not None and probadas >= self.max_iter:
+                break
+            if detener is not None and detener.is_set():
+                break
+            self.estadisticas['asignaciones_corte'] += 1
+            solucion = self.resolver_arbol(valores)
+            if solucion is not None:
+                return solucion
+        return None
+
+    def resolver(self):
+        """
+        Resuelve el CSP con acondicionamiento del corte.
+        """
+        contexto = _contexto_procesos()
+        if self.procesos <= 1 or not self.corte or contexto is None:
+            return self.resolver_desde({})
+
+        # Tareas: asignaciones de las primeras variables del corte, las justas
+        # para tener varias por proceso
+        profundidad = 1
+        tareas = list(self.asignaciones_corte({}, profundidad))
+        while len(tareas) < 4 * self.procesos and profundidad < len(self.corte):
+            profundidad += 1
+            tareas = list(self.asignaciones_corte({}, profundidad))
+
+        detener = contexto.Event()
+        _contexto.update(resolvedor=self, detener=detener)
+        solucion = None
+        with ProcessPoolExecutor(max_workers=self.procesos, mp_context=contexto) as pool:
+            pendientes = {pool.submit(_resolver_tarea, prefijo) for prefijo in tareas}
+            while pendientes and solucion is None:
+                terminadas, pendientes = wait(pendientes, return_when=FIRST_COMPLETED)
+                for futuro in terminadas:
+                    resultado, estadisticas = futuro.result()
+                    for clave, valor in estadisticas.items():
+                        self.estadisticas[clave] += valor
+                    if resultado is not None and solucion is None:
+                        solucion = resultado
+            # Las tareas que no han empezado se cancelan; las que corren ven el evento
+            detener.set()
+            for futuro in pendientes:
+                futuro.cancel()
+        return solucion
+
+
+_contexto = {}
+
+
+def _resolver_tarea(prefijo):
+    # Cada proceso hereda el resolvedor (y sus restricciones lambda) por fork
+    resolvedor = _contexto['resolvedor']
+    resolvedor.estadisticas = {'asignaciones_corte': 0, 'arboles': 0}
+    solucion = resolvedor.resolver_desde(prefijo, _contexto['detener'])
+    return solucion, resolvedor.estadisticas
+
+
+def _contexto_procesos():
+    # Con fork los trabajadores heredan el problema aunque sus restricciones no se
+    # puedan serializar. Con spawn arrancarían con _contexto vacío: None = en serie
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return None
+
+
+def csp_casi_arbol(n, d, ciclos, dureza, rng):
+    """
+    CSP aleatorio cuyo grafo es un árbol de n variables más 'ciclos' aristas
+    extra; cada restricción prohíbe una fracción 'dureza' de los pares de valores.
+    """
+    variables = [f"V{i}" for i in range(n)]
+    dominios = {var: list(range(d)) for var in variables}
+    aristas = {(rng.randrange(i), i) for i in range(1, n)}
+    while len(aristas) < min(n - 1 + ciclos, n * (n - 1) // 2):
+        i, j = sorted(rng.sample(range(n), 2))
+        aristas.add((i, j))
+    pares = [(a, b) for a in range(d) for b in range(d)]
+    restricciones = {}
+    for i, j in sorted(aristas):
+        prohibidos = frozenset(rng.sample(pares, round(dureza * d * d)))
+        restricciones[(variables[i], variables[j])] = lambda a, b, p=prohibidos: (a, b) not in p
+    return variables, dominios, restricciones
 
 
 # ================== Definición del Problema ==================
@@ -166,3 +351,48 @@ if solucion:
         print(f"{var} tiene el valor: {valor}")
 else:
     print("No se encontró una solución.")
+print(f"Corte de ciclos: {corte_solver.corte}")
+
+# ================== Comparación con la vuelta atrás ==================
+# Grafos casi árbol: 30 variables con 3 valores, un árbol más 4 aristas extra
+backtracking = cargar_script("Satisfacción de Restricciones/0002_Vuelta_Atras.py").backtracking
+generador = random.Random(0)
+tiempos = [0.0, 0.0]
+con_solucion = 0
+cortes = []
+for _ in range(10):
+    problema = csp_casi_arbol(30, 3, 4, 0.4, generador)
+    inicio = time.perf_counter()
+    solucion = backtracking({}, *problema)
+    tiempos[0] += time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    corte_solver = CorteCondicionamiento(*problema)
+    assert (corte_solver.resolver() is None) == (solucion is None)
+    tiempos[1] += time.perf_counter() - inicio
+    con_solucion += solucion is not None
+    cortes.append(len(corte_solver.corte))
+print(f"\n10 CSP casi árbol ({con_solucion} con solución), cortes de {cortes} variables:")
+print(f"  vuelta atrás: {tiempos[0]:.2f} s   acondicionamiento del corte: {tiempos[1]:.3f} s")
+
+# ================== Enumeración del corte en paralelo ==================
+# 3000 variables y 25 aristas extra, sin solución: hay que probar todo el corte
+problema = csp_casi_arbol(3000, 3, 25, 0.33, random.Random(1))
+for procesos in sorted({1, min(4, os.cpu_count() or 1)}):
+    inicio = time.perf_counter()
+    corte_solver = CorteCondicionamiento(*problema, procesos=procesos)
+    solucion = corte_solver.resolver()
+    print(f"{procesos} proceso(s): corte de {len(corte_solver.corte)} variables, "
+          f"{corte_solver.estadisticas['asignaciones_corte']} asignaciones del corte, "
+          f"{'con' if solucion else 'sin'} solución en {time.perf_counter() - inicio:.2f} s")
+
+#===== Resultado Final =====
+#X tiene el valor: rojo
+#Y tiene el valor: azul
+#Z tiene el valor: verde
+#Corte de ciclos: ['X']
+#10 CSP casi árbol (7 con solución), cortes de [2, 1, 2, 2, 2, 2, 2, 2, 2, 1] variables:
+#  vuelta atrás: 6.83 s   acondicionamiento del corte: 0.013 s
+#1 proceso(s): corte de 8 variables, 4374 asignaciones del corte, sin solución en 6.23 s
+#La vuelta atrás cronológica repite los mismos fallos en cada rama; con el corte
+#asignado el resto es un bosque y se resuelve sin vuelta atrás. Con varios núcleos
+#las asignaciones del corte se reparten entre procesos (aquí sólo había uno).
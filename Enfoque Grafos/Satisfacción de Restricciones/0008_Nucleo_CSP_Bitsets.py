@@ -0,0 +1,316 @@
+"""
+Prácticas de Inteligencia Artificial
+Núcleo CSP compilado: dominios como bits, MRV + grado y LCV
+(vuelta atrás iterativa con comprobación hacia delante y rastro de deshacer)
+"""
+import random
+import time
+
+
+# =================== CSP compilado ===================
+class CSPBits:
+    """
+    Compila un CSP con el formato de 0002 (variables, dominios y restricciones
+    {(x, y): funcion}) a enteros:
+    - variables 0..n-1 y valores de cada variable 0..d-1
+    - dominios como enteros de bits: el bit a está en 1 si el valor a sigue disponible
+    - vecinos[i]: variables que comparten alguna restricción con i
+    - soporte(i, j, a): bits de los valores de j compatibles con i = a.
+      Se precalcula una tabla por arco; varias restricciones sobre el mismo
+      par se combinan con AND.
+    """
+
+    def __init__(self, variables, dominios, restricciones):
+        self.nombres = list(variables)
+        self.indice = {nombre: i for i, nombre in enumerate(self.nombres)}
+        self.valores = [list(dominios[nombre]) for nombre in self.nombres]
+        self.dominios = [(1 << len(valores)) - 1 for valores in self.valores]
+        self.vecinos = [[] for _ in self.nombres]
+        self._tablas = {}
+        for (x, y), restriccion in restricciones.items():
+            self._agregar(self.indice[x], self.indice[y], restriccion)
+
+    @classmethod
+    def desde_vecinos(cls, variables, dominios, vecinos):
+        # El formato de 0001 (coloreado de mapas): vecinos con valores distintos
+        restricciones = {}
+        for x in variables:
+            for y in vecinos[x]:
+                if (y, x) not in restricciones:
+                    restricciones[(x, y)] = lambda a, b: a != b
+        return cls(variables, dominios, restricciones)
+
+    def _agregar(self, i, j, restriccion):
+        valores_i, valores_j = self.valores[i], self.valores[j]
+        directa = [sum(1 << b for b, vb in enumerate(valores_j) if restriccion(va, vb))
+                   for va in valores_i]
+        inversa = [sum(1 << a for a, va in enumerate(valores_i) if restriccion(va, vb))
+                   for vb in valores_j]
+        for origen, destino, tabla in ((i, j, directa), (j, i, inversa)):
+            anterior = self._tablas.get((origen, destino))
+            if anterior is None:
+                self._tablas[(origen, destino)] = tabla
+                self.vecinos[origen].append(destino)
+            else:
+                self._tablas[(origen, destino)] = [p & q for p, q in zip(anterior, tabla)]
+
+    def soporte(self, i, j, a):
+        return self._tablas[(i, j)][a]
+
+    def decodificar(self, asignacion):
+        return {self.nombres[i]: self.valores[i][a] for i, a in enumerate(asignacion)}
+
+
+class _TodasMenos:
+    # Las variables 0..n-1 salvo una, sin guardar la lista (vecinos en N-reinas)
+    def __init__(self, n, excluida):
+        self.n = n
+        self.excluida = excluida
+
+    def __iter__(self):
+        yield from range(self.excluida)
+        yield from range(self.excluida + 1, self.n)
+
+    def __len__(self):
+        return self.n - 1
+
+
+class ReinasBits(CSPBits):
+    """
+    N-reinas: la variable i es la columna de la reina de la fila i. Con miles
+    de reinas no caben n^2 tablas de soporte, así que se calculan al vuelo:
+    la reina i en la columna a ataca en la fila j las columnas a y a ± |i - j|.
+    """
+
+    def __init__(self, n):
+        self.n = n
+        self.nombres = list(range(n))
+        self.indice = {i: i for i in range(n)}
+        self.valores = [range(n)] * n
+        self.completo = (1 << n) - 1
+        self.dominios = [self.completo] * n
+        self.vecinos = [_TodasMenos(n, i) for i in range(n)]
+
+    def soporte(self, i, j, a):
+        d = i - j if i > j else j - i
+        atacadas = (1 << a) | (1 << (a + d))
+        if a >= d:
+            atacadas |= 1 << (a - d)
+        return self.completo & ~atacadas
+
+
+# =================== Búsqueda ===================
+
+def _bits(mascara):
+    # Índices de los bits en 1, de menor a mayor
+    while mascara:
+        bit = mascara & -mascara
+        yield bit.bit_length() - 1
+        mascara ^= bit
+
+
+def resolver(csp, lcv=True, rng=None, limite_nodos=None, estadisticas=None):
+    """
+    Vuelta atrás iterativa con comprobación hacia delante sobre un CSPBits.
+    - Variable: MRV (menos valores en el dominio); en empate, la que tiene más
+      vecinos sin asignar (heurística de grado).
+    - Valores: con lcv, primero el que menos valores quita a los vecinos.
+      Con rng (un random.Random) los empates entre valores se rompen al azar.
+    - Cada dominio que se poda se anota en el rastro con su valor anterior;
+      al retroceder se restaura hasta la marca del nivel, sin copiar dominios.
+    - limite_nodos: se abandona la búsqueda al pasar de ese número de nodos
+      (estadisticas['agotado'] queda en True)
+    Devuelve la asignación (lista de índices de valores) o None.
+    """
+    n = len(csp.dominios)
+    dominios = list(csp.dominios)
+    vecinos = csp.vecinos
+    soporte = csp.soporte
+    asignacion = [-1] * n
+    libres = [len(vecinos[i]) for i in range(n)]  # vecinos sin asignar
+    rastro = []
+    if estadisticas is None:
+        estadisticas = {}
+    estadisticas.update(nodos=0, retrocesos=0, agotado=False)
+
+    def elegir_variable():
+        mejor, mejor_tamano, mejor_grado = None, None, -1
+        for i in range(n):
+            if asignacion[i] < 0:
+                tamano = dominios[i].bit_count()
+                if mejor is None or tamano < mejor_tamano or (
+                        tamano == mejor_tamano and libres[i] > mejor_grado):
+                    mejor, mejor_tamano, mejor_grado = i, tamano, libres[i]
+                    if tamano == 1 and mejor_grado == 0:
+                        break
+        return mejor
+
+    def ordenar_valores(var):
+        # Pendientes en orden inverso: pop() da el siguiente valor a probar
+        valores = list(_bits(dominios[var]))
+        if rng is not None:
+            rng.shuffle(valores)  # sort es estable: el orden al azar queda en los empates
+        if lcv and len(valores) > 1:
+            vecinos_libres = [j for j in vecinos[var] if asignacion[j] < 0]
+            perdidos = {a: sum((dominios[j] & ~soporte(var, j, a)).bit_count()
+                               for j in vecinos_libres) for a in valores}
+            valores.sort(key=perdidos.__getitem__)
+        valores.reverse()
+        return valores
+
+    def asignar(var, a):
+        # Comprobación hacia delante: sólo se podan los vecinos sin asignar
+        asignacion[var] = a
+        rastro.append((var, dominios[var]))
+        dominios[var] = 1 << a
+        consistente = True
+        for j in vecinos[var]:
+            libres[j] -= 1
+            if consistente and asignacion[j] < 0:
+                anterior = dominios[j]
+                nuevo = anterior & soporte(var, j, a)
+                if nuevo != anterior:
+                    rastro.append((j, anterior))
+                    dominios[j] = nuevo
+                    if not nuevo:
+                        consistente = False
+        return consistente
+
+    def desasignar(var, marca):
+        asignacion[var] = -1
+        for j in vecinos[var]:
+            libres[j] += 1
+        while len(rastro) > marca:
+            j, anterior = rastro.pop()
+            dominios[j] = anterior
+
+    var = elegir_variable()
+    if var is None:
+        return []
+    pila = [(var, ordenar_valores(var), len(rastro))]
+    while pila:
+        var, pendientes, marca = pila[-1]
+        if asignacion[var] >= 0:
+            desasignar(var, marca)
+        if not pendientes:
+            pila.pop()
+            estadisticas['retrocesos'] += 1
+            continue
+        estadisticas['nodos'] += 1
+        if limite_nodos is not None and estadisticas['nodos'] > limite_nodos:
+            estadisticas['agotado'] = True
+            return None
+        if asignar(var, pendientes.pop()):
+            siguiente = elegir_variable()
+            if siguiente is None:
+                return asignacion
+            pila.append((siguiente, ordenar_valores(siguiente), len(rastro)))
+    return None
+
+
+def resolver_con_reinicios(csp, lcv=True, limite_inicial=None, crecimiento=1.5, semilla=0,
+                           max_reinicios=50, estadisticas=None):
+    """
+    Reinicios aleatorios con límite de nodos creciente. La vuelta atrás con
+    MRV tiene tiempos de "cola pesada": casi siempre termina enseguida, pero a
+    veces un mal valor temprano la deja atrapada. Cortar la búsqueda y
+    empezar con otro orden de valores evita esas corridas.
+    - limite_inicial: nodos del primer intento (por defecto 2 * variables)
+    - max_reinicios: intentos como máximo; tiene que ser al menos 1
+    """
+    if max_reinicios < 1:
+        raise ValueError(f"max_reinicios debe ser al menos 1 (max_reinicios={max_reinicios})")
+    limite = limite_inicial or 2 * len(csp.dominios)
+    if estadisticas is None:
+        estadisticas = {}
+    totales = {'nodos': 0, 'retrocesos': 0, 'reinicios': 0}
+    for intento in range(max_reinicios):
+        solucion = resolver(csp, lcv, random.Random(semilla + intento), int(limite), estadisticas)
+        totales['nodos'] += estadisticas['nodos']
+        totales['retrocesos'] += estadisticas['retrocesos']
+        if not estadisticas['agotado']:
+            break
+        totales['reinicios'] += 1
+        limite *= crecimiento
+    estadisticas.update(totales)
+    return solucion
+
+
+def es_solucion(csp, asignacion):
+    # Comprueba cada arco contra las tablas de soporte
+    for i, a in enumerate(asignacion):
+        for j in csp.vecinos[i]:
+            if not csp.soporte(i, j, a) >> asignacion[j] & 1:
+                return False
+    return True
+
+
+# =================== Ejemplo de uso ===================
+if __name__ == "__main__":
+    # El mapa de 0001
+    variables = ['A', 'B', 'C', 'D']
+    dominios = {var: ['Rojo', 'Verde', 'Azul'] for var in variables}
+    vecinos = {
+        'A': ['B', 'C'],
+        'B': ['A', 'C', 'D'],
+        'C': ['A', 'B', 'D'],
+        'D': ['B', 'C']
+    }
+    mapa = CSPBits.desde_vecinos(variables, dominios, vecinos)
+    print("===== Problema CSP: Coloreado de Mapa =====")
+    for region, color in mapa.decodificar(resolver(mapa)).items():
+        print(f"{region} → {color}")
+
+    # Las restricciones de 0002
+    restricciones = {
+        ('X', 'Y'): lambda x, y: x != y,
+        ('Y', 'Z'): lambda y, z: y < z,
+        ('X', 'Z'): lambda x, z: x != z
+    }
+    csp = CSPBits(['X', 'Y', 'Z'], {v: [1, 2, 3] for v in 'XYZ'}, restricciones)
+    print("\n===== Vuelta Atrás con dominios de bits =====")
+    for var, val in csp.decodificar(resolver(csp)).items():
+        print(f"{var} → {val}")
+
+    # N-reinas con miles de variables (sin lcv: costaría O(n^2) por nodo)
+    for n in (200, 1000, 2000):
+        reinas = ReinasBits(n)
+        estadisticas = {}
+        t = time.perf_counter()
+        solucion = resolver_con_reinicios(reinas, lcv=False, estadisticas=estadisticas)
+        segundos = time.perf_counter() - t
+        valida = len(set(solucion)) == n and len({c - f for f, c in enumerate(solucion)}) == n \
+            and len({c + f for f, c in enumerate(solucion)}) == n
+        print(f"\n{n} reinas: {segundos:.2f} s, {estadisticas['nodos']} nodos, "
+              f"{estadisticas['retrocesos']} retrocesos, {estadisticas['reinicios']} reinicios, "
+              f"¿válida?: {valida}")
+
+    # Coloreado de un grafo aleatorio de 3000 vértices con 4 colores (con una
+    # coloración oculta para que tenga solución)
+    generador = random.Random(0)
+    vertices = 3000
+    oculto = [generador.randrange(4) for _ in range(vertices)]
+    vecinos = {v: set() for v in range(vertices)}
+    while sum(len(vs) for vs in vecinos.values()) < 6 * vertices:  # grado medio 6
+        u, v = generador.randrange(vertices), generador.randrange(vertices)
+        if oculto[u] != oculto[v]:
+            vecinos[u].add(v)
+            vecinos[v].add(u)
+    grafo = CSPBits.desde_vecinos(list(range(vertices)), {v: range(4) for v in range(vertices)},
+                                  {v: sorted(vs) for v, vs in vecinos.items()})
+    for usar_lcv in (False, True):
+        estadisticas = {}
+        t = time.perf_counter()
+        solucion = resolver_con_reinicios(grafo, lcv=usar_lcv, estadisticas=estadisticas)
+        print(f"\nColoreado, {vertices} vértices, 4 colores, lcv={usar_lcv}: "
+              f"{time.perf_counter() - t:.2f} s, {estadisticas['nodos']} nodos, "
+              f"{estadisticas['retrocesos']} retrocesos, "
+              f"¿válida?: {solucion is not None and es_solucion(grafo, solucion)}")
+
+#===== Problema CSP: Coloreado de Mapa =====
+#A → Azul
+#B → Rojo
+#C → Verde
+#D → Azul
+#(MRV + grado empieza por B o C, las regiones con más vecinos; 0001 empieza por A)
+#1000 reinas: 1000 nodos, 0 retrocesos; 2000 reinas: 2009 nodos, 7 retrocesos
@@ -0,0 +1,175 @@
+"""
+Prácticas de Inteligencia Artificial
+Utilidades comunes a las prácticas de Enfoque Grafos
+(cargar una práctica desde otra, reconstruir caminos, distinguir grafos con
+costos y la cola de prioridad indexada de costo uniforme y A*)
+
+Las prácticas las importan añadiendo esta carpeta a sys.path:
+    RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if RAIZ not in sys.path:
+        sys.path.insert(0, RAIZ)
+    from comunes import cargar_script
+"""
+import contextlib
+import heapq
+import importlib.util
+import io
+import itertools
+import os
+import sys
+
+RAIZ = os.path.dirname(os.path.abspath(__file__))
+
+
+def cargar_script(ruta_relativa):
+    """
+    Carga otra práctica como módulo (sus nombres empiezan por dígitos y no se
+    pueden importar con import). La ruta es relativa a la carpeta Enfoque
+    Grafos, p. ej. "Busqueda Informada/0003_Busqueda_A y AO.py". Cada
+    práctica se carga una sola vez y se silencian los prints de su ejemplo de uso.
+    """
+    ruta = os.path.join(RAIZ, ruta_relativa)
+    nombre = "_" + os.path.splitext(os.path.basename(ruta))[0].replace(" ", "_")
+    if nombre in sys.modules:
+        return sys.modules[nombre]
+    spec = importlib.util.spec_from_file_location(nombre, ruta)
+    modulo = importlib.util.module_from_spec(spec)
+    sys.modules[nombre] = modulo
+    with contextlib.redirect_stdout(io.StringIO()):
+        spec.loader.exec_module(modulo)
+    return modulo
+
+
+def reconstruir_camino(padres, nodo):
+    """
+    Sigue los punteros a padre desde el nodo hasta el inicio (cuyo padre es None)
+    """
+    camino = []
+    while nodo is not None:
+        camino.append(nodo)
+        nodo = padres[nodo]
+    camino.reverse()
+    return camino
+
+
+def es_ponderado(grafo):
+    """
+    Decide si las aristas son pares (vecino, costo). No basta con ver una
+    tupla: los nombres de nodo también pueden serlo, así que toda arista debe
+    tener la forma (nombre, número), ninguna puede ser ella misma un nodo y,
+    si hay nombres tupla, el primer elemento de cada arista debe ser un nodo.
+    """
+    aristas = [arista for lista in grafo.values() for arista in lista]
+    if not aristas:
+        return False
+    for arista in aristas:
+        if not (isinstance(arista, tuple) and len(arista) == 2
+                and isinstance(arista[1], (int, float)) and not isinstance(arista[1], bool)):
+            return False
+        if arista in grafo:
+            return False
+    if any(isinstance(nombre, tuple) for nombre in grafo):
+        return all(arista[0] in grafo for arista in aristas)
+    return True
+
+
+class ColaPrioridadIndexada:
+    """
+    Montículo binario con un índice nodo -> posición, de modo que un nodo ya
+    encolado no se vuelve a insertar: se reduce su prioridad en su sitio
+    (decrease-key) y el montículo nunca supera el número de nodos.
+    Con perezosa=True se comporta como heapq con entradas duplicadas que se
+    descartan al salir (borrado perezoso), útil para comparar.
+    Los empates de prioridad se deshacen por orden de inserción, así que los
+    nodos nunca se comparan entre sí y pueden ser de cualquier tipo hashable.
+    """
+
+    def __init__(self, perezosa=False):
+        self.perezosa = perezosa
+        self.monticulo = []     # Entradas [prioridad, orden de inserción, nodo]
+        self.posiciones = {}    # nodo -> posición en el montículo (modo indexado)
+        self.mejor = {}         # nodo -> prioridad vigente (modo perezoso)
+        self.contador = itertools.count()
+        self.estadisticas = {'inserciones': 0, 'reducciones': 0, 'extracciones': 0,
+                             'obsoletas': 0, 'dominadas': 0}
+
+    def __len__(self):
+        return len(self.mejor) if self.perezosa else len(self.monticulo)
+
+    def __contains__(self, nodo):
+        return nodo in (self.mejor if self.perezosa else self.posiciones)
+
+    def insertar_o_reducir(self, nodo, prioridad):
+        if self.perezosa:
+            if nodo in self.mejor:
+                self.estadisticas['reducciones'] += 1
+            self.mejor[nodo] = prioridad
+            heapq.heappush(self.monticulo, [prioridad, next(self.contador), nodo])
+            self.estadisticas['inserciones'] += 1
+            return
+
+        if nodo in self.posiciones:
+            posicion = self.posiciones[nodo]
+            if prioridad >= self.monticulo[posicion][0]:
+                return
+            # Cuenta como una inserción nueva, igual que en el modo perezoso
+            self.monticulo[posicion][:2] = [prioridad, next(self.contador)]
+            self.estadisticas['reducciones'] += 1
+        else:
+            posicion = len(self.monticulo)
+            self.monticulo.append([prioridad, next(self.contador), nodo])
+            self.posiciones[nodo] = posicion
+            self.estadisticas['inserciones'] += 1
+        self._subir(posicion)
+
+    def extraer(self):
+        # Devuelve (prioridad, nodo) con la menor prioridad
+        if self.perezosa:
+            while True:
+                prioridad, _, nodo = heapq.heappop(self.monticulo)
+                if self.mejor.get(nodo) == prioridad:
+                    del self.mejor[nodo]
+                    self.estadisticas['extracciones'] += 1
+                    return prioridad, nodo
+                self.estadisticas['obsoletas'] += 1  # Entrada superada por otra mejor
+
+        ultimo = self.monticulo.pop()
+        if self.monticulo:
+            prioridad, _, nodo = self.monticulo[0]
+            self.monticulo[0] = ultimo
+            self.posiciones[ultimo[2]] = 0
+            self._bajar(0)
+        else:
+            prioridad, _, nodo = ultimo
+        del self.posiciones[nodo]
+        self.estadisticas['extracciones'] += 1
+        return prioridad, nodo
+
+    def _subir(self, posicion):
+        entrada = self.monticulo[posicion]
+        while posicion > 0:
+            padre = (posicion - 1) // 2
+            if not entrada < self.monticulo[padre]:
+                break
+            self.monticulo[posicion] = self.monticulo[padre]
+            self.posiciones[self.monticulo[posicion][2]] = posicion
+            posicion = padre
+        self.monticulo[posicion] = entrada
+        self.posiciones[entrada[2]] = posicion
+
+    def _bajar(self, posicion):
+        entrada = self.monticulo[posicion]
+        n = len(self.monticulo)
+        while True:
+            hijo = 2 * posicion + 1
+            if hijo >= n:
+                break
+            if hijo + 1 < n and self.monticulo[hijo + 1] < self.monticulo[hijo]:
+                hijo += 1
+            if not self.monticulo[hijo] < entrada:
+                break
+            self.monticulo[posicion] = self.monticulo[hijo]
+            self.posiciones[self.monticulo[posicion][2]] = posicion
+            posicion = hijo
+        self.monticulo[posicion] = entrada
+        self.posiciones[entrada[2]] = posicion